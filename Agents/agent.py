@@ -1,44 +1,258 @@
-import google.generativeai as gen_ai
+import asyncio
 import os
+import threading
+import time
+import weakref
 from dotenv import load_dotenv
-from utils.common import question_generation_prompt, evaluate_candidate
+from Agents.registry import ModelRegistry, DEFAULT_STATE_PATH, DEFAULT_TTL_SECONDS
+from Agents.resilience import (
+    CircuitBreaker, Deadline, ResilientCaller, RetryPolicy, TokenBucket, is_upstream_failure
+)
+from Agents.routing import (
+    HEDGE_MODEL, HedgePolicy, LatencyTracker, TaskRouter, ahedged_call, atimed, hedged_call, timed
+)
+from Agents.schemas import AnswerScore, ResumeAnalysis, structured_config
+from utils.common import (
+    question_generation_prompt, evaluate_candidate, answer_evaluation_prompt, resume_analysis_prompt
+)
+from utils.json_parser import ANSWER_SCORE_SCHEMA, JSONResponseError, parse_json_response, validate_field, validate_json
+from utils.json_stream import IncrementalJSONParser
+from utils.prompt_budget import compact_json, compact_prompt, estimate_tokens, record_report
+from utils import telemetry
 import json
 
 load_dotenv()
 
+_shared_agents = None
+_shared_lock = threading.Lock()
+
+
+def get_agents():
+    """Return the process-wide ``Agents`` instance, creating it on first use."""
+    global _shared_agents
+    if _shared_agents is None:
+        with _shared_lock:
+            if _shared_agents is None:
+                _shared_agents = Agents()
+    return _shared_agents
+
+
 class Agents:
     """
     A class to handle interactions with the Google Gemini AI model.
     """
-    def __init__(self):
-        """Initialize the agent with Google API key and model configuration."""
+    def __init__(self, registry=None, streaming=None, max_concurrency=None, timeout=None, structured=None,
+                 resilience=None, router=None, hedging=None, fallback_models=None, backend=None):
+        """
+        Initialize the agent with Google API key and model configuration.
+
+        ``backend`` (``INTERVIEWMATE_MODEL_BACKEND``) is ``gemini`` or
+        ``fake``, a deterministic offline model that needs no API key.
+        """
+        self.backend = backend or os.getenv('INTERVIEWMATE_MODEL_BACKEND', 'gemini')
+        if registry is None and self.backend == 'fake':
+            from Agents.fake import FakeRegistry, simulated_model_from_env
+            registry = FakeRegistry(simulated_model_from_env())
+        elif registry is None and self.backend != 'gemini':
+            raise ValueError(f"Unknown model backend {self.backend!r}; expected 'gemini' or 'fake'")
+
         self.GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
-        if not self.GOOGLE_API_KEY:
+        if registry is None and not self.GOOGLE_API_KEY:
             raise ValueError("GOOGLE_API_KEY not found in environment variables")
 
-        gen_ai.configure(api_key=self.GOOGLE_API_KEY)
+        # Model discovery is deferred until the model is first used
+        self.registry = registry or ModelRegistry(
+            api_key=self.GOOGLE_API_KEY,
+            ttl=float(os.getenv('INTERVIEWMATE_MODEL_TTL', DEFAULT_TTL_SECONDS)),
+            state_path=os.getenv('INTERVIEWMATE_MODEL_STATE', DEFAULT_STATE_PATH),
+        )
+        if streaming is None:
+            streaming = os.getenv('INTERVIEWMATE_STREAMING', '1') != '0'
+        self.streaming = streaming
 
-        try:
-            available_models = [m.name for m in gen_ai.list_models()]
-            # print("🔍 Available Models:", available_models)
+        # Ask for schema-constrained JSON instead of parsing free text
+        if structured is None:
+            structured = os.getenv('INTERVIEWMATE_STRUCTURED_OUTPUT', '1') != '0'
+        self.structured = structured
 
-            # Force selection of the best Gemini model
-            preferred_models = [
-                "models/gemini-1.5-pro-latest",  # Best choice
-                "models/gemini-1.5-pro",  
-                "models/gemini-1.5-flash-latest",  # Fast but less powerful
-            ]
-            self.model_name = next((m for m in preferred_models if m in available_models), None)
+        # Async calls: bounded in-flight requests and a per-call timeout
+        self.max_concurrency = max_concurrency or int(os.getenv('INTERVIEWMATE_MAX_CONCURRENCY', '8'))
+        self.timeout = timeout or float(os.getenv('INTERVIEWMATE_REQUEST_TIMEOUT', '60'))
+        self._semaphores = weakref.WeakKeyDictionary()
+        self.last_prompt_report = None
 
-            if not self.model_name:
-                raise ValueError("❌ No valid Gemini models found. Check your API key permissions.")
+        # Retries, rate limit and circuit breaker shared by every session
+        self.resilience = resilience or self._default_resilience()
 
-            # print(f"✅ Using Google Gemini Model: {self.model_name}")
-            self.model = gen_ai.GenerativeModel(self.model_name)
+        # Per-task models, hedging against slow responses and the fallback chain
+        self.router = router or TaskRouter.from_string(os.getenv('INTERVIEWMATE_TASK_MODELS', ''))
+        self.hedging = hedging or HedgePolicy(
+            enabled=os.getenv('INTERVIEWMATE_HEDGING', '0') == '1',
+            hedge_model=os.getenv('INTERVIEWMATE_HEDGE_MODEL', HEDGE_MODEL),
+            percentile=float(os.getenv('INTERVIEWMATE_HEDGE_PERCENTILE', '95')),
+            default_delay=float(os.getenv('INTERVIEWMATE_HEDGE_DELAY', '5')),
+        )
+        if fallback_models is None:
+            fallback_models = os.getenv('INTERVIEWMATE_FALLBACK_MODELS', HEDGE_MODEL).split(',')
+        self.fallback_models = [name.strip() for name in fallback_models if name.strip()]
+        self.latency = LatencyTracker()
 
+    def _default_resilience(self):
+        rate = float(os.getenv('INTERVIEWMATE_RATE_LIMIT', '10'))
+        burst = float(os.getenv('INTERVIEWMATE_RATE_BURST', '0')) or None
+        return ResilientCaller(
+            retry=RetryPolicy(max_attempts=int(os.getenv('INTERVIEWMATE_RETRY_ATTEMPTS', '3'))),
+            rate_limiter=TokenBucket(rate, burst) if rate > 0 else None,
+            breaker=CircuitBreaker(
+                failure_threshold=int(os.getenv('INTERVIEWMATE_BREAKER_THRESHOLD', '5')),
+                reset_timeout=float(os.getenv('INTERVIEWMATE_BREAKER_RESET', '30')),
+            ),
+            default_timeout=self.timeout,
+        )
+
+    def metrics(self):
+        """Resilience counters, circuit breaker states and per-model latency."""
+        return dict(
+            self.resilience.metrics.snapshot(),
+            circuit_state=self.resilience.breaker_for(self.model_name).state,
+            circuits=self.resilience.circuit_states(),
+            latency=self.latency.snapshot(),
+        )
+
+    @property
+    def model_name(self):
+        try:
+            return self.registry.get_model_name()
+        except Exception as e:
+            print(f"❌ Error loading models: {str(e)}")
+            return None
+
+    @property
+    def model(self):
+        try:
+            return self.registry.get_model()
         except Exception as e:
             print(f"❌ Error loading models: {str(e)}")
-            self.model = None
+            return None
+
+    def prepare_prompt(self, prompt, task):
+        """Compact a prompt and report its token count before and after."""
+        compacted = compact_prompt(prompt)
+        self.last_prompt_report = record_report(task, estimate_tokens(prompt), estimate_tokens(compacted))
+        return compacted
+
+    def generate_content(self, prompt, task="generate", deadline=None, **kwargs):
+        """
+        Blocking ``generate_content`` on the shared model with a compacted prompt.
+
+        Runs under the resilience layer: transient errors are retried with
+        backoff until ``deadline`` (``timeout`` seconds by default).
+        """
+        return self._call_model(self.prepare_prompt(prompt, task), task, deadline, **kwargs)
+
+    def _model_chain(self, task):
+        """The model routed for ``task`` followed by the fallback models."""
+        primary = self.router.model_for(task, None) or self.model_name
+        if not primary:
+            raise RuntimeError("Model is not initialized")
+        return [primary] + [name for name in self.fallback_models if name != primary]
+
+    def _leg(self, model_name, prompt, deadline, kwargs, timing):
+        model = self.registry.get_model(model_name)
+
+        def call(remaining):
+            timing.setdefault("started", time.perf_counter())
+            return model.generate_content(prompt, request_options={"timeout": remaining}, **kwargs)
+
+        return timed(self.latency, model_name, lambda: self.resilience.call(call, deadline, key=model_name))
+
+    def _should_hedge(self, chain, kwargs):
+        # Streams are consumed incrementally by the caller, so they are never hedged
+        return self.hedging.enabled and not kwargs.get("stream") and self.hedging.hedge_model != chain[0]
+
+    def _call_model(self, prompt, task, deadline=None, span=None, **kwargs):
+        """
+        Call the model routed for ``task``.
+
+        With hedging on, a request still unanswered after the primary
+        model's latency percentile is also sent to the hedge model. Upstream
+        failures move on to the next model in the fallback chain. The call
+        is recorded on ``span`` (by default the current telemetry span).
+        """
+        if span is None:
+            with telemetry.span(task) as span:
+                return self._call_model(prompt, task, deadline, span, **kwargs)
+        timing = {"entered": time.perf_counter()}
+        model_name, response = None, None
+        try:
+            model_name, response = self._call_chain(prompt, task, deadline or Deadline(self.timeout), kwargs, timing)
+            return response
+        finally:
+            self._record_call(span, model_name, prompt, response, timing, kwargs.get("stream"))
+
+    def _record_call(self, span, model_name, prompt, response, timing, stream=False):
+        # Streamed responses are counted by the caller once they have been read
+        now = time.perf_counter()
+        started = timing.get("started", now)
+        usage = getattr(response, "usage_metadata", None)
+        prompt_tokens = getattr(usage, "prompt_token_count", 0) or estimate_tokens(prompt)
+        response_tokens = 0
+        if response is not None and not stream:
+            try:
+                response_tokens = getattr(usage, "candidates_token_count", 0) or estimate_tokens(response.text)
+            except Exception:
+                pass  # Blocked responses have no text
+        span.add_call(model_name, started - timing["entered"], now - started, prompt_tokens, response_tokens)
+
+    def _call_chain(self, prompt, task, deadline, kwargs, timing):
+        chain = self._model_chain(task)
+        first_error = None
+
+        if self._should_hedge(chain, kwargs):
+            hedge_model = self.hedging.hedge_model
+            try:
+                response, hedge_won = hedged_call(
+                    self._leg(chain[0], prompt, deadline, kwargs, timing),
+                    self._leg(hedge_model, prompt, deadline, kwargs, timing),
+                    self.hedging.delay(self.latency.histogram(chain[0])),
+                    on_hedge=lambda: self.latency.incr("hedged"),
+                )
+                if hedge_won:
+                    self.latency.incr("hedge_wins")
+                return (hedge_model if hedge_won else chain[0]), response
+            except Exception as e:
+                if not is_upstream_failure(e):
+                    raise
+                first_error = e
+            chain = [name for name in chain[1:] if name != hedge_model]
+
+        for model_name in chain:
+            try:
+                return model_name, self._leg(model_name, prompt, deadline, kwargs, timing)()
+            except Exception as e:
+                if not is_upstream_failure(e):
+                    raise
+                print(f"Model {model_name} failed: {str(e)}")
+                first_error = first_error or e
+                self.latency.incr("fallbacks")
+        raise first_error
+
+    def generate_structured(self, prompt, schema_cls, task="generate_structured"):
+        """
+        Generate JSON constrained to ``schema_cls.RESPONSE_SCHEMA`` and return
+        a validated ``schema_cls`` instance.
+
+        Raises ``JSONResponseError`` if the response still doesn't validate.
+        """
+        with telemetry.span(task):
+            response = self.generate_content(prompt, task=task, generation_config=structured_config(schema_cls))
+            try:
+                result = schema_cls.from_dict(parse_json_response(response.text))
+            except JSONResponseError:
+                telemetry.mark_parse(False)
+                raise
+            telemetry.mark_parse(True)
+            return result
 
     def generate_questions(self, data):
         """Generate technical interview questions."""
@@ -47,12 +261,14 @@ class Agents:
         
         prompt = question_generation_prompt(data)
 
-        try:
-            response = self.model.generate_content(prompt)
-            return self._extract_json(response.text)
-        except Exception as e:
-            print(f"Error generating questions: {str(e)}")
-            return {"error": "Failed to generate questions"}
+        with telemetry.span("generate_questions") as span:
+            try:
+                response = self.generate_content(prompt, task="generate_questions")
+                return self._extract_json(response.text)
+            except Exception as e:
+                print(f"Error generating questions: {str(e)}")
+                span.fail(e)
+                return {"error": "Failed to generate questions"}
 
     def evaluate_candidate(self, data):
         """Evaluate the candidate's responses."""
@@ -61,22 +277,251 @@ class Agents:
 
         prompt = evaluate_candidate(data)
 
+        with telemetry.span("evaluate_candidate") as span:
+            try:
+                response = self.generate_content(prompt, task="evaluate_candidate")
+                return self._extract_json(response.text)
+            except Exception as e:
+                print(f"Error evaluating candidate: {str(e)}")
+                span.fail(e)
+                return {"error": "Failed to evaluate candidate"}
+
+    def evaluate_answer(self, resume_analysis, answer):
+        """Score a single answer against the evaluation rubric."""
+        if not self.model:
+            return {"error": "Model is not initialized"}
+
+        # Only the parts of the analysis that matter for scoring one answer
+        resume_context = compact_json({
+            "primary_skills": resume_analysis.get("primary_skills", []),
+            "experience_summary": resume_analysis.get("experience_summary", ""),
+        })
+        prompt = answer_evaluation_prompt(resume_context, answer)
+
+        # One span for the structured call and its free-text retry
+        with telemetry.span("evaluate_answer") as span:
+            if self.structured:
+                try:
+                    return self.generate_structured(prompt, AnswerScore, task="evaluate_answer").to_dict()
+                except Exception as e:
+                    if is_upstream_failure(e):
+                        print(f"Error evaluating answer: {str(e)}")
+                        span.fail(e)
+                        return {"error": "Failed to evaluate answer"}
+                    print(f"Structured answer evaluation failed, retrying as free text: {str(e)}")
+
+            try:
+                response = self.generate_content(prompt, task="evaluate_answer")
+                return self._extract_json(response.text, ANSWER_SCORE_SCHEMA)
+            except Exception as e:
+                print(f"Error evaluating answer: {str(e)}")
+                span.fail(e)
+                return {"error": "Failed to evaluate answer"}
+
+    async def agenerate_content(self, prompt, timeout=None, task="generate", **kwargs):
+        """
+        Async ``generate_content`` on the shared model handle.
+
+        At most ``max_concurrency`` calls are in flight per event loop; the
+        call and its retries are cancelled after ``timeout`` seconds. Routing,
+        hedging and fallbacks work as for the blocking calls; time spent
+        waiting for a concurrency slot counts as queue time.
+        """
+        prompt = self.prepare_prompt(prompt, task)
+        deadline = Deadline(timeout or self.timeout)
+        timing = {"entered": time.perf_counter()}
+        with telemetry.span(task) as span:
+            model_name, response = None, None
+            try:
+                async with self._get_semaphore():
+                    model_name, response = await self._acall_chain(prompt, task, deadline, kwargs, timing)
+                return response
+            finally:
+                self._record_call(span, model_name, prompt, response, timing)
+
+    async def _acall_chain(self, prompt, task, deadline, kwargs, timing):
+        chain = self._model_chain(task)
+        first_error = None
+
+        if self._should_hedge(chain, kwargs):
+            hedge_model = self.hedging.hedge_model
+            try:
+                response, hedge_won = await ahedged_call(
+                    self._aleg(chain[0], prompt, deadline, kwargs, timing),
+                    self._aleg(hedge_model, prompt, deadline, kwargs, timing),
+                    self.hedging.delay(self.latency.histogram(chain[0])),
+                    on_hedge=lambda: self.latency.incr("hedged"),
+                )
+                if hedge_won:
+                    self.latency.incr("hedge_wins")
+                return (hedge_model if hedge_won else chain[0]), response
+            except Exception as e:
+                if not is_upstream_failure(e):
+                    raise
+                first_error = e
+            chain = [name for name in chain[1:] if name != hedge_model]
+
+        for model_name in chain:
+            try:
+                return model_name, await self._aleg(model_name, prompt, deadline, kwargs, timing)()
+            except Exception as e:
+                if not is_upstream_failure(e):
+                    raise
+                print(f"Model {model_name} failed: {str(e) or type(e).__name__}")
+                first_error = first_error or e
+                self.latency.incr("fallbacks")
+        raise first_error
+
+    def _aleg(self, model_name, prompt, deadline, kwargs, timing):
+        model = self.registry.get_model(model_name)
+
+        def call(remaining):
+            timing.setdefault("started", time.perf_counter())
+            options = dict(kwargs, request_options={"timeout": remaining})
+            if hasattr(model, "generate_content_async"):
+                return model.generate_content_async(prompt, **options)
+            return asyncio.to_thread(model.generate_content, prompt, **options)
+
+        return atimed(self.latency, model_name, lambda: self.resilience.acall(call, deadline, key=model_name))
+
+    async def agenerate_questions(self, data):
+        """Generate technical interview questions without blocking the event loop."""
+        with telemetry.span("generate_questions") as span:
+            try:
+                response = await self.agenerate_content(question_generation_prompt(data), task="generate_questions")
+                return self._extract_json(response.text)
+            except Exception as e:
+                print(f"Error generating questions: {str(e) or type(e).__name__}")
+                span.fail(e)
+                return {"error": "Failed to generate questions"}
+
+    async def aevaluate_candidate(self, data):
+        """Evaluate the candidate's responses without blocking the event loop."""
+        with telemetry.span("evaluate_candidate") as span:
+            try:
+                response = await self.agenerate_content(evaluate_candidate(data), task="evaluate_candidate")
+                return self._extract_json(response.text)
+            except Exception as e:
+                print(f"Error evaluating candidate: {str(e) or type(e).__name__}")
+                span.fail(e)
+                return {"error": "Failed to evaluate candidate"}
+
+    async def aanalyze_resume(self, resume_text):
+        """Analyze resume text without blocking the event loop."""
+        with telemetry.span("resume_analysis") as span:
+            try:
+                if self.structured:
+                    response = await self.agenerate_content(
+                        resume_analysis_prompt(resume_text), task="resume_analysis",
+                        generation_config=structured_config(ResumeAnalysis),
+                    )
+                    result = ResumeAnalysis.from_dict(parse_json_response(response.text)).to_dict()
+                    telemetry.mark_parse(True)
+                    return result
+                response = await self.agenerate_content(resume_analysis_prompt(resume_text), task="resume_analysis")
+                return self._extract_json(response.text)
+            except Exception as e:
+                print(f"Error analyzing resume: {str(e) or type(e).__name__}")
+                if isinstance(e, JSONResponseError):
+                    telemetry.mark_parse(False)
+                span.fail(e)
+                return {"error": "Failed to analyze resume"}
+
+    def _get_semaphore(self):
+        # asyncio primitives are bound to one loop, so keep one per loop
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    def stream_json(self, prompt, task="generate_json", schema=None, response_schema=None):
+        """
+        Yield the top-level ``(key, value)`` members of a JSON response as
+        soon as each one is complete.
+
+        In structured mode ``response_schema`` (a class from
+        ``Agents.schemas``) constrains the response to its JSON schema.
+
+        Falls back to a blocking ``generate_content`` call when streaming is
+        disabled or breaks mid-response; members already yielded are not repeated. Once the
+        response is complete it is checked against ``schema``; if a member
+        failed to parse or the check fails, the whole response is repaired
+        and the members not yet yielded (repaired or defaulted) follow.
+        ``JSONResponseError`` is raised if it is still invalid.
+        """
+        prompt = self.prepare_prompt(prompt, task)
+        kwargs = {}
+        if response_schema is not None and self.structured:
+            kwargs["generation_config"] = structured_config(response_schema)
+        # A generator can't hold the telemetry context across yields, so the span is passed explicitly
+        span = telemetry.current()
+        own_span = span is None
+        if own_span:
+            span = telemetry.Span(task)
+        parser = IncrementalJSONParser()
+        emitted = set()
+        response_text = None
         try:
-            response = self.model.generate_content(prompt)
-            return self._extract_json(response.text)
+            if self.streaming:
+                # Opening the stream is already retried, so an upstream failure here is final
+                chunks = self._call_model(prompt, task, span=span, stream=True, **kwargs)
+                try:
+                    for chunk in chunks:
+                        for key, value in parser.feed(chunk.text):
+                            if schema:
+                                try:
+                                    value = validate_field(key, value, schema)
+                                except JSONResponseError:
+                                    continue  # Reported by the final validation
+                            emitted.add(key)
+                            yield key, value
+                        if parser.done:
+                            break
+                    response_text = parser.buffer
+                    span.response_tokens += estimate_tokens(response_text)
+                except Exception as e:
+                    print(f"Streaming failed, falling back to blocking call: {str(e)}")
+
+            if response_text is None:
+                parser = IncrementalJSONParser()
+                response_text = self._call_model(prompt, task, span=span, **kwargs).text
+                parser.feed(response_text)
+
+            result = None
+            if parser.done and not parser.failed:
+                try:
+                    result = validate_json(parser.result(), schema) if schema else parser.result()
+                except JSONResponseError:
+                    pass  # Repaired from the full response below
+            if result is None:
+                if parser.failed:
+                    print(f"{len(parser.failed)} malformed member(s) in the {task} response; repairing it")
+                try:
+                    result = parse_json_response(response_text, schema)
+                except JSONResponseError:
+                    span.parse_ok = False
+                    raise
+            if span.parse_ok is None:
+                span.parse_ok = True
+            for key, value in result.items():
+                if key not in emitted:
+                    yield key, value
         except Exception as e:
-            print(f"Error evaluating candidate: {str(e)}")
-            return {"error": "Failed to evaluate candidate"}
+            if own_span:
+                span.fail(e)
+            raise
+        finally:
+            if own_span:
+                telemetry.finish(span)
 
-    def _extract_json(self, response_text):
+    def _extract_json(self, response_text, schema=None):
         """Extract JSON content from the model's response."""
         try:
-            if response_text.startswith("```") and "```" in response_text:
-                start_idx = response_text.find("{")
-                end_idx = response_text.rfind("}") + 1
-                response_text = response_text[start_idx:end_idx]
-
-            return json.loads(response_text)
-        except json.JSONDecodeError:
-            print("Failed to parse JSON from response.")
+            result = parse_json_response(response_text, schema)
+        except JSONResponseError as e:
+            print(f"Failed to parse JSON from response: {str(e)}")
+            telemetry.mark_parse(False)
             return {"error": "Invalid JSON response from API"}
+        telemetry.mark_parse(True)
+        return result
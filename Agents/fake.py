@@ -0,0 +1,349 @@
+import asyncio
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+
+def _api_exceptions():
+    # Imported lazily like in Agents.resilience, so the fake doesn't slow startup
+    from google.api_core import exceptions
+    return exceptions
+
+
+def example_from_schema(schema):
+    """Build a minimal value matching a ``response_schema`` dict."""
+    kind = schema.get("type", "string").lower()
+    if kind == "object":
+        return {key: example_from_schema(value) for key, value in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [example_from_schema(schema.get("items", {}))]
+    if kind in ("integer", "number"):
+        return 10
+    if kind == "boolean":
+        return True
+    return (schema.get("enum") or ["example"])[0]
+
+
+class FakeModel:
+    """
+    Local stand-in for ``gen_ai.GenerativeModel`` that replays canned text.
+
+    ``responses`` is either a string returned for every prompt or a callable
+    ``prompt -> str``; with ``responses=None`` calls that pass a
+    ``response_schema`` get a generated value matching it. With
+    ``stream=True`` the text is returned as chunks of ``chunk_size``
+    characters, each delayed by ``chunk_delay`` seconds.
+    """
+    def __init__(self, responses=None, chunk_size=16, chunk_delay=0.0, latency=0.0,
+                 fail_streaming=False):
+        self.responses = responses
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.latency = latency
+        self.fail_streaming = fail_streaming
+        self.calls = []
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self.calls.append({"prompt": prompt, "stream": stream, **kwargs})
+        text, latency = self._reply(prompt, kwargs)
+        if stream:
+            if self.fail_streaming:
+                raise RuntimeError("Streaming is not supported by this fake")
+            return self._stream(text, latency)
+        time.sleep(latency)
+        return SimpleNamespace(text=text)
+
+    async def generate_content_async(self, prompt, **kwargs):
+        self.calls.append({"prompt": prompt, "stream": False, **kwargs})
+        text, latency = self._reply(prompt, kwargs)
+        await asyncio.sleep(latency)
+        return SimpleNamespace(text=text)
+
+    def start_chat(self, history=None):
+        return SimpleNamespace(history=list(history or []))
+
+    def _reply(self, prompt, kwargs):
+        """Response text and latency of one call."""
+        return self._respond(prompt, kwargs), self.latency
+
+    def _respond(self, prompt, kwargs):
+        if self.responses is None:
+            schema = (kwargs.get("generation_config") or {}).get("response_schema")
+            if schema is None:
+                raise ValueError("FakeModel has no response for a call without response_schema")
+            return json.dumps(example_from_schema(schema))
+        return self.responses(prompt) if callable(self.responses) else self.responses
+
+    def _stream(self, text, latency):
+        time.sleep(latency)
+        for i in range(0, len(text), self.chunk_size):
+            time.sleep(self.chunk_delay)
+            yield SimpleNamespace(text=text[i:i + self.chunk_size])
+
+
+class FaultInjectingModel:
+    """
+    Wraps a model and makes a share of its calls fail like a struggling API.
+
+    Each call fails with probability ``error_rate`` (raising one of
+    ``errors``, 429/503 by default) or takes ``slow_latency`` seconds
+    longer with probability ``slow_rate``, timing out past the request's
+    ``timeout``. ``fail_next(n)`` forces the next ``n``
+    calls to fail, e.g. to simulate an outage.
+    """
+    DEFAULT_ERRORS = (
+        lambda: _api_exceptions().ResourceExhausted("Resource has been exhausted"),
+        lambda: _api_exceptions().ServiceUnavailable("The service is currently unavailable"),
+    )
+
+    def __init__(self, model, error_rate=0.0, errors=None, slow_rate=0.0, slow_latency=1.0, seed=None):
+        self.model = model
+        self.error_rate = error_rate
+        self.errors = list(errors or self.DEFAULT_ERRORS)
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self.injected = 0
+        self._forced = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def fail_next(self, count):
+        with self._lock:
+            self._forced += count
+
+    def _fault(self):
+        """Return ``(error, delay)`` for the next call."""
+        with self._lock:
+            if self._forced > 0 or self._rng.random() < self.error_rate:
+                self._forced = max(0, self._forced - 1)
+                self.injected += 1
+                return self._rng.choice(self.errors)(), 0.0
+            return None, self.slow_latency if self._rng.random() < self.slow_rate else 0.0
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        error, delay = self._fault()
+        if error:
+            raise error
+        timeout = (kwargs.get("request_options") or {}).get("timeout")
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise _api_exceptions().DeadlineExceeded("Deadline Exceeded")
+        time.sleep(delay)
+        return self.model.generate_content(prompt, stream=stream, **kwargs)
+
+    async def generate_content_async(self, prompt, **kwargs):
+        error, delay = self._fault()
+        if error:
+            raise error
+        await asyncio.sleep(delay)
+        return await self.model.generate_content_async(prompt, **kwargs)
+
+    def start_chat(self, history=None):
+        return self.model.start_chat(history)
+
+
+class FakeRegistry:
+    """
+    Drop-in for ``ModelRegistry`` that always serves the given model, or
+    the matching entry of ``models`` for a specific model name.
+    """
+    def __init__(self, model, model_name="models/fake", models=None):
+        self.model = model
+        self.model_name = model_name
+        self.models = dict(models or {})
+
+    def get_model_name(self):
+        return self.model_name
+
+    def get_model(self, model_name=None):
+        return self.models.get(model_name, self.model)
+
+
+class LatencyDistribution:
+    """
+    Model latency in seconds, parsed from ``fixed:S``, ``uniform:LOW,HIGH``
+    or ``lognormal:MEDIAN,SIGMA`` (a bare number is ``fixed``).
+    """
+    KINDS = ("fixed", "uniform", "lognormal")
+
+    def __init__(self, kind="fixed", *params):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution {kind!r}; expected one of {', '.join(self.KINDS)}")
+        self.kind = kind
+        self.params = [float(param) for param in params] or [0.0]
+
+    @classmethod
+    def parse(cls, spec):
+        kind, _, params = str(spec).strip().partition(":")
+        if not params:
+            return cls("fixed", kind or 0.0)
+        return cls(kind.strip().lower(), *params.split(","))
+
+    def sample(self, rng):
+        if self.kind == "uniform":
+            return rng.uniform(self.params[0], self.params[-1])
+        if self.kind == "lognormal":
+            sigma = self.params[1] if len(self.params) > 1 else 0.5
+            return self.params[0] * math.exp(rng.gauss(0.0, sigma))
+        return self.params[0]
+
+    def __repr__(self):
+        return f"{self.kind}:{','.join(f'{param:g}' for param in self.params)}"
+
+
+SKILL_VOCABULARY = [
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "SQL", "PostgreSQL", "MongoDB", "Redis", "Django",
+    "Flask", "FastAPI", "React", "Node.js", "Docker", "Kubernetes", "AWS", "Kafka", "Spark", "TensorFlow",
+]
+QUESTION_TYPES = ("project", "skill", "design", "problem")
+
+
+class SimulatedModel(FakeModel):
+    """
+    Deterministic offline stand-in for Gemini that answers every prompt the
+    app sends (resume analysis, question sets and batches, answer scores,
+    the one-shot evaluation) with plausible JSON.
+
+    Each call draws its latency from ``latency`` (a ``LatencyDistribution``
+    or spec string), fails with a 429/503 with probability ``error_rate``
+    and returns a malformed response (wrapped in prose, truncated or no JSON
+    at all) with probability ``malformed_rate``. All draws are seeded by
+    ``seed``, the prompt and how often it was seen, so a run is repeatable
+    regardless of thread scheduling and a retried prompt draws again.
+    """
+    def __init__(self, latency="fixed:0", error_rate=0.0, malformed_rate=0.0, seed=0, chunk_size=64):
+        super().__init__(chunk_size=chunk_size)
+        if not isinstance(latency, LatencyDistribution):
+            latency = LatencyDistribution.parse(latency)
+        self.latency_distribution = latency
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.seed = seed
+        self.injected_errors = 0
+        self.malformed = 0
+        self._seen = Counter()
+        self._lock = threading.Lock()
+
+    def _rng(self, prompt):
+        text = prompt if isinstance(prompt, str) else json.dumps(prompt, default=str)
+        digest = hashlib.sha256(f"{self.seed}\0{text}".encode("utf-8")).hexdigest()
+        with self._lock:
+            self._seen[digest] += 1
+            attempt = self._seen[digest]
+        return random.Random(f"{digest}:{attempt}")
+
+    def _reply(self, prompt, kwargs):
+        rng = self._rng(prompt)
+        latency = self.latency_distribution.sample(rng)
+        if rng.random() < self.error_rate:
+            with self._lock:
+                self.injected_errors += 1
+            time.sleep(latency / 2)
+            raise rng.choice(FaultInjectingModel.DEFAULT_ERRORS)()
+        text = self._write(prompt if isinstance(prompt, str) else json.dumps(prompt, default=str), kwargs, rng)
+        if rng.random() < self.malformed_rate:
+            with self._lock:
+                self.malformed += 1
+            text = self._malform(text, rng)
+        return text, latency
+
+    def _write(self, prompt, kwargs, rng):
+        if "Analyze the following resume" in prompt:
+            return json.dumps(self._resume_analysis(prompt, rng))
+        if "scoring ONE answer" in prompt:
+            return json.dumps(self._answer_score(prompt, rng))
+        if "Evaluate the candidate's responses" in prompt:
+            return json.dumps(self._evaluation(rng))
+        if "**Skills:**" in prompt:
+            return json.dumps(self._questions(prompt, rng))
+        if "Generate 10 questions" in prompt:
+            return json.dumps({f"question{i}": f"Question {i}: explain a concept of increasing depth." for i in range(1, 11)})
+        if "final score string" in prompt:
+            return rng.choice(["1", "10", "100", "1000", "10000"])
+        schema = (kwargs.get("generation_config") or {}).get("response_schema")
+        return json.dumps(example_from_schema(schema) if schema else {})
+
+    @staticmethod
+    def _malform(text, rng):
+        kind = rng.choice(("prose", "truncated", "refusal"))
+        if kind == "prose":
+            return f"Sure! Here is the JSON you asked for:\n```json\n{text}\n```\nLet me know if you need more."
+        if kind == "truncated":
+            return text[:max(1, int(len(text) * rng.uniform(0.3, 0.8)))]
+        return "I'm sorry, but I can't provide that in JSON format."
+
+    @staticmethod
+    def _resume_analysis(prompt, rng):
+        found = [skill for skill in SKILL_VOCABULARY if re.search(rf"(?<!\w){re.escape(skill)}(?!\w)", prompt)]
+        skills = found[:6] or rng.sample(SKILL_VOCABULARY, 4)
+        return {
+            "primary_skills": skills,
+            "experience_summary": f"{rng.randint(1, 12)} years of software development with {', '.join(skills[:3])}.",
+            "key_projects": [f"{rng.choice(['Payments', 'Search', 'Analytics', 'Inventory'])} service"
+                             for _ in range(rng.randint(1, 3))],
+            "areas_for_clarification": [f"Depth of {rng.choice(skills)} experience"],
+            "suggested_question_topics": rng.sample(skills, min(3, len(skills))),
+        }
+
+    @staticmethod
+    def _questions(prompt, rng):
+        requested = re.findall(r"\*\*(\d+) (project|skill|design|problem) questions?\*\*", prompt)
+        if requested:
+            types = [kind for count, kind in requested for _ in range(int(count))]
+        else:
+            types = ["project"] * 2 + ["skill"] * 3 + ["design"] * 2 + ["problem"] * 3
+        skills_line = re.search(r"\*\*Skills:\*\* (.*)", prompt)
+        skills = [skill for skill in (skills_line.group(1).split(", ") if skills_line else []) if skill]
+        skills = skills or ["software design"]
+        questions = {}
+        for i, kind in enumerate(types, start=1):
+            focus = rng.choice(skills)
+            questions[f"question{i}"] = {
+                "question": f"Walk through a {kind} scenario involving {focus} (variant {rng.randint(1000, 9999)}).",
+                "type": kind,
+                "focus_area": focus,
+            }
+        return questions
+
+    @staticmethod
+    def _answer_score(prompt, rng):
+        answer = prompt.split("Candidate answer:", 1)[-1].split("Return ONLY", 1)[0]
+        # Longer answers score higher, like a rubric rewarding detail
+        quality = min(17.0, 3.0 + len(answer.split()) / 5)
+        scores = {category: max(0, min(20, round(quality + rng.gauss(0, 2)))) for category in (
+            "technical_accuracy", "knowledge_depth", "problem_solving", "communication", "experience_relevance")}
+        return {
+            "category_scores": scores,
+            "strengths": [rng.choice(["Clear structure", "Concrete example", "Correct terminology"])],
+            "areas_for_improvement": [rng.choice(["More depth", "Discuss trade-offs", "Quantify impact"])],
+            "feedback": "Reasonable answer." if quality >= 10 else "Too brief to show real understanding.",
+        }
+
+    @staticmethod
+    def _evaluation(rng):
+        scores = {category: rng.randint(8, 17) for category in (
+            "technical_accuracy", "knowledge_depth", "problem_solving", "communication", "experience_relevance")}
+        return {
+            "overall_score": sum(scores.values()),
+            "category_scores": scores,
+            "strengths": ["Clear structure"],
+            "areas_for_improvement": ["More depth"],
+            "detailed_feedback": "Solid fundamentals; needs more depth on trade-offs.",
+        }
+
+
+def simulated_model_from_env():
+    """``SimulatedModel`` configured by the ``INTERVIEWMATE_FAKE_*`` environment variables."""
+    return SimulatedModel(
+        latency=os.getenv("INTERVIEWMATE_FAKE_LATENCY", "lognormal:0.5,0.4"),
+        error_rate=float(os.getenv("INTERVIEWMATE_FAKE_ERROR_RATE", "0")),
+        malformed_rate=float(os.getenv("INTERVIEWMATE_FAKE_MALFORMED_RATE", "0")),
+        seed=int(os.getenv("INTERVIEWMATE_FAKE_SEED", "0")),
+    )
@@ -0,0 +1,149 @@
+import json
+import os
+import threading
+import time
+
+# Ordered by preference; the first one the API key can see wins
+PREFERRED_MODELS = [
+    "models/gemini-1.5-pro-latest",  # Best choice
+    "models/gemini-1.5-pro",
+    "models/gemini-1.5-flash-latest",  # Fast but less powerful
+]
+
+DEFAULT_TTL_SECONDS = 6 * 60 * 60
+DEFAULT_STATE_PATH = os.path.join(
+    os.path.expanduser("~"), ".interviewmate", "model_registry.json"
+)
+
+
+class ModelRegistry:
+    """
+    Process-wide, thread-safe cache of the Gemini model handle.
+
+    The SDK is configured once, model discovery runs lazily on first use and
+    the last known good model name is persisted to disk, so a cold start can
+    build a model handle without calling ``list_models()``. Once the TTL has
+    expired the model list is refreshed in a background thread while the
+    current model keeps serving requests. Without a ``client`` the Gemini
+    SDK is imported on first use.
+    """
+    def __init__(self, client=None, api_key=None, preferred_models=None,
+                 ttl=DEFAULT_TTL_SECONDS, state_path=DEFAULT_STATE_PATH):
+        self._client = client
+        self.api_key = api_key
+        self.preferred_models = list(preferred_models or PREFERRED_MODELS)
+        self.ttl = ttl
+        self.state_path = state_path
+
+        self._lock = threading.RLock()
+        self._configured = False
+        self._model_name = None
+        self._discovered_at = 0.0
+        self._models = {}
+        self._refreshing = False
+
+    @property
+    def client(self):
+        # google.generativeai takes about a second to import
+        if self._client is None:
+            import google.generativeai as gen_ai
+            self._client = gen_ai
+        return self._client
+
+    # Public API
+    def get_model_name(self):
+        """Return the selected model name, discovering it only when unknown."""
+        with self._lock:
+            if self._model_name is None:
+                self._load_state()
+            if self._model_name is None:
+                self.refresh()
+            elif self._is_stale():
+                self._refresh_in_background()
+            return self._model_name
+
+    def get_model(self, model_name=None):
+        """Return a cached ``GenerativeModel`` for the selected (or given) model."""
+        with self._lock:
+            model_name = model_name or self.get_model_name()
+            if model_name not in self._models:
+                self._configure()
+                self._models[model_name] = self.client.GenerativeModel(model_name)
+            return self._models[model_name]
+
+    def refresh(self):
+        """Re-run model discovery and persist the result."""
+        self._configure()
+        available_models = [m.name for m in self.client.list_models()]
+        model_name = next((m for m in self.preferred_models if m in available_models), None)
+        if not model_name:
+            raise ValueError("❌ No valid Gemini models found. Check your API key permissions.")
+
+        with self._lock:
+            if model_name != self._model_name:
+                self._models.pop(self._model_name, None)
+            self._model_name = model_name
+            self._discovered_at = time.time()
+            self._save_state()
+        return model_name
+
+    def invalidate(self):
+        """Forget the selected model so the next access rediscovers it."""
+        with self._lock:
+            self._model_name = None
+            self._discovered_at = 0.0
+            self._models.clear()
+            try:
+                os.remove(self.state_path)
+            except OSError:
+                pass
+
+    # Internals
+    def _configure(self):
+        with self._lock:
+            if not self._configured:
+                self.client.configure(api_key=self.api_key)
+                self._configured = True
+
+    def _is_stale(self):
+        return self.ttl is not None and time.time() - self._discovered_at > self.ttl
+
+    def _refresh_in_background(self):
+        if self._refreshing:
+            return
+        self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"❌ Error refreshing models: {str(e)}")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="model-registry-refresh", daemon=True).start()
+
+    def _load_state(self):
+        if not self.state_path:
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if state.get("model_name") in self.preferred_models:
+            self._model_name = state["model_name"]
+            self._discovered_at = float(state.get("discovered_at", 0.0))
+
+    def _save_state(self):
+        if not self.state_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            tmp_path = f"{self.state_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"model_name": self._model_name,
+                           "discovered_at": self._discovered_at}, f)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            print(f"❌ Could not persist model selection: {str(e)}")
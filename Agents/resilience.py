@@ -0,0 +1,301 @@
+"""
+Resilience layer for model calls: jittered exponential backoff, deadline
+propagation, a shared token-bucket rate limiter and a circuit breaker.
+
+``ResilientCaller.call`` (and ``acall`` for coroutines) runs a model call
+under all four and records counters in ``ResilienceMetrics``. Retries and
+the rate limit are shared; each upstream ``key`` (model) gets its own
+breaker so one failing model doesn't trip the others. The wrapped
+function receives the seconds left before the deadline so the request
+timeout never outlives the caller's budget.
+"""
+import asyncio
+import random
+import threading
+import time
+
+_retryable_errors = None
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when a call's deadline passes before it could succeed."""
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised without calling the model while the circuit breaker is open."""
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+        super().__init__(
+            f"The AI service is temporarily unavailable, please try again in {retry_after:.0f}s"
+        )
+
+
+def retryable_errors():
+    """Transient upstream failures worth another attempt."""
+    # The SDK's exceptions are only needed once a call has failed, so
+    # importing Agents doesn't pay for them
+    global _retryable_errors
+    if _retryable_errors is None:
+        from google.api_core import exceptions as api_exceptions
+        _retryable_errors = (
+            api_exceptions.TooManyRequests,
+            api_exceptions.ResourceExhausted,
+            api_exceptions.ServiceUnavailable,
+            api_exceptions.InternalServerError,
+            api_exceptions.DeadlineExceeded,
+            TimeoutError,
+            ConnectionError,
+        )
+    return _retryable_errors
+
+
+def is_retryable(error):
+    return isinstance(error, retryable_errors())
+
+
+def is_upstream_failure(error):
+    """True for errors that retrying the same call right away won't fix."""
+    return isinstance(error, retryable_errors() + (CircuitOpenError,))
+
+
+class Deadline:
+    """An absolute point in time that a call and all its retries must meet."""
+    def __init__(self, timeout):
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter, capped at ``max_delay``."""
+    def __init__(self, max_attempts=3, base_delay=0.5, max_delay=8.0, rng=None):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._rng = rng or random.Random()
+
+    def delay(self, attempt):
+        """Seconds to wait before retry number ``attempt`` (1 for the first retry)."""
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at ``rate`` tokens per second.
+
+    Callers reserve a token and sleep for the returned wait themselves, so
+    the same bucket throttles threads and event loops alike.
+    """
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait=None):
+        """
+        Take a token and return how long to wait before using it.
+
+        Returns ``None`` (taking nothing) if the wait would exceed ``max_wait``.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            wait = max(0.0, (1 - self._tokens) / self.rate)
+            if max_wait is not None and wait > max_wait:
+                return None
+            # Tokens may go negative: later callers queue up behind this one
+            self._tokens -= 1
+            return wait
+
+
+class CircuitBreaker:
+    """
+    Fast-fails calls after ``failure_threshold`` consecutive failures.
+
+    After ``reset_timeout`` seconds one trial call is let through
+    (half-open); success closes the circuit, failure opens it again.
+    """
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self):
+        """Raise ``CircuitOpenError`` unless a call may go ahead."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed < self.reset_timeout or self._trial_in_flight:
+                raise CircuitOpenError(max(1.0, self.reset_timeout - elapsed))
+            self._state = self.HALF_OPEN
+            self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class ResilienceMetrics:
+    """Thread-safe counters describing how model calls fared."""
+    FIELDS = (
+        "calls", "successes", "failures", "retries", "deadline_exceeded",
+        "rate_limited", "rate_limit_wait_seconds", "circuit_rejections", "circuit_opened",
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = dict.fromkeys(self.FIELDS, 0)
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            self._values[name] += amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+
+class ResilientCaller:
+    """Runs model calls with retries, a deadline, rate limiting and a breaker."""
+    def __init__(self, retry=None, rate_limiter=None, breaker=None, metrics=None,
+                 default_timeout=60.0, sleep=time.sleep):
+        self.retry = retry or RetryPolicy()
+        self.rate_limiter = rate_limiter
+        self.breaker = breaker or CircuitBreaker()
+        self.metrics = metrics or ResilienceMetrics()
+        self.default_timeout = default_timeout
+        self._sleep = sleep
+        self._breakers = {None: self.breaker}
+        self._breakers_lock = threading.Lock()
+
+    def breaker_for(self, key):
+        """The circuit breaker for one upstream, created with the default settings."""
+        with self._breakers_lock:
+            if key not in self._breakers:
+                self._breakers[key] = CircuitBreaker(self.breaker.failure_threshold, self.breaker.reset_timeout)
+            return self._breakers[key]
+
+    def circuit_states(self):
+        with self._breakers_lock:
+            breakers = dict(self._breakers)
+        return {key: breaker.state for key, breaker in breakers.items() if key is not None}
+
+    def call(self, fn, deadline=None, key=None):
+        """Call ``fn(remaining_seconds)`` until it succeeds or the budget runs out."""
+        deadline = deadline or Deadline(self.default_timeout)
+        breaker = self.breaker_for(key)
+        self.metrics.incr("calls")
+        attempt = 0
+        while True:
+            attempt += 1
+            self._sleep(self._admit(deadline, breaker))
+            try:
+                result = fn(deadline.remaining())
+            except Exception as e:
+                delay = self._after_failure(e, attempt, deadline, breaker)
+                self._sleep(delay)
+                continue
+            self._after_success(breaker)
+            return result
+
+    async def acall(self, fn, deadline=None, key=None):
+        """Async ``call``; ``fn(remaining_seconds)`` returns an awaitable."""
+        deadline = deadline or Deadline(self.default_timeout)
+        breaker = self.breaker_for(key)
+        self.metrics.incr("calls")
+        attempt = 0
+        while True:
+            attempt += 1
+            await asyncio.sleep(self._admit(deadline, breaker))
+            try:
+                result = await asyncio.wait_for(fn(deadline.remaining()), deadline.remaining())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await asyncio.sleep(self._after_failure(e, attempt, deadline, breaker))
+                continue
+            self._after_success(breaker)
+            return result
+
+    def _admit(self, deadline, breaker):
+        """Check the breaker, deadline and rate limit; return the wait before calling."""
+        try:
+            breaker.before_call()
+        except CircuitOpenError:
+            self.metrics.incr("circuit_rejections")
+            self.metrics.incr("failures")
+            raise
+        if deadline.expired():
+            self._deadline_exceeded()
+        if self.rate_limiter is None:
+            return 0.0
+        wait = self.rate_limiter.reserve(max_wait=deadline.remaining())
+        if wait is None:
+            self._deadline_exceeded("Rate limit wait exceeds the request deadline")
+        if wait > 0:
+            self.metrics.incr("rate_limited")
+            self.metrics.incr("rate_limit_wait_seconds", wait)
+        return wait
+
+    def _after_failure(self, error, attempt, deadline, breaker):
+        """Record a failed attempt; return the backoff delay or re-raise."""
+        if isinstance(error, asyncio.TimeoutError) and not isinstance(error, TimeoutError):
+            error = DeadlineExceededError("Request deadline exceeded")
+        retryable = is_retryable(error)
+        if retryable:
+            was_open = breaker.state == CircuitBreaker.OPEN
+            breaker.record_failure()
+            if not was_open and breaker.state == CircuitBreaker.OPEN:
+                self.metrics.incr("circuit_opened")
+        else:
+            # e.g. an invalid request: the upstream answered, so it is healthy
+            breaker.record_success()
+
+        delay = self.retry.delay(attempt)
+        if not retryable or attempt >= self.retry.max_attempts or delay >= deadline.remaining():
+            self.metrics.incr("failures")
+            if retryable and deadline.remaining() <= delay:
+                self.metrics.incr("deadline_exceeded")
+            raise error
+        self.metrics.incr("retries")
+        return delay
+
+    def _after_success(self, breaker):
+        breaker.record_success()
+        self.metrics.incr("successes")
+
+    def _deadline_exceeded(self, message="Request deadline exceeded"):
+        self.metrics.incr("deadline_exceeded")
+        self.metrics.incr("failures")
+        raise DeadlineExceededError(message)
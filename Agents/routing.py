@@ -0,0 +1,242 @@
+"""
+Per-task model routing, hedged requests and per-model latency histograms.
+
+A task (``resume_analysis``, ``evaluation``, ...) can be routed to its own
+model. When hedging is on and the primary model hasn't answered within
+its observed latency percentile, the same request is sent to a faster
+hedge model and the first valid response wins; a primary that fails
+outright hands over to the hedge straight away.
+"""
+import asyncio
+import bisect
+import math
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+HEDGE_MODEL = "models/gemini-1.5-flash-latest"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    # One pool per process; hedged legs of every session share it
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("INTERVIEWMATE_HEDGE_WORKERS", "16")),
+                thread_name_prefix="hedged-request",
+            )
+        return _executor
+
+
+class LatencyHistogram:
+    """Thread-safe latency histogram with geometric buckets from 10ms to ~10 minutes."""
+    BOUNDS = tuple(0.01 * 1.25 ** i for i in range(50))
+
+    def __init__(self):
+        self._counts = [0] * (len(self.BOUNDS) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self):
+        return self._count
+
+    def record(self, seconds):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.BOUNDS, seconds)] += 1
+            self._count += 1
+            self._total += seconds
+
+    def percentile(self, pct):
+        """Upper bound of the bucket holding the ``pct``-th percentile, or ``None``."""
+        with self._lock:
+            if not self._count:
+                return None
+            rank = max(1, math.ceil(pct / 100 * self._count))
+            seen = 0
+            for i, count in enumerate(self._counts):
+                seen += count
+                if seen >= rank:
+                    return self.BOUNDS[min(i, len(self.BOUNDS) - 1)]
+
+    def snapshot(self):
+        return {
+            "count": self._count,
+            "mean": self._total / self._count if self._count else None,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class LatencyTracker:
+    """Latency histograms per model plus hedging counters."""
+    def __init__(self):
+        self._histograms = {}
+        self._counters = Counter()
+        self._lock = threading.Lock()
+
+    def histogram(self, model_name):
+        with self._lock:
+            if model_name not in self._histograms:
+                self._histograms[model_name] = LatencyHistogram()
+            return self._histograms[model_name]
+
+    def record(self, model_name, seconds):
+        self.histogram(model_name).record(seconds)
+
+    def incr(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def snapshot(self):
+        with self._lock:
+            histograms = dict(self._histograms)
+            counters = dict(self._counters)
+        return {"models": {name: h.snapshot() for name, h in histograms.items()}, **counters}
+
+
+class TaskRouter:
+    """Maps task names to model names; unrouted tasks use the default model."""
+    def __init__(self, routes=None):
+        self.routes = dict(routes or {})
+
+    @classmethod
+    def from_string(cls, value):
+        """Parse ``"resume_analysis=models/gemini-1.5-flash-latest,evaluation=..."``."""
+        routes = {}
+        for item in (value or "").split(","):
+            task, _, model_name = item.partition("=")
+            if task.strip() and model_name.strip():
+                routes[task.strip()] = model_name.strip()
+        return cls(routes)
+
+    def model_for(self, task, default):
+        return self.routes.get(task, default)
+
+
+class HedgePolicy:
+    """
+    When to send a hedged request.
+
+    The delay is the primary model's ``percentile`` latency once it has
+    ``min_samples`` observations, ``default_delay`` seconds before that.
+    """
+    def __init__(self, enabled=False, hedge_model=HEDGE_MODEL, percentile=95,
+                 min_samples=20, default_delay=5.0):
+        self.enabled = enabled
+        self.hedge_model = hedge_model
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.default_delay = default_delay
+
+    def delay(self, histogram):
+        if histogram.count < self.min_samples:
+            return self.default_delay
+        return histogram.percentile(self.percentile)
+
+
+def is_valid_response(response):
+    """A response counts if it has text; blocked or empty candidates don't."""
+    try:
+        return bool(response.text)
+    except Exception:
+        return False
+
+
+def hedged_call(primary, hedge, delay, is_valid=is_valid_response, on_hedge=None):
+    """
+    Run ``primary()`` and, if it hasn't returned a valid result within
+    ``delay`` seconds (or fails first), ``hedge()`` as well.
+
+    Returns ``(result, hedge_won)`` for the first valid result. If neither
+    leg is valid, returns the last invalid result or raises the primary's
+    error. The losing leg is left to finish in the background.
+    """
+    executor = _get_executor()
+    legs = {executor.submit(primary): False}
+    done, pending = wait(legs, timeout=delay)
+    hedged = False
+    invalid, errors = None, []
+    while True:
+        for future in done:
+            try:
+                result = future.result()
+            except Exception as e:
+                errors.append((legs[future], e))
+                continue
+            if is_valid(result):
+                return result, legs[future]
+            invalid = (result, legs[future])
+        if not hedged:
+            hedged = True
+            if on_hedge:
+                on_hedge()
+            hedge_future = executor.submit(hedge)
+            legs[hedge_future] = True
+            pending = set(pending) | {hedge_future}
+        if not pending:
+            break
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+    if invalid:
+        return invalid
+    raise sorted(errors, key=lambda item: item[0])[0][1]
+
+
+async def ahedged_call(primary, hedge, delay, is_valid=is_valid_response, on_hedge=None):
+    """Async ``hedged_call``; the losing leg is cancelled."""
+    legs = {asyncio.ensure_future(primary()): False}
+    done, pending = await asyncio.wait(legs, timeout=delay)
+    hedged = False
+    invalid, errors = None, []
+    try:
+        while True:
+            for task in done:
+                if task.exception() is not None:
+                    errors.append((legs[task], task.exception()))
+                    continue
+                if is_valid(task.result()):
+                    return task.result(), legs[task]
+                invalid = (task.result(), legs[task])
+            if not hedged:
+                hedged = True
+                if on_hedge:
+                    on_hedge()
+                hedge_task = asyncio.ensure_future(hedge())
+                legs[hedge_task] = True
+                pending = set(pending) | {hedge_task}
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in legs:
+            task.cancel()
+    if invalid:
+        return invalid
+    raise sorted(errors, key=lambda item: item[0])[0][1]
+
+
+def timed(tracker, model_name, fn):
+    """Wrap ``fn`` so successful calls are recorded in ``model_name``'s histogram."""
+    def call():
+        start = time.perf_counter()
+        result = fn()
+        tracker.record(model_name, time.perf_counter() - start)
+        return result
+    return call
+
+
+def atimed(tracker, model_name, fn):
+    async def call():
+        start = time.perf_counter()
+        result = await fn()
+        tracker.record(model_name, time.perf_counter() - start)
+        return result
+    return call
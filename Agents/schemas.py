@@ -0,0 +1,211 @@
+"""
+Typed results for schema-constrained (structured output) generation.
+
+Each dataclass declares the ``RESPONSE_SCHEMA`` sent to Gemini as
+``response_schema`` and a ``from_dict`` that validates the returned JSON
+with the shared parser schemas, so callers get a checked object instead of
+a free-form dict.
+"""
+from dataclasses import asdict, dataclass, field, fields
+
+from utils.evaluation import CATEGORIES
+from utils.json_parser import (
+    ANSWER_SCORE_SCHEMA, EVALUATION_SCHEMA, NUMBER, REQUIRED, RESUME_ANALYSIS_SCHEMA, JSONResponseError,
+    validate_json
+)
+
+QUESTION_TYPES = ["project", "skill", "design", "problem"]
+
+STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+
+def structured_config(schema_cls):
+    """``generation_config`` asking Gemini for JSON matching ``schema_cls``."""
+    return {
+        "response_mime_type": "application/json",
+        "response_schema": schema_cls.RESPONSE_SCHEMA,
+    }
+
+
+@dataclass
+class ResumeAnalysis:
+    primary_skills: list
+    experience_summary: str = ""
+    key_projects: list = field(default_factory=list)
+    areas_for_clarification: list = field(default_factory=list)
+    suggested_question_topics: list = field(default_factory=list)
+
+    RESPONSE_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "primary_skills": STRING_LIST,
+            "experience_summary": {"type": "string"},
+            "key_projects": STRING_LIST,
+            "areas_for_clarification": STRING_LIST,
+            "suggested_question_topics": STRING_LIST,
+        },
+        "required": ["primary_skills", "experience_summary", "key_projects"],
+    }
+
+    @classmethod
+    def from_dict(cls, data):
+        data = validate_json(data, RESUME_ANALYSIS_SCHEMA)
+        return cls(**{f.name: data[f.name] for f in fields(cls)})
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class Question:
+    question: str
+    type: str = "general"
+    focus_area: str = "general"
+
+    RESPONSE_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "question": {"type": "string"},
+            "type": {"type": "string", "format": "enum", "enum": QUESTION_TYPES},
+            "focus_area": {"type": "string"},
+        },
+        "required": ["question", "type", "focus_area"],
+    }
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, str):
+            data = {"question": data}
+        if not isinstance(data, dict) or not str(data.get("question", "")).strip():
+            raise JSONResponseError("Question is missing its text")
+        return cls(
+            question=str(data["question"]).strip(),
+            type=str(data.get("type") or "general").strip().lower(),
+            focus_area=str(data.get("focus_area") or "general").strip(),
+        )
+
+
+@dataclass
+class QuestionSet:
+    questions: list
+
+    COUNT = 10
+    # Fixed keys rather than an array so each question still streams on its own
+    RESPONSE_SCHEMA = {
+        "type": "object",
+        "properties": {f"question{i}": Question.RESPONSE_SCHEMA for i in range(1, COUNT + 1)},
+        "required": [f"question{i}" for i in range(1, COUNT + 1)],
+    }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build from ``{"question1": {...}, ...}``, skipping invalid entries."""
+        if not isinstance(data, dict):
+            raise JSONResponseError("Response is not a JSON object")
+        questions = []
+        for i in range(1, cls.COUNT + 1):
+            try:
+                questions.append(Question.from_dict(data.get(f"question{i}")))
+            except JSONResponseError:
+                continue
+        if not questions:
+            raise JSONResponseError("No valid questions in response")
+        return cls(questions)
+
+    def to_dict(self):
+        return {f"question{i}": asdict(question) for i, question in enumerate(self.questions, start=1)}
+
+
+class QuestionBatch(QuestionSet):
+    """
+    A partial question set (a just-in-time batch or the questions the bank
+    couldn't supply): ``question1`` onwards, as many as were asked for.
+    """
+    RESPONSE_SCHEMA = {
+        "type": "object",
+        "properties": QuestionSet.RESPONSE_SCHEMA["properties"],
+        "required": ["question1"],
+    }
+
+
+CATEGORY_SCORE_FIELDS = {category: (NUMBER, REQUIRED) for category in CATEGORIES}
+
+
+def _category_scores(data):
+    scores = validate_json(data, CATEGORY_SCORE_FIELDS)
+    return {category: max(0, min(20, scores[category])) for category in CATEGORIES}
+
+
+CATEGORY_SCORES_SCHEMA = {
+    "type": "object",
+    "properties": {category: {"type": "integer"} for category in CATEGORIES},
+    "required": CATEGORIES,
+}
+
+
+@dataclass
+class Evaluation:
+    overall_score: int
+    category_scores: dict
+    strengths: list = field(default_factory=list)
+    areas_for_improvement: list = field(default_factory=list)
+    detailed_feedback: str = ""
+
+    RESPONSE_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "overall_score": {"type": "integer"},
+            "category_scores": CATEGORY_SCORES_SCHEMA,
+            "strengths": STRING_LIST,
+            "areas_for_improvement": STRING_LIST,
+            "detailed_feedback": {"type": "string"},
+        },
+        "required": ["overall_score", "category_scores", "strengths",
+                     "areas_for_improvement", "detailed_feedback"],
+    }
+
+    @classmethod
+    def from_dict(cls, data):
+        data = validate_json(data, EVALUATION_SCHEMA)
+        return cls(
+            overall_score=max(0, min(100, data["overall_score"])),
+            category_scores=_category_scores(data["category_scores"]),
+            strengths=data["strengths"],
+            areas_for_improvement=data["areas_for_improvement"],
+            detailed_feedback=data["detailed_feedback"],
+        )
+
+    def to_dict(self):
+        return asdict(self)
+
+
+@dataclass
+class AnswerScore:
+    category_scores: dict
+    strengths: list = field(default_factory=list)
+    areas_for_improvement: list = field(default_factory=list)
+    feedback: str = ""
+
+    RESPONSE_SCHEMA = {
+        "type": "object",
+        "properties": {
+            "category_scores": CATEGORY_SCORES_SCHEMA,
+            "strengths": STRING_LIST,
+            "areas_for_improvement": STRING_LIST,
+            "feedback": {"type": "string"},
+        },
+        "required": ["category_scores", "feedback"],
+    }
+
+    @classmethod
+    def from_dict(cls, data):
+        data = validate_json(data, ANSWER_SCORE_SCHEMA)
+        return cls(
+            category_scores=_category_scores(data["category_scores"]),
+            strengths=data["strengths"],
+            areas_for_improvement=data["areas_for_improvement"],
+            feedback=data["feedback"],
+        )
+
+    def to_dict(self):
+        return asdict(self)
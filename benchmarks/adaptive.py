@@ -0,0 +1,79 @@
+"""
+Adaptive assessment simulator: questions asked and decision quality.
+
+Simulates candidates with a true ability drawn uniformly from 0-100 whose
+answer totals scatter around their ability (harder questions score a
+little lower). Runs every candidate through the fixed assessment and the
+adaptive policy and prints the average questions asked, the answer
+evaluations saved, and how often each mode lands on the right side of the
+pass/fail scores.
+
+    python -m benchmarks.adaptive --candidates 2000 --noise 12
+"""
+import argparse
+import random
+
+from utils.adaptive import FAIL_SCORE, PASS_SCORE, AssessmentPolicy, question_difficulty
+from utils.evaluation import CATEGORIES
+from utils.resume import QUESTION_MIX
+
+QUESTIONS = {}
+for question_type, count in QUESTION_MIX.items():
+    for _ in range(count):
+        QUESTIONS[f"question{len(QUESTIONS) + 1}"] = {"question": "", "type": question_type, "focus_area": ""}
+
+
+def simulated_score(ability, difficulty, noise, rng):
+    total = max(0.0, min(100.0, rng.gauss(ability - 2 * (difficulty - 5), noise)))
+    return {"category_scores": {category: total / len(CATEGORIES) for category in CATEGORIES}}
+
+
+def verdict(mean):
+    return "pass" if mean >= PASS_SCORE else "fail" if mean <= FAIL_SCORE else "borderline"
+
+
+def assess(policy, ability, noise, rng):
+    answered, scores = {}, {}
+    while True:
+        question_key = policy.next_question(QUESTIONS, answered, scores)
+        answered[question_key] = True
+        scores[question_key] = simulated_score(ability, question_difficulty(question_key, QUESTIONS[question_key]),
+                                               noise, rng)
+        decision = policy.decide(QUESTIONS, answered, scores)
+        if decision != "continue":
+            totals = [sum(result["category_scores"].values()) for result in scores.values()]
+            return len(answered), decision if decision in ("pass", "fail") else verdict(sum(totals) / len(totals))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=2000)
+    parser.add_argument("--noise", type=float, default=12.0, help="Spread of one candidate's answer totals")
+    parser.add_argument("--min-questions", type=int, default=4)
+    parser.add_argument("--confidence", type=float, default=0.9)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    policies = {
+        "fixed": AssessmentPolicy(adaptive=False),
+        "adaptive": AssessmentPolicy(adaptive=True, min_questions=args.min_questions, confidence=args.confidence),
+    }
+    for label, policy in policies.items():
+        rng = random.Random(args.seed)
+        asked = correct = decided = 0
+        for _ in range(args.candidates):
+            ability = rng.uniform(0, 100)
+            questions, result = assess(policy, ability, args.noise, rng)
+            asked += questions
+            truth = verdict(ability)
+            if truth != "borderline":
+                decided += 1
+                correct += result == truth
+        average = asked / args.candidates
+        print(f"{label:<9} {average:5.2f} questions/candidate  "
+              f"{1 - average / len(QUESTIONS):6.1%} evaluations saved  "
+              f"{correct / decided:6.1%} correct on clear passes/fails")
+
+
+if __name__ == "__main__":
+    main()
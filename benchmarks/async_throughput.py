@@ -0,0 +1,66 @@
+"""
+Throughput benchmark for the async Agents API against a local fake model.
+
+Compares blocking calls issued one after another with ``aanalyze_resume``
+fanned out under the ``max_concurrency`` semaphore.
+
+    python -m benchmarks.async_throughput --requests 200 --latency 0.05 --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+
+from Agents.agent import Agents
+from Agents.fake import FakeModel, FakeRegistry
+from Agents.resilience import ResilientCaller
+
+ANALYSIS = json.dumps({
+    "primary_skills": ["Python", "SQL"],
+    "experience_summary": "3 years of backend development",
+    "key_projects": ["Inventory service"],
+    "areas_for_clarification": [],
+    "suggested_question_topics": ["Databases"],
+})
+
+
+async def run_async(agents, requests):
+    results = await asyncio.gather(*(
+        agents.aanalyze_resume(f"Resume {i}") for i in range(requests)
+    ))
+    return sum(1 for result in results if "error" not in result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="Simulated model latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--sequential-sample", type=int, default=20,
+                        help="Number of blocking calls to time for the baseline")
+    args = parser.parse_args()
+
+    model = FakeModel(ANALYSIS, latency=args.latency)
+    # No rate limiter: this measures the concurrency limit on its own
+    agents = Agents(FakeRegistry(model), max_concurrency=args.concurrency, resilience=ResilientCaller())
+
+    start = time.perf_counter()
+    for i in range(args.sequential_sample):
+        agents.model.generate_content(f"Resume {i}")
+    sequential_rate = args.sequential_sample / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    succeeded = asyncio.run(run_async(agents, args.requests))
+    elapsed = time.perf_counter() - start
+
+    print(f"blocking, sequential      {sequential_rate:8.1f} req/s")
+    print(f"async, concurrency {args.concurrency:<6} {args.requests / elapsed:8.1f} req/s "
+          f"({succeeded}/{args.requests} ok in {elapsed:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+End-to-end benchmark: resume -> questions -> answers -> evaluation, offline.
+
+Drives the same flow as the app for ``--candidates`` interviews,
+``--concurrency`` at a time, against the deterministic ``SimulatedModel``
+(configurable latency distribution, error and malformed-JSON rates): the
+resume is analysed, questions are generated in just-in-time batches, each
+answer (a ``--junk-rate`` share of them empty or junk) is scored in the
+background as it is submitted and the scores are combined into the final
+evaluation. Prints throughput, per-stage latency
+percentiles, degraded results and peak memory.
+
+``--save`` writes the results to a JSON file; ``--compare`` checks a run
+against such a baseline and exits non-zero if throughput dropped or a p95
+grew by more than ``--tolerance``.
+
+    python -m benchmarks.e2e --candidates 50 --concurrency 10 --latency lognormal:0.05,0.5
+    python -m benchmarks.e2e --compare baseline.json --tolerance 0.25
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("INTERVIEWMATE_CACHE_DIR", tempfile.mkdtemp())
+
+from Agents.agent import Agents
+from Agents.fake import SKILL_VOCABULARY, FakeRegistry, SimulatedModel
+from Agents.resilience import ResilientCaller, RetryPolicy
+from screen_resumes import percentile
+from utils import resume
+from utils.evaluation import AnswerEvaluationPipeline, aggregate_scores
+
+POSITIONS = ["Backend Developer", "Data Engineer", "Full Stack Developer", "DevOps Engineer"]
+STAGES = ("analysis", "first_question", "question_set", "report", "interview")
+SENTENCES = [
+    "First I would measure where the time actually goes before changing anything.",
+    "A cache in front of the slow path usually removes most of the repeated work.",
+    "Writes can be batched so that each transaction carries many rows at once.",
+    "If one node becomes the bottleneck, sharding by customer spreads the load evenly.",
+    "I add an index for the queries that filter or sort on the same columns.",
+    "Retries need jittered backoff, otherwise every client hammers the service together.",
+    "Load tests with realistic data show whether the fix holds under peak traffic.",
+    "We rolled the change out behind a flag and watched error rates during the deploy.",
+    "Memory stays flat because records are streamed instead of loaded all at once.",
+    "The trade-off is extra complexity, so I document why the design looks this way.",
+]
+
+
+def resume_text(rng):
+    skills = rng.sample(SKILL_VOCABULARY, 5)
+    return "\n".join([
+        "EXPERIENCE",
+        f"Software Engineer, {rng.randint(1, 12)} years. Built services in {skills[0]} and {skills[1]}.",
+        "SKILLS",
+        ", ".join(skills),
+        "PROJECTS",
+        f"Rewrote the order pipeline on {skills[2]}, cutting latency by {rng.randint(20, 80)}%.",
+    ])
+
+
+def answer_text(rng, question, junk_rate):
+    if rng.random() < junk_rate:
+        return rng.choice(["idk", "", question.get("question", ""), "asdf asdf asdf asdf"])
+    sentences = rng.sample(SENTENCES, rng.randint(1, len(SENTENCES)))
+    return f"For {question.get('focus_area', 'this')}: " + " ".join(sentences)
+
+
+def interview(agents, seed, junk_rate=0.0):
+    """Run one candidate through the whole flow; return stage timings and degraded results."""
+    rng = random.Random(seed)
+    position = rng.choice(POSITIONS)
+    timings, degraded = {}, []
+    start = time.perf_counter()
+
+    analysis = resume.analyze_resume(agents, resume_text(rng), on_error=degraded.append)
+    timings["analysis"] = time.perf_counter() - start
+    if resume.is_degraded_analysis(analysis):
+        degraded.append("analysis")
+
+    questions_start = time.perf_counter()
+    pipeline = resume.start_question_pipeline(
+        lambda types, existing: resume.generate_question_batch(
+            agents, analysis, position, types, existing, on_error=degraded.append
+        ),
+        position,
+    )
+    pipeline.wait(1)
+    timings["first_question"] = time.perf_counter() - questions_start
+
+    evaluations = AnswerEvaluationPipeline(agents.evaluate_answer, analysis)
+    answers = {}
+    for i in range(1, pipeline.size + 1):
+        pipeline.wait(i)
+        question_key = f"question{i}"
+        question = pipeline.ready()[question_key]
+        answers[question_key] = dict(question, answer=answer_text(rng, question, junk_rate))
+        evaluations.submit(question_key, answers[question_key])
+    timings["question_set"] = time.perf_counter() - questions_start
+
+    report_start = time.perf_counter()
+    scores = evaluations.results()
+    evaluation = aggregate_scores(scores, answers)
+    timings["report"] = time.perf_counter() - report_start
+    timings["interview"] = time.perf_counter() - start
+    if len(scores) < len(answers):
+        degraded.append(f"{len(answers) - len(scores)} unscored answers")
+    if evaluation is None:
+        degraded.append("evaluation")
+    return timings, degraded
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run(args):
+    model = SimulatedModel(latency=args.latency, error_rate=args.error_rate,
+                           malformed_rate=args.malformed_rate, seed=args.seed)
+    agents = Agents(FakeRegistry(model), resilience=ResilientCaller(retry=RetryPolicy(base_delay=0.05)),
+                    fallback_models=[])
+
+    if args.trace_memory:
+        tracemalloc.start()
+    lock = threading.Lock()
+    stage_timings = {stage: [] for stage in STAGES}
+    degraded = []
+
+    def candidate(seed):
+        timings, problems = interview(agents, seed, args.junk_rate)
+        with lock:
+            for stage, seconds in timings.items():
+                stage_timings[stage].append(seconds)
+            degraded.extend(problems)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(candidate, range(args.seed, args.seed + args.candidates)))
+    elapsed = time.perf_counter() - start
+
+    results = {
+        "candidates": args.candidates,
+        "elapsed": elapsed,
+        "interviews_per_s": args.candidates / elapsed,
+        "calls_per_s": len(model.calls) / elapsed,
+        "calls": len(model.calls),
+        "injected_errors": model.injected_errors,
+        "malformed": model.malformed,
+        "degraded": len(degraded),
+        "stages": {stage: {f"p{pct}": percentile(values, pct) for pct in (50, 95, 99)}
+                   for stage, values in stage_timings.items()},
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    if args.trace_memory:
+        results["peak_heap_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    return results
+
+
+def print_results(results):
+    print(f"{results['candidates']} interviews in {results['elapsed']:.2f}s: "
+          f"{results['interviews_per_s']:.2f} interviews/s, {results['calls_per_s']:.1f} model calls/s "
+          f"({results['calls']} calls, {results['injected_errors']} injected errors, "
+          f"{results['malformed']} malformed responses, {results['degraded']} degraded results)")
+    print(f"{'stage':<16}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for stage, stats in results["stages"].items():
+        print(f"{stage:<16}{stats['p50']:>8.3f}s{stats['p95']:>8.3f}s{stats['p99']:>8.3f}s")
+    memory = f"peak RSS {results['peak_rss_mb']:.0f} MB" if results["peak_rss_mb"] is not None else "peak RSS n/a"
+    if "peak_heap_mb" in results:
+        memory += f", peak Python heap {results['peak_heap_mb']:.1f} MB"
+    print(memory)
+
+
+def regressions(results, baseline, tolerance):
+    """Descriptions of the metrics that got worse than ``baseline`` by more than ``tolerance``."""
+    found = []
+    if results["interviews_per_s"] < baseline["interviews_per_s"] * (1 - tolerance):
+        found.append(f"throughput {results['interviews_per_s']:.2f} < {baseline['interviews_per_s']:.2f} interviews/s")
+    for stage, stats in baseline["stages"].items():
+        current = results["stages"].get(stage, {}).get("p95")
+        if current is not None and current > stats["p95"] * (1 + tolerance):
+            found.append(f"{stage} p95 {current:.3f}s > {stats['p95']:.3f}s")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=10, help="Interviews in progress at once")
+    parser.add_argument("--latency", default="lognormal:0.05,0.5",
+                        help="Model latency: fixed:S, uniform:LOW,HIGH or lognormal:MEDIAN,SIGMA")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Share of calls failing with 429/503")
+    parser.add_argument("--malformed-rate", type=float, default=0.05, help="Share of malformed responses")
+    parser.add_argument("--junk-rate", type=float, default=0.05, help="Share of empty or junk answers")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--trace-memory", action="store_true", help="Also report the peak Python heap (slower)")
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to check the results against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    args = parser.parse_args()
+
+    results = run(args)
+    print_results(results)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            found = regressions(results, json.load(f), args.tolerance)
+        for regression in found:
+            print(f"REGRESSION: {regression}")
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
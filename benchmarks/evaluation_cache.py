@@ -0,0 +1,72 @@
+"""
+Evaluation cache benchmark: duplicate submissions and redisplays.
+
+Scores the answers of ``--candidates`` interviews three ways against the
+simulated model: each answer submitted ``--duplicates`` times at once (a
+double-click, a rerun after a transient error), then the whole set again
+(redisplaying the results), with and without the evaluation cache. Prints
+the model calls made and the time taken.
+
+    python -m benchmarks.evaluation_cache --candidates 20 --duplicates 3
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from Agents.agent import Agents
+from Agents.fake import FakeRegistry, SimulatedModel
+from Agents.resilience import ResilientCaller
+from utils.cache import DiskCache
+from utils.evaluation import EvaluationCache, evaluation_key
+
+ANALYSIS = {"primary_skills": ["Python", "SQL"], "experience_summary": "3 years of backend development"}
+
+
+def submissions(candidates):
+    for candidate in range(candidates):
+        for i in range(1, 11):
+            yield {"question": f"Candidate {candidate} question {i}", "type": "skill", "focus_area": "Python",
+                   "answer": f"Answer {i} from candidate {candidate}: " + "with details " * i}
+
+
+def run(agents, evaluation_cache, answers, duplicates):
+    def score(answer):
+        compute = lambda: agents.evaluate_answer(ANALYSIS, answer)
+        if evaluation_cache is None:
+            return compute()
+        return evaluation_cache.get_or_compute(evaluation_key("answer", ANALYSIS, answer), compute)
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        start = time.perf_counter()
+        list(pool.map(score, [answer for answer in answers for _ in range(duplicates)]))
+        submitted = time.perf_counter() - start
+        start = time.perf_counter()
+        list(pool.map(score, answers))
+        redisplayed = time.perf_counter() - start
+    return submitted, redisplayed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=20)
+    parser.add_argument("--duplicates", type=int, default=3, help="Identical submissions of each answer")
+    parser.add_argument("--latency", default="lognormal:0.1,0.3", help="Simulated model latency")
+    args = parser.parse_args()
+
+    answers = list(submissions(args.candidates))
+    with tempfile.TemporaryDirectory() as directory:
+        for label, evaluation_cache in [
+            ("no cache", None),
+            ("evaluation cache", EvaluationCache(DiskCache("evaluation", path=os.path.join(directory, "cache.sqlite3")))),
+        ]:
+            model = SimulatedModel(latency=args.latency)
+            agents = Agents(FakeRegistry(model), resilience=ResilientCaller(), fallback_models=[])
+            submitted, redisplayed = run(agents, evaluation_cache, answers, args.duplicates)
+            print(f"{label:<17} {len(model.calls):>5} model calls for {len(answers) * (args.duplicates + 1)} "
+                  f"requests; submit {submitted:.2f}s, redisplay {redisplayed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Tail-latency benchmark for hedged requests.
+
+The primary fake model answers in ``--latency`` seconds but a share of its
+calls (``--slow-rate``) take ``--slow-latency`` seconds longer; the hedge model
+has no slow tail. Runs the same workload with hedging off and on and prints
+p50/p95/p99 latency plus how often a hedge was sent and won.
+
+    python -m benchmarks.hedging --requests 100 --slow-rate 0.05 --slow-latency 1.5
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+
+from Agents.agent import Agents
+from Agents.fake import FakeModel, FakeRegistry, FaultInjectingModel
+from Agents.resilience import ResilientCaller
+from Agents.routing import HedgePolicy
+from screen_resumes import percentile
+
+PRIMARY = "models/fake-pro"
+HEDGE = "models/fake-flash"
+ANALYSIS = json.dumps({"primary_skills": ["Python"], "experience_summary": "", "key_projects": []})
+
+
+def run(agents, requests, workers):
+    def one(i):
+        start = time.perf_counter()
+        agents.generate_content(f"Resume {i}", task="resume_analysis")
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(one, range(requests)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.2, help="Typical primary latency in seconds")
+    parser.add_argument("--slow-rate", type=float, default=0.05, help="Share of slow primary calls")
+    parser.add_argument("--slow-latency", type=float, default=1.5, help="Extra latency of a slow call")
+    parser.add_argument("--hedge-latency", type=float, default=0.25, help="Hedge model latency in seconds")
+    parser.add_argument("--percentile", type=float, default=90)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for hedging in (False, True):
+        primary = FaultInjectingModel(FakeModel(ANALYSIS, latency=args.latency), slow_rate=args.slow_rate,
+                                      slow_latency=args.slow_latency, seed=args.seed)
+        hedge = FakeModel(ANALYSIS, latency=args.hedge_latency)
+        registry = FakeRegistry(primary, PRIMARY, models={PRIMARY: primary, HEDGE: hedge})
+        agents = Agents(
+            registry, streaming=False, resilience=ResilientCaller(), fallback_models=[],
+            hedging=HedgePolicy(enabled=hedging, hedge_model=HEDGE, percentile=args.percentile,
+                                min_samples=20, default_delay=args.latency * 2),
+        )
+        latencies = run(agents, args.requests, args.workers)
+        stats = agents.latency.snapshot()
+        print(f"hedging {'on ' if hedging else 'off'}  p50 {percentile(latencies, 50):.3f}s  "
+              f"p95 {percentile(latencies, 95):.3f}s  p99 {percentile(latencies, 99):.3f}s  "
+              f"hedged {stats.get('hedged', 0)}  hedge wins {stats.get('hedge_wins', 0)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Cold-start benchmark: import time of the entry points and first paint of the app.
+
+Each measurement runs in a fresh interpreter. Import times come from
+``python -X importtime``; first paint is the time from interpreter start
+until the app's first script run has rendered (headless, through
+Streamlit's ``AppTest``, with a fake model so no API key is needed). Also
+reports whether the model SDK and document parsers were loaded, which they
+shouldn't be until a resume is uploaded.
+
+    python -m benchmarks.importtime --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["google.generativeai", "google.api_core.exceptions", "PyPDF2", "docx"]
+ENTRY_POINTS = {
+    "Agents.agent": "import Agents.agent",
+    "utils.resume": "import utils.resume",
+    "screen_resumes": "import screen_resumes",
+    "worker": "import worker",
+}
+
+LOADED = f"import json, sys; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+
+FIRST_PAINT = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+from Agents import agent as agent_module
+from Agents.agent import Agents
+from Agents.fake import FakeModel, FakeRegistry
+agent_module._shared_agents = Agents(FakeRegistry(FakeModel()))
+at = AppTest.from_file({script!r}, default_timeout=60)
+at.run()
+assert not at.exception, at.exception
+import json
+print(json.dumps({{"seconds": time.perf_counter() - start, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def run_python(args, env):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def import_time(statement, env):
+    """Cumulative import time in seconds of the top-level imports in ``statement``."""
+    result = run_python(["-X", "importtime", "-c", f"{statement}; {LOADED}"], env)
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nested imports are indented under the module that pulled them in
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return total / 1e6, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--script", default="app.py")
+    args = parser.parse_args()
+
+    env = dict(os.environ, GOOGLE_API_KEY=os.getenv("GOOGLE_API_KEY", "benchmark-key"),
+               INTERVIEWMATE_CACHE_DIR=tempfile.mkdtemp())
+    for label, statement in ENTRY_POINTS.items():
+        samples = [import_time(statement, env) for _ in range(args.repeat)]
+        loaded = samples[-1][1]
+        print(f"import {label:<16} {statistics.median(s for s, _ in samples) * 1000:8.1f} ms  "
+              f"heavy modules loaded: {', '.join(loaded) or 'none'}")
+
+    code = "import sys\n" + FIRST_PAINT.format(script=args.script, heavy=HEAVY_MODULES)
+    samples = [json.loads(run_python(["-c", code], env).stdout.strip().splitlines()[-1]) for _ in range(args.repeat)]
+    print(f"first paint {args.script:<11} {statistics.median(s['seconds'] for s in samples) * 1000:8.1f} ms  "
+          f"heavy modules loaded: {', '.join(samples[-1]['loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
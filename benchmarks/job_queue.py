@@ -0,0 +1,96 @@
+"""
+Job queue load benchmark: front-end load against a pool of worker processes.
+
+Simulates ``--clients`` concurrent UI sessions, each running interviews
+(resume analysis, question generation, ten answer scores) through the
+SQLite job queue, served by 1, 2 and 4 worker processes backed by a fake
+model with ``--latency`` seconds per call. Prints throughput and the
+submit-to-result latency seen by the front end.
+
+    python -m benchmarks.job_queue --interviews 40 --clients 8 --threads 2
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+os.environ.setdefault("INTERVIEWMATE_CACHE_DIR", tempfile.mkdtemp())
+os.environ["INTERVIEWMATE_QUESTION_BANK"] = "0"
+
+import worker
+from Agents.agent import Agents
+from Agents.fake import FakeModel, FakeRegistry
+from Agents.resilience import ResilientCaller
+from screen_resumes import percentile
+from utils.job_queue import JobQueue
+
+
+def fake_worker(queue_path, threads, stop, latency):
+    """Worker process whose model answers every schema after ``latency`` seconds."""
+    agents = Agents(FakeRegistry(FakeModel(latency=latency)), streaming=False, resilience=ResilientCaller())
+    worker.run_worker(queue_path, threads, stop, agents=agents)
+
+
+def interview(queue, n, latencies):
+    def timed_run(kind, payload):
+        start = time.perf_counter()
+        result = queue.run(kind, payload, on_error=lambda message: None)
+        latencies.append(time.perf_counter() - start)
+        return result
+
+    analysis = timed_run("resume_analysis", {"resume_text": f"Candidate {n}: five years of Python and Django."})
+    questions = timed_run("technical_questions", {"resume_analysis": analysis, "position": "Backend Developer"})
+    with ThreadPoolExecutor(max_workers=len(questions)) as pool:
+        list(pool.map(
+            lambda item: timed_run("evaluate_answer", {
+                "resume_analysis": analysis,
+                "answer": {"question": item[1]["question"], "answer": f"Candidate {n} answer to {item[0]}"},
+            }),
+            questions.items(),
+        ))
+
+
+def run(processes, args, tmp):
+    queue_path = os.path.join(tmp, f"jobs-{processes}.sqlite3")
+    queue = JobQueue(queue_path)
+    stop = multiprocessing.Event()
+    pool = [
+        multiprocessing.Process(target=fake_worker, args=(queue_path, args.threads, stop, args.latency))
+        for _ in range(processes)
+    ]
+    for process in pool:
+        process.start()
+
+    latencies = []
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as clients:
+        list(clients.map(lambda n: interview(queue, n, latencies), range(args.interviews)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    for process in pool:
+        process.join()
+    return latencies, elapsed, queue.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--interviews", type=int, default=40)
+    parser.add_argument("--clients", type=int, default=8, help="Concurrent front-end sessions")
+    parser.add_argument("--threads", type=int, default=2, help="Concurrent jobs per worker process")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated model latency in seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for processes in (1, 2, 4):
+            latencies, elapsed, stats = run(processes, args, tmp)
+            print(f"{processes} worker process(es): {len(latencies) / elapsed:6.1f} jobs/s  "
+                  f"p50 {percentile(latencies, 50):.3f}s  p95 {percentile(latencies, 95):.3f}s  "
+                  f"done {stats['done']} failed {stats['failed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Corpus check and benchmark for the shared JSON response parser.
+
+Runs a corpus of messy model outputs through the legacy fence-stripping
+parser and ``utils.json_parser``, verifies every case parses to the
+expected object and times both.
+
+    python -m benchmarks.json_parsing --repeat 2000
+"""
+import argparse
+import json
+import sys
+import time
+
+from utils.json_parser import EVALUATION_SCHEMA, JSONResponseError, parse_json_response
+
+EVALUATION = {
+    "overall_score": 72,
+    "category_scores": {"technical_accuracy": 15, "knowledge_depth": 14, "problem_solving": 15,
+                        "communication": 16, "experience_relevance": 12},
+    "strengths": ["Clear explanation of indexing", "Good use of examples"],
+    "areas_for_improvement": ["System design depth"],
+    "detailed_feedback": "Solid fundamentals; needs more depth on scaling {reads} and [writes].",
+}
+PRETTY = json.dumps(EVALUATION, indent=2)
+
+# (name, response text, expected object or None when it must be rejected)
+CORPUS = [
+    ("plain", json.dumps(EVALUATION), EVALUATION),
+    ("pretty", PRETTY, EVALUATION),
+    ("json fence", f"```json\n{PRETTY}\n```", EVALUATION),
+    ("bare fence", f"```\n{PRETTY}\n```", EVALUATION),
+    ("prose before", f"Here is the evaluation you asked for:\n{PRETTY}", EVALUATION),
+    ("prose around fence", f"Sure! {{as requested}}\n```json\n{PRETTY}\n```\nLet me know if you need more.", EVALUATION),
+    ("prose after", f"{PRETTY}\n\nNote: scores are out of 20 {{per category}}.", EVALUATION),
+    ("trailing commas", PRETTY.replace('"System design depth"', '"System design depth",')
+        .replace('"experience_relevance": 12', '"experience_relevance": 12,'), EVALUATION),
+    ("raw newline in string", PRETTY.replace("needs more depth", "needs\nmore depth"),
+        dict(EVALUATION, detailed_feedback=EVALUATION["detailed_feedback"].replace("needs more", "needs\nmore"))),
+    ("truncated", PRETTY[:PRETTY.index('"detailed_feedback"') + 40],
+        dict(EVALUATION, detailed_feedback="Solid fundamentals")),
+    ("string score", PRETTY.replace('"overall_score": 72', '"overall_score": "72/100"'), EVALUATION),
+    ("string list", PRETTY.replace('[\n    "System design depth"\n  ]', '"System design depth"'), EVALUATION),
+    ("missing optional", json.dumps({k: v for k, v in EVALUATION.items() if k != "strengths"}),
+        dict(EVALUATION, strengths=[])),
+    ("missing required", json.dumps({k: v for k, v in EVALUATION.items() if k != "overall_score"}), None),
+    ("no json", "I'm sorry, I can't evaluate these answers.", None),
+]
+
+
+def legacy_parse(response_text):
+    """The fence-stripping logic previously copy-pasted across the code base."""
+    response_text = response_text.strip()
+    if response_text.startswith("```") and "```" in response_text:
+        start_idx = response_text.find("{")
+        end_idx = response_text.rfind("}") + 1
+        response_text = response_text[start_idx:end_idx]
+    result = json.loads(response_text)
+    if not all(key in result for key in EVALUATION_SCHEMA):
+        raise ValueError("Missing required fields")
+    return result
+
+
+def new_parse(response_text):
+    return parse_json_response(response_text, EVALUATION_SCHEMA)
+
+
+def run(parse, text):
+    try:
+        return parse(text)
+    except (ValueError, JSONResponseError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    failures = 0
+    legacy_ok = new_ok = 0
+    print(f"{'case':<24} {'legacy':>8} {'shared':>8}")
+    for name, text, expected in CORPUS:
+        legacy = run(legacy_parse, text)
+        new = run(new_parse, text)
+        legacy_ok += legacy is not None and legacy == expected
+        new_ok += new is not None and new == expected
+        if new != expected:
+            failures += 1
+        print(f"{name:<24} {'ok' if legacy is not None and legacy == expected else '-':>8} "
+              f"{'ok' if new == expected else 'MISMATCH':>8}")
+
+    parseable = sum(1 for _, _, expected in CORPUS if expected is not None)
+    print(f"\nRecovered: legacy {legacy_ok}/{parseable}, shared {new_ok}/{parseable}")
+
+    for label, parse in (("legacy", legacy_parse), ("shared", new_parse)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, text, _ in CORPUS:
+                run(parse, text)
+        per_call = (time.perf_counter() - start) / (args.repeat * len(CORPUS)) * 1e6
+        print(f"{label:<8} {per_call:8.1f} us per response")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
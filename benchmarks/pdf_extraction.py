@@ -0,0 +1,103 @@
+"""
+PDF text extraction benchmark on synthetic multi-page documents.
+
+Compares the old ``text += page.extract_text()`` loop over every page with
+the budgeted serial and process-pool extractors in ``utils.pdf``.
+
+    python -m benchmarks.pdf_extraction --pages 10 50 300
+"""
+import argparse
+import io
+import time
+
+import PyPDF2
+
+from utils.pdf import DEFAULT_MAX_CHARS, DEFAULT_MAX_PAGES, extract_pdf_text
+
+
+def make_pdf(pages, lines_per_page=45):
+    """Build a PDF with ``pages`` pages of Helvetica text, no extra dependencies."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Pages object, filled in once the kids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for page in range(pages):
+        lines = [
+            f"Page {page + 1} line {line}: Built Python services with Django, PostgreSQL and Redis."
+            for line in range(lines_per_page)
+        ]
+        stream = "BT /F1 9 Tf 12 TL 40 800 Td " + " ".join(f"({text}) '" for text in lines) + " ET"
+        stream = stream.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % kid for kid in kids), pages
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n%s\nendobj\n" % (number, body))
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for offset in offsets:
+        out.write(b"%010d 00000 n \n" % offset)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def legacy_extract(pdf_bytes):
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+    text = ""
+    for page in pdf_reader.pages:
+        text += page.extract_text() + "\n"
+    return text
+
+
+def timed(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[5, 30, 300])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    # Warm the process pool so its start-up cost isn't charged to the first run
+    extract_pdf_text(make_pdf(4), parallel=True, workers=args.workers)
+
+    print(f"Budgets: {DEFAULT_MAX_PAGES} pages, {DEFAULT_MAX_CHARS} chars")
+    print(f"{'pages':>6} {'legacy':>10} {'serial':>10} {'parallel':>10} {'parallel, no budget':>20}  chars (legacy -> budgeted)")
+    for pages in args.pages:
+        pdf_bytes = make_pdf(pages)
+        legacy, legacy_text = timed(lambda: legacy_extract(pdf_bytes), args.repeat)
+        serial, text = timed(lambda: extract_pdf_text(pdf_bytes, parallel=False), args.repeat)
+        parallel, _ = timed(lambda: extract_pdf_text(pdf_bytes, parallel=True, workers=args.workers), args.repeat)
+        unbounded, _ = timed(
+            lambda: extract_pdf_text(pdf_bytes, max_pages=None, max_chars=None,
+                                     parallel=True, workers=args.workers),
+            args.repeat,
+        )
+        print(f"{pages:>6} {legacy * 1000:>8.1f}ms {serial * 1000:>8.1f}ms {parallel * 1000:>8.1f}ms "
+              f"{unbounded * 1000:>18.1f}ms  {len(legacy_text)} -> {len(text)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Corpus check and benchmark for the answer pre-screen.
+
+Runs a labelled corpus of junk and real answers through
+``utils.prescreen``, verifies no real answer is screened out and every
+junk answer gets the expected verdict, then times screening a batch of
+answers in one vectorised pass against one call per answer and estimates
+the prompt tokens the screened answers would have cost.
+
+    python -m benchmarks.prescreen --batch 1000
+"""
+import argparse
+import random
+import sys
+import time
+
+from utils.common import answer_evaluation_prompt
+from utils.prescreen import COPY, GIBBERISH, NO_ANSWER, screen_answers
+from utils.prompt_budget import estimate_tokens
+
+QUESTION = {"question": "How would you find duplicate values in a large array?", "type": "problem",
+            "focus_area": "algorithms"}
+
+# (name, answer, expected verdict or None for a real answer that must reach the model)
+CORPUS = [
+    ("empty", "", NO_ANSWER),
+    ("whitespace", "   \n ", NO_ANSWER),
+    ("one word", "hashing", None),
+    ("two words", "Dijkstra algorithm", None),
+    ("idk", "idk", NO_ANSWER),
+    ("don't know", "I don't know.", NO_ANSWER),
+    ("not sure", "Not sure", NO_ANSWER),
+    ("copied question", "How would you find duplicate values in a large array?", COPY),
+    ("copied fragment", "find duplicate values in a large array", COPY),
+    ("keyboard mash", "asdkjh sdfkjhsdf qwrtplk zxcvbnm", GIBBERISH),
+    ("repeated letters", "aaaa aaaa aaaa aaaa", GIBBERISH),
+    ("repeated word", "blah blah blah blah blah blah blah blah blah", GIBBERISH),
+    ("terse", "Use a hash map", None),
+    ("terse set", "Put values in a set", None),
+    ("acronyms", "Sort then scan, O(n log n); or a HashSet for O(n) with more RAM", None),
+    ("code", "seen = set(); dups = [x for x in arr if x in seen or seen.add(x)]", None),
+    ("restates then answers", "To find duplicate values in a large array I would sort it and compare neighbours", None),
+    ("prose", "I would stream the array once and keep a set of seen values; anything already in the set is "
+              "a duplicate. If it doesn't fit in memory, I'd hash-partition it to disk first.", None),
+    ("code one-liner", "h[k] = h.get(k, []) + [v]", None),
+    ("Chinese", "用哈希集合记录已经见过的值，再次出现的就是重复值。", None),
+    ("Russian", "Храню увиденные значения в хеш-таблице; если значение уже там, это дубликат.", None),
+    ("non-English", "Utilizaría un conjunto para guardar los valores vistos y detectar los repetidos", None),
+]
+
+
+def check():
+    answers = {name: dict(QUESTION, answer=answer) for name, answer, _ in CORPUS}
+    verdicts = screen_answers(answers)
+    failures = 0
+    for name, _, expected in CORPUS:
+        actual = verdicts.get(name)
+        ok = actual == expected
+        failures += not ok
+        print(f"  {'ok  ' if ok else 'FAIL'} {name:<22} {actual or 'to model':<10}"
+              + ("" if ok else f" (expected {expected or 'to model'})"))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--batch", type=int, default=1000, help="Answers per timed batch")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print("corpus:")
+    failures = check()
+
+    rng = random.Random(args.seed)
+    batch = {f"question{i}": dict(QUESTION, answer=rng.choice(CORPUS)[1]) for i in range(args.batch)}
+    start = time.perf_counter()
+    verdicts = screen_answers(batch)
+    vectorised = time.perf_counter() - start
+    start = time.perf_counter()
+    for question_key, answer in batch.items():
+        screen_answers({question_key: answer})
+    one_by_one = time.perf_counter() - start
+
+    saved = sum(estimate_tokens(answer_evaluation_prompt("{}", batch[key])) for key in verdicts)
+    print(f"{args.batch} answers: {vectorised * 1e3:.1f}ms in one pass, {one_by_one * 1e3:.1f}ms one by one; "
+          f"{len(verdicts)} screened out, ~{saved} prompt tokens not sent")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Question bank benchmark: model calls and generated questions per candidate.
+
+Screens a stream of synthetic candidates (a handful of positions with
+overlapping skills) against a fake model, once generating every set from
+scratch and once with a fresh question bank, and prints how many questions
+the model had to write and how long assembly took.
+
+    python -m benchmarks.question_bank --candidates 100
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import re
+import tempfile
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+
+from Agents.agent import Agents
+from Agents.fake import FakeModel, FakeRegistry
+from Agents.resilience import ResilientCaller
+from utils import resume
+from utils.question_bank import QuestionBank
+
+SKILLS = {
+    "Backend Developer": ["Python", "Django", "PostgreSQL", "Redis", "REST", "Docker", "Celery"],
+    "Frontend Developer": ["JavaScript", "React", "TypeScript", "CSS", "Redux", "Webpack"],
+    "DevOps Engineer": ["Kubernetes", "Terraform", "AWS", "Docker", "Prometheus", "Linux"],
+    "Data Scientist": ["Python", "Pandas", "SQL", "Statistics", "Scikit-learn", "Tableau"],
+}
+
+
+class QuestionWriter:
+    """Fake model response: writes the number and types of questions the prompt asks for."""
+    def __init__(self):
+        self.counter = itertools.count(1)
+        self.written = 0
+
+    def __call__(self, prompt):
+        requested = re.findall(r"\*\*(\d+) (project|skill|design|problem) questions?\*\*", prompt)
+        if requested:
+            types = [kind for count, kind in requested for _ in range(int(count))]
+        else:
+            types = ["project"] * 2 + ["skill"] * 3 + ["design"] * 2 + ["problem"] * 3
+        skills = re.search(r"\*\*Skills:\*\* (.*)", prompt).group(1).split(", ")
+        questions = {}
+        for i, kind in enumerate(types, start=1):
+            focus = random.choice(skills)
+            questions[f"question{i}"] = {
+                "question": f"Question {next(self.counter)}: walk through a {kind} scenario involving {focus}.",
+                "type": kind,
+                "focus_area": focus,
+            }
+        self.written += len(types)
+        return json.dumps(questions)
+
+
+def candidates(count, seed):
+    rng = random.Random(seed)
+    for _ in range(count):
+        position = rng.choice(list(SKILLS))
+        yield position, {
+            "primary_skills": rng.sample(SKILLS[position], 4),
+            "key_projects": ["Internal tool"],
+            "experience_summary": "Several years in industry",
+        }
+
+
+def run(count, bank, seed):
+    writer = QuestionWriter()
+    model = FakeModel(writer)
+    agents = Agents(FakeRegistry(model), streaming=False, structured=False, resilience=ResilientCaller())
+    start = time.perf_counter()
+    for position, analysis in candidates(count, seed):
+        resume.generate_technical_questions(agents, analysis, position, on_error=print, bank=bank)
+    return len(model.calls), writer.written, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bank = QuestionBank(os.path.join(tmp, "bank.sqlite3"))
+        for label, question_bank in (("no bank", None), ("question bank", bank)):
+            calls, written, elapsed = run(args.candidates, question_bank, args.seed)
+            print(f"{label:<14} {calls:4d} model calls, {written / args.candidates:5.1f} questions "
+                  f"generated per candidate, {elapsed * 1000 / args.candidates:6.2f} ms/candidate")
+        stats = bank.stats()
+        print(f"bank: {stats['questions']} questions, {stats['reused_questions']} reused {stats['reuses']} times")
+
+
+if __name__ == "__main__":
+    main()
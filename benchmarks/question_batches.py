@@ -0,0 +1,77 @@
+"""
+Time-to-first-question benchmark: one full set vs just-in-time batches.
+
+The fake model takes ``--base-latency`` seconds per call plus
+``--per-question`` seconds per question it writes, like a model whose
+response time grows with output length. Compares how long a candidate
+waits before question 1 can be shown, and when the whole set is ready.
+
+    python -m benchmarks.question_batches --trials 5 --per-question 0.3
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+
+from Agents.agent import Agents
+from Agents.fake import FakeModel, FakeRegistry
+from Agents.resilience import ResilientCaller
+from benchmarks.question_bank import QuestionWriter
+from utils import resume
+from utils.question_pipeline import split_batches
+
+ANALYSIS = {"primary_skills": ["Python", "Django", "PostgreSQL"], "key_projects": ["Shop"],
+            "experience_summary": "Five years of backend development"}
+POSITION = "Backend Developer"
+
+
+class TimedWriter(QuestionWriter):
+    """Writes the requested questions, taking longer for longer responses."""
+    def __init__(self, base_latency, per_question):
+        super().__init__()
+        self.base_latency = base_latency
+        self.per_question = per_question
+
+    def __call__(self, prompt):
+        text = super().__call__(prompt)
+        time.sleep(self.base_latency + self.per_question * len(json.loads(text)))
+        return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trials", type=int, default=5)
+    parser.add_argument("--base-latency", type=float, default=0.5, help="Seconds per model call")
+    parser.add_argument("--per-question", type=float, default=0.3, help="Extra seconds per generated question")
+    args = parser.parse_args()
+
+    model = FakeModel(TimedWriter(args.base_latency, args.per_question))
+    agents = Agents(FakeRegistry(model), streaming=False, structured=False, resilience=ResilientCaller())
+
+    full, first_batch, whole_set = [], [], []
+    for _ in range(args.trials):
+        start = time.perf_counter()
+        resume.generate_technical_questions(agents, ANALYSIS, POSITION)
+        full.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        pipeline = resume.start_question_pipeline(
+            lambda types, existing: resume.generate_question_batch(agents, ANALYSIS, POSITION, types, existing),
+            POSITION,
+        )
+        pipeline.wait(1)
+        first_batch.append(time.perf_counter() - start)
+        pipeline.result()
+        whole_set.append(time.perf_counter() - start)
+
+    print(f"full set         first question after {statistics.median(full):.2f}s")
+    sizes = "/".join(str(len(batch)) for batch in split_batches(resume.question_slots()))
+    print(f"batches {sizes:<8} first question after {statistics.median(first_batch):.2f}s, "
+          f"whole set after {statistics.median(whole_set):.2f}s (in the background)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Rerun profiler for the Streamlit app's top-level code.
+
+Every widget interaction reruns ``app.py`` from the top, so whatever the
+module body does is paid on each click. Runs the app headless (Streamlit's
+``AppTest``) against a fake model, times reruns on each page and subtracts
+the cost of rerunning an empty script, which leaves the time spent in the
+app's own top-level code. Exits non-zero if a page is over ``--budget-ms``.
+
+    python -m benchmarks.reruns --reruns 30 --budget-ms 50
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+os.environ.setdefault("INTERVIEWMATE_CACHE_DIR", tempfile.mkdtemp())
+
+from streamlit.testing.v1 import AppTest
+
+from Agents import agent as agent_module
+from Agents.agent import Agents
+from Agents.fake import FakeModel, FakeRegistry
+from Agents.resilience import ResilientCaller
+from screen_resumes import percentile
+
+ANALYSIS = {"primary_skills": ["Python", "Django"], "experience_summary": "5 years",
+            "key_projects": ["Shop"], "suggested_question_topics": ["APIs"]}
+QUESTIONS = {f"question{i}": {"question": f"Question {i}?", "type": "skill", "focus_area": "python"}
+             for i in range(1, 11)}
+
+
+class ChatCountingModel(FakeModel):
+    """Fake model that counts (and optionally slows down) ``start_chat``."""
+    def __init__(self, chat_latency):
+        super().__init__(json.dumps(QUESTIONS))
+        self.chat_latency = chat_latency
+        self.chats = 0
+
+    def start_chat(self, history=None):
+        self.chats += 1
+        time.sleep(self.chat_latency)
+        return super().start_chat(history)
+
+
+def time_reruns(at, reruns):
+    at.run()  # Warm-up: the first run pays for imports and session setup
+    samples = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        at.run()
+        samples.append(time.perf_counter() - start)
+        assert not at.exception, at.exception
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--script", default="app.py")
+    parser.add_argument("--reruns", type=int, default=30)
+    parser.add_argument("--chat-latency", type=float, default=0.05,
+                        help="Simulated start_chat() cost in seconds")
+    parser.add_argument("--budget-ms", type=float, default=50.0,
+                        help="Allowed top-level cost per rerun in milliseconds")
+    args = parser.parse_args()
+
+    model = ChatCountingModel(args.chat_latency)
+    agent_module._shared_agents = Agents(FakeRegistry(model), streaming=False, resilience=ResilientCaller())
+
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as empty:
+        empty.write("import streamlit as st\n")
+    baseline = percentile(time_reruns(AppTest.from_file(empty.name, default_timeout=30), args.reruns), 50)
+    os.remove(empty.name)
+    print(f"{'empty script':<16} p50 {baseline * 1000:7.2f} ms (framework overhead, subtracted below)")
+
+    pages = {
+        "upload": {},
+        "position": {"resume_analysis": ANALYSIS},
+        "assessment": {"resume_analysis": ANALYSIS, "position_selected": True, "technical_questions": QUESTIONS},
+    }
+    over_budget = False
+    for page, state in pages.items():
+        at = AppTest.from_file(args.script, default_timeout=30)
+        for key, value in state.items():
+            at.session_state[key] = value
+        chats = model.chats
+        samples = [sample - baseline for sample in time_reruns(at, args.reruns)]
+        p50, p95 = percentile(samples, 50) * 1000, percentile(samples, 95) * 1000
+        over_budget |= p50 > args.budget_ms
+        print(f"{page:<16} p50 {p50:7.2f} ms  p95 {p95:7.2f} ms  "
+              f"start_chat calls {model.chats - chats}  {'OVER BUDGET' if p50 > args.budget_ms else 'ok'}")
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
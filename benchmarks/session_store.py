@@ -0,0 +1,90 @@
+"""
+Session store benchmark: checkpoint cost on the interactive path.
+
+Simulates concurrent interviews checkpointing after every answer and
+compares writing each snapshot synchronously with the write-behind
+``SessionStore``, for both backends. Prints the per-checkpoint latency seen
+by the page and how many backend batches were written.
+
+    python -m benchmarks.session_store --sessions 50 --answers 10
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from screen_resumes import percentile
+from utils.session_store import (
+    FileSessionBackend, SQLiteSessionBackend, SessionStore, encode_state, new_token,
+)
+
+
+def interview_states(answers):
+    """The session state after each answer of one interview."""
+    state = {
+        "resume_analysis": {"primary_skills": ["Python", "Django", "PostgreSQL"], "key_projects": ["Shop"],
+                            "experience_summary": "Five years of backend development " * 5},
+        "position_selected": True,
+        "technical_questions": {f"question{i}": {"question": f"Question {i}: " + "explain a design " * 10,
+                                                 "type": "skill", "focus_area": "python"} for i in range(1, 11)},
+        "current_question_index": 0,
+        "answers": {},
+        "answer_scores": {},
+    }
+    for i in range(1, answers + 1):
+        state["answers"][f"question{i}"] = {"question": f"Question {i}", "answer": "A detailed answer " * 30}
+        state["answer_scores"][f"question{i}"] = {"score": 14, "feedback": "Good depth, could be more specific."}
+        state["current_question_index"] = i
+        yield state
+
+
+def checkpoints(sessions, answers):
+    tokens = [new_token() for _ in range(sessions)]
+    for states in zip(*(interview_states(answers) for _ in tokens)):
+        yield from zip(tokens, states)
+
+
+def run_sync(backend, sessions, answers):
+    latencies = []
+    for token, state in checkpoints(sessions, answers):
+        start = time.perf_counter()
+        backend.write_many([(token, encode_state(json.dumps(state, separators=(",", ":"))))])
+        latencies.append(time.perf_counter() - start)
+    return latencies, len(latencies)
+
+
+def run_write_behind(backend, sessions, answers, flush_interval):
+    store = SessionStore(backend, flush_interval=flush_interval)
+    latencies = []
+    for token, state in checkpoints(sessions, answers):
+        start = time.perf_counter()
+        store.save(token, state)
+        latencies.append(time.perf_counter() - start)
+    store.flush()
+    return latencies, store.batches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--answers", type=int, default=10)
+    parser.add_argument("--flush-interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {
+            "sqlite": lambda name: SQLiteSessionBackend(os.path.join(tmp, f"{name}.sqlite3")),
+            "file": lambda name: FileSessionBackend(os.path.join(tmp, name)),
+        }
+        for backend_name, make_backend in backends.items():
+            for mode, run in (("sync", run_sync), ("write-behind", run_write_behind)):
+                extra = (args.flush_interval,) if mode == "write-behind" else ()
+                latencies, batches = run(make_backend(f"{backend_name}-{mode}"), args.sessions, args.answers, *extra)
+                print(f"{backend_name:<6} {mode:<12} p50 {percentile(latencies, 50) * 1000:7.3f} ms  "
+                      f"p95 {percentile(latencies, 95) * 1000:7.3f} ms  "
+                      f"{len(latencies)} checkpoints in {batches} backend writes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,247 @@
+"""
+Local skill extraction benchmark: the skill index against model analyses.
+
+Analyses a sample corpus of resumes (backend, frontend, data, ML, DevOps,
+mobile, enterprise Java, a career changer without headings, ...) with
+``utils.skills.local_resume_analysis`` and compares its primary skills
+with a reference analysis of each resume: precision, recall, the
+confidence and whether ``analyze_resume`` would still ask the model. Then
+checks that everyday English phrases ("Go getter", "passionate about
+unity") find no skills, exits non-zero if one does, and times the index
+build and the local analysis.
+
+By default the references are hand-labelled analyses in the shape the
+model returns. With ``--live`` each resume is also sent to Gemini (needs
+``GOOGLE_API_KEY``), its analysis becomes the reference and the model's
+latency is reported next to the local one.
+
+    python -m benchmarks.skill_extraction --repeat 200
+    python -m benchmarks.skill_extraction --live
+"""
+import argparse
+import sys
+import time
+
+from screen_resumes import percentile
+from utils.skills import MIN_CONFIDENCE, SKILL_TAXONOMY, SkillIndex, get_skill_index, local_resume_analysis
+
+# (name, resume text, reference primary skills)
+CORPUS = [
+    ("backend python", """Priya Natarajan
+Summary
+Backend engineer with 6+ years building payment APIs.
+Experience
+Senior Backend Engineer, Acme Payments (2020 - Present)
+- Designed event-driven settlement services on Kafka and PostgreSQL
+- Led the migration from a Django monolith to microservices on Kubernetes
+Software Engineer at Shoply (2017 - 2020)
+- Built REST APIs with Flask, Celery and Redis
+Projects
+LedgerDB - an append-only ledger in Go with gRPC and RocksDB
+Resume Screener (Python, FastAPI, Docker)
+Technical Skills
+Python, Go, SQL, PostgreSQL, Redis, Kafka, Docker, Kubernetes, AWS""",
+     ["Python", "Go", "PostgreSQL", "Kafka", "Django", "Flask", "Redis", "Kubernetes", "Docker", "AWS"]),
+    ("frontend react", """Tom Becker - Frontend Developer
+Profile
+Frontend developer focused on accessible, fast web apps. 4 years of experience.
+Work Experience
+Frontend Developer | Brightly (Jan 2021 - Present)
+- Rebuilt the checkout in React and TypeScript with Redux Toolkit
+- Cut bundle size 40% by moving from Webpack to Vite
+Junior Web Developer | Agency 7 (2019 - 2021)
+- Built marketing sites with Next.js, Tailwind CSS and a GraphQL CMS
+Personal Projects
+Habit Tracker: React Native app with Firebase sync
+Skills
+JavaScript, TypeScript, React, Next.js, Redux, HTML, CSS, Tailwind, Jest, Cypress, Figma""",
+     ["React", "TypeScript", "JavaScript", "Next.js", "Redux", "Tailwind CSS", "GraphQL", "Jest", "Cypress",
+      "HTML", "CSS"]),
+    ("data engineer", """Maria Gonzalez
+Professional Summary
+Data engineer, 5 years of experience designing batch and streaming pipelines.
+Employment History
+Data Engineer at Northwind Analytics, 2019 - present
+- Built Airflow DAGs loading 2 TB/day from Kafka into Snowflake
+- Replaced nightly Hadoop jobs with PySpark on Databricks
+- Modelled the warehouse with dbt and wrote data quality checks in Python
+Key Projects
+Clickstream Lakehouse (Spark Streaming, Delta Lake, AWS Glue)
+Core Competencies
+Python, SQL, Apache Spark, Airflow, Kafka, Snowflake, dbt, AWS, Tableau""",
+     ["Python", "SQL", "Apache Spark", "Airflow", "Kafka", "Snowflake", "dbt", "Databricks", "AWS"]),
+    ("ml engineer", """Kenji Watanabe
+About
+Machine learning engineer shipping NLP and recommendation models to production.
+Experience
+Machine Learning Engineer - Streamwise (2021 - Present)
+- Trained PyTorch transformer models for search ranking; served with ONNX Runtime
+- Built feature pipelines in Pandas and Spark; tracked experiments in MLflow
+Data Scientist - RetailCo (2018 - 2021)
+- XGBoost demand forecasting, A/B testing and Tableau dashboards
+Projects
+RAG Assistant - LangChain, OpenAI API, FAISS and FastAPI
+Skills
+Python, PyTorch, TensorFlow, scikit-learn, Hugging Face, NLP, SQL, Docker, Kubernetes""",
+     ["Python", "PyTorch", "TensorFlow", "scikit-learn", "NLP", "Hugging Face Transformers", "MLflow",
+      "LangChain", "SQL", "Gradient Boosting"]),
+    ("devops", """Olu Adeyemi
+Summary
+Site reliability engineer with 8 years keeping large fleets boring.
+Experience
+Senior SRE, CloudNine (2018 - Present)
+- Ran 40 Kubernetes clusters on AWS (EKS) managed with Terraform and Helm
+- Built GitHub Actions and Argo CD pipelines; on-call lead
+- Rolled out Prometheus, Grafana and OpenTelemetry tracing
+Systems Administrator, HostCo (2015 - 2018)
+- Automated Linux provisioning with Ansible and Bash
+Skills
+AWS, Kubernetes, Terraform, Helm, Docker, Ansible, Prometheus, Grafana, Python, Go, Linux""",
+     ["AWS", "Kubernetes", "Terraform", "Helm", "Docker", "Ansible", "Prometheus", "Grafana", "Linux",
+      "CI/CD", "Python", "Go"]),
+    ("android", """Lena Fischer
+Objective
+Android developer looking for a senior mobile role.
+Professional Experience
+Android Developer, RideNow (2019 - present)
+- Migrated the rider app from Java to Kotlin and Jetpack Compose
+- Offline-first sync with Room, Retrofit and WorkManager
+Mobile Developer, StartApp (2017 - 2019)
+- Shipped a Flutter prototype and the iOS app's Swift networking layer
+Projects
+Transit Alerts - Kotlin app with Firebase push notifications
+Technical Skills
+Kotlin, Java, Android, Jetpack Compose, Firebase, Swift, Flutter, Git""",
+     ["Kotlin", "Java", "Android", "Firebase", "Swift", "Flutter", "Git"]),
+    ("enterprise java", """Rahul Mehta
+Professional Summary
+Java developer, 10 years of experience in banking systems.
+Work History
+Lead Java Developer at FinBank, 2016 - Present
+- Spring Boot microservices on OpenShift with Oracle and Hibernate
+- Messaging with RabbitMQ and ActiveMQ; JUnit and Mockito test suites
+Java Developer at Infotech, 2012 - 2016
+- J2EE applications on Tomcat; SQL tuning
+Technical Skills
+Java, Spring, Hibernate, SQL, Oracle DB, RabbitMQ, Jenkins, Maven, Kubernetes""",
+     ["Java", "Spring Boot", "Hibernate", "Microservices", "Oracle Database", "SQL", "RabbitMQ", "JUnit",
+      "Jenkins", "Kubernetes"]),
+    ("career changer", """Sam Carter
+I spent six years as a secondary school maths teacher before retraining as a developer.
+During a bootcamp I built a small budgeting web app using JavaScript and Node.js with a MongoDB
+database, and a Python script that cleans up spreadsheets for my old school. I enjoy explaining
+things clearly and want to grow into a full stack role.""",
+     ["JavaScript", "Node.js", "MongoDB", "Python"]),
+    ("generalist", """Alex Kim
+Software engineer with experience across the stack.
+Work Experience
+Software Engineer, Mediabox (2020 - 2024)
+- Video upload service in Node.js and Express with S3 and SQS
+- Vue.js admin console, PostgreSQL reporting queries
+Projects
+Chess engine in C++ (bitboards, alpha-beta search)
+Tools
+Git, Docker, Jira, Postman""",
+     ["Node.js", "Express", "Amazon S3", "Vue.js", "PostgreSQL", "C++", "Docker"]),
+]
+
+# Everyday phrases whose words are also skill aliases; none of them is a skill mention
+NEGATIVES = [
+    "Passionate about unity and teamwork in diverse groups.",
+    "Go getter with a can-do attitude.",
+    "I react quickly to incidents and stay calm under pressure.",
+    "Led R&D for a small team and helped everyone excel at security reviews.",
+    "Volunteer: taught kids to spark curiosity with a flask and a torch.",
+]
+
+
+def canonical(skills, index):
+    """Map free-form skill strings (e.g. "Python (advanced)") to the index's canonical names."""
+    names = set()
+    for skill in skills:
+        found = index.skills(str(skill), context=False)
+        names.update(found or [str(skill).strip().lower()])
+    return names
+
+
+def score(predicted, reference):
+    hits = len(predicted & reference)
+    precision = hits / len(predicted) if predicted else 0.0
+    recall = hits / len(reference) if reference else 0.0
+    return precision, recall
+
+
+def live_references(corpus):
+    """Analyse each resume with the model; returns (name -> primary skills, latencies)."""
+    from Agents.agent import Agents
+    from utils.resume import _model_resume_analysis, FALLBACK_RESUME_ANALYSIS
+    from utils import telemetry
+
+    agents = Agents()
+    references, latencies = {}, []
+    for name, text, _ in corpus:
+        start = time.perf_counter()
+        with telemetry.span("resume_analysis") as span:
+            analysis = _model_resume_analysis(agents, text, print, span)
+        latencies.append(time.perf_counter() - start)
+        if analysis != FALLBACK_RESUME_ANALYSIS:
+            references[name] = analysis.get("primary_skills", [])
+    return references, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=100, help="Timed local analyses of each resume")
+    parser.add_argument("--live", action="store_true", help="Compare against Gemini's analyses (needs GOOGLE_API_KEY)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    SkillIndex(SKILL_TAXONOMY)
+    build = time.perf_counter() - start
+    index = get_skill_index()
+
+    references = {name: skills for name, _, skills in CORPUS}
+    model_latencies = []
+    if args.live:
+        references, model_latencies = live_references(CORPUS)
+
+    print(f"{'resume':<18}{'precision':>10}{'recall':>8}{'confidence':>12}  route")
+    precisions, recalls, local_count = [], [], 0
+    for name, text, _ in CORPUS:
+        local = local_resume_analysis(text, index)
+        is_local = local.confidence >= MIN_CONFIDENCE
+        local_count += is_local
+        if name not in references:
+            print(f"{name:<18}{'-':>10}{'-':>8}{local.confidence:>12.2f}  (no model reference)")
+            continue
+        precision, recall = score(canonical(local.analysis["primary_skills"], index),
+                                  canonical(references[name], index))
+        precisions.append(precision)
+        recalls.append(recall)
+        print(f"{name:<18}{precision:>10.2f}{recall:>8.2f}{local.confidence:>12.2f}  "
+              f"{'local' if is_local else 'model'}")
+    if precisions:
+        print(f"{'mean':<18}{sum(precisions) / len(precisions):>10.2f}{sum(recalls) / len(recalls):>8.2f}")
+    print(f"{local_count} of {len(CORPUS)} resumes answered locally (confidence >= {MIN_CONFIDENCE})")
+
+    failures = 0
+    for text in NEGATIVES:
+        found = index.skills(text)
+        failures += bool(found)
+        print(f"  {'FAIL' if found else 'ok  '} {text[:50]:<52}{', '.join(found)}")
+
+    timings = []
+    for _ in range(args.repeat):
+        for _, text, _ in CORPUS:
+            timings.append(local_resume_analysis(text, index).seconds)
+    print(f"index: {index.aliases} aliases for {len(index.categories)} skills, built in {build * 1e3:.1f}ms")
+    print(f"local analysis: p50 {percentile(timings, 50) * 1e3:.2f}ms, p95 {percentile(timings, 95) * 1e3:.2f}ms "
+          f"over {len(timings)} runs")
+    if model_latencies:
+        print(f"model analysis: p50 {percentile(model_latencies, 50):.2f}s, "
+              f"p95 {percentile(model_latencies, 95):.2f}s over {len(model_latencies)} calls")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
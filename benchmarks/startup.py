@@ -0,0 +1,101 @@
+"""
+Startup/rerun latency benchmark for model discovery.
+
+Uses a stubbed ``gen_ai`` client whose ``list_models()`` sleeps for a
+configurable round-trip time, so no API key or network access is needed.
+
+    python -m benchmarks.startup --list-latency 0.4 --reruns 50
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+
+from Agents import agent as agent_module
+from Agents.agent import Agents
+from Agents.registry import ModelRegistry, PREFERRED_MODELS
+
+
+class StubGenAI:
+    """Minimal stand-in for ``google.generativeai``."""
+    def __init__(self, list_latency):
+        self.list_latency = list_latency
+        self.list_calls = 0
+        self.configure_calls = 0
+
+    def configure(self, api_key=None):
+        self.configure_calls += 1
+
+    def list_models(self):
+        self.list_calls += 1
+        time.sleep(self.list_latency)
+        return [SimpleNamespace(name=name) for name in PREFERRED_MODELS]
+
+    def GenerativeModel(self, model_name):
+        return SimpleNamespace(model_name=model_name)
+
+
+def time_call(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label, samples, client):
+    print(f"{label:<28} median {statistics.median(samples):8.2f} ms   "
+          f"max {max(samples):8.2f} ms   list_models calls {client.list_calls}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--list-latency", type=float, default=0.4,
+                        help="Simulated list_models() round-trip in seconds")
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state_path = os.path.join(tmp, "model_registry.json")
+
+        # Old behaviour: configure + list_models on every script run
+        client = StubGenAI(args.list_latency)
+
+        def eager_rerun():
+            client.configure(api_key="benchmark-key")
+            available = [m.name for m in client.list_models()]
+            name = next(m for m in PREFERRED_MODELS if m in available)
+            client.GenerativeModel(name)
+
+        report("eager (per rerun)", time_call(eager_rerun, args.reruns), client)
+
+        # Cold start with nothing on disk: one discovery round-trip
+        client = StubGenAI(args.list_latency)
+
+        def cold_start():
+            Agents(ModelRegistry(client, "benchmark-key", state_path=state_path)).model
+
+        report("cold start, no state", time_call(cold_start, 1), client)
+
+        # Cold start with the last known good model persisted: no network
+        client = StubGenAI(args.list_latency)
+        report("cold start, persisted", time_call(cold_start, args.reruns), client)
+
+        # Reruns against the process-wide shared instance
+        client = StubGenAI(args.list_latency)
+        agent_module._shared_agents = Agents(
+            ModelRegistry(client, "benchmark-key", state_path=state_path))
+
+        def shared_rerun():
+            agent_module.get_agents().model
+
+        report("rerun, shared agents", time_call(shared_rerun, args.reruns), client)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Telemetry benchmark: span overhead and the trace report.
+
+Runs the same batch of answer evaluations through ``Agents`` on a fake
+model with telemetry off and on (writing a JSONL trace to a temporary
+file), prints the per-evaluation overhead of the spans, then the
+``python -m utils.telemetry`` report for the recorded trace. A share of
+responses is malformed so the parse-failure counters have something to show.
+
+    python -m benchmarks.telemetry --requests 500 --malformed-rate 0.1
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-key")
+
+from Agents.agent import Agents
+from Agents.fake import FakeModel, FakeRegistry
+from Agents.resilience import ResilientCaller
+from utils import telemetry
+
+SCORE = json.dumps({
+    "category_scores": {"technical_accuracy": 15, "knowledge_depth": 14, "problem_solving": 15,
+                        "communication": 16, "experience_relevance": 12},
+    "feedback": "Solid answer with a concrete example.",
+})
+ANALYSIS = {"primary_skills": ["Python", "SQL"], "experience_summary": "3 years of backend development"}
+
+
+def make_agents(malformed_rate, latency, seed):
+    rng = random.Random(seed)
+    model = FakeModel(responses=lambda prompt: "I'd rate this a 15." if rng.random() < malformed_rate else SCORE,
+                      latency=latency)
+    return Agents(registry=FakeRegistry(model), structured=False, resilience=ResilientCaller())
+
+
+def run(agents, requests):
+    start = time.perf_counter()
+    for i in range(requests):
+        agents.evaluate_answer(ANALYSIS, {"question": f"Question {i}", "answer": "An answer " * 20})
+    return (time.perf_counter() - start) / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--malformed-rate", type=float, default=0.1)
+    parser.add_argument("--latency", type=float, default=0.002, help="Simulated model latency in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    os.environ["INTERVIEWMATE_TELEMETRY"] = "0"
+    baseline = run(make_agents(args.malformed_rate, args.latency, args.seed), args.requests)
+
+    with tempfile.TemporaryDirectory() as directory:
+        trace_path = os.path.join(directory, "traces.jsonl")
+        telemetry._telemetry = telemetry.Telemetry(trace_path)
+        traced = run(make_agents(args.malformed_rate, args.latency, args.seed), args.requests)
+        telemetry._telemetry.flush()
+
+        print(f"evaluate_answer: {baseline * 1e6:.0f}us without telemetry, {traced * 1e6:.0f}us with "
+              f"({(traced - baseline) * 1e6:+.0f}us per span)")
+        print()
+        print(telemetry.report(telemetry.load_trace(trace_path)))
+
+
+if __name__ == "__main__":
+    main()
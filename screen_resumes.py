@@ -0,0 +1,219 @@
+"""
+Headless bulk resume screening.
+
+Walks a directory of PDF/DOCX resumes, extracts text in a process pool,
+runs resume analysis and question generation with bounded concurrency and
+appends one JSON line per file to the output. Files already screened
+successfully (matched by content hash) are skipped before they are
+extracted, so an interrupted run can simply be restarted.
+
+    python screen_resumes.py resumes/ --output screening.jsonl --concurrency 8
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from utils import resume
+from utils.cache import get_cache
+from utils.prefetch import rank_positions
+from utils.question_bank import get_question_bank
+
+RESUME_EXTENSIONS = (".pdf", ".docx")
+
+
+def find_resumes(directory):
+    """Yield resume paths under ``directory`` in a stable order."""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(RESUME_EXTENSIONS) and not name.startswith("~$"):
+                yield os.path.join(root, name)
+
+
+def load_completed(output_path):
+    """Return the content hashes already screened successfully."""
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # A partially written last line from an interrupted run
+            if record.get("status") == "ok":
+                completed.add(record.get("sha256"))
+    return completed
+
+
+def fingerprint(path):
+    """Content hash and analysis cache key of a resume file, from its raw bytes."""
+    with open(path, "rb") as f:
+        file_bytes = f.read()
+    return hashlib.sha256(file_bytes).hexdigest(), resume.analysis_cache_key(file_bytes)
+
+
+def parse_resume_file(path, sha256, cache_key):
+    """Read and extract one resume; runs in a worker process."""
+    start = time.perf_counter()
+    errors = []
+    with open(path, "rb") as f:
+        file_bytes = f.read()
+
+    if path.lower().endswith(".pdf"):
+        # Already inside a worker process, so don't fan pages out again
+        text = resume.extract_text_from_pdf(io.BytesIO(file_bytes), on_error=errors.append, parallel=False)
+    else:
+        text = resume.extract_text_from_docx(io.BytesIO(file_bytes), on_error=errors.append)
+
+    return {
+        "path": path,
+        "sha256": sha256,
+        "cache_key": cache_key,
+        "text": text,
+        "errors": errors,
+        "parse_seconds": time.perf_counter() - start,
+    }
+
+
+def screen_resume(agents, parsed, position, with_questions):
+    """Analyze one parsed resume and generate its questions; runs in a thread."""
+    start = time.perf_counter()
+    errors = list(parsed["errors"])
+    record = {
+        "file": parsed["path"],
+        "sha256": parsed["sha256"],
+        "parse_seconds": round(parsed["parse_seconds"], 4),
+    }
+
+    if not parsed["text"].strip():
+        record.update(status="error", error="; ".join(errors) or "No text extracted", llm_seconds=0.0)
+        return record
+
+    cache = get_cache("resume_analysis")
+    analysis = cache.get(parsed["cache_key"])
+    record["cached"] = analysis is not None
+    if analysis is None:
+        analysis = resume.analyze_resume(agents, parsed["text"], on_error=errors.append)
+        if resume.is_degraded_analysis(analysis):
+            record.update(status="error", error="; ".join(errors) or "Resume analysis failed",
+                          llm_seconds=round(time.perf_counter() - start, 4))
+            return record
+        cache.set(parsed["cache_key"], analysis)
+    record["resume_analysis"] = analysis
+
+    if with_questions:
+        target = position or (rank_positions(analysis.get("primary_skills", []), limit=1) or ["Software Engineer"])[0]
+        record["position"] = target
+        record["technical_questions"] = resume.generate_technical_questions(
+            agents, analysis, target, on_error=errors.append, bank=get_question_bank()
+        )
+
+    record["llm_seconds"] = round(time.perf_counter() - start, 4)
+    record["status"] = "ok"
+    if errors:
+        record["warnings"] = errors
+    return record
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen a directory of resumes without the Streamlit UI.")
+    parser.add_argument("directory", help="Directory containing PDF/DOCX resumes")
+    parser.add_argument("--output", default="screening.jsonl", help="JSONL file to append results to")
+    parser.add_argument("--position", help="Position to generate questions for (inferred from skills by default)")
+    parser.add_argument("--no-questions", action="store_true", help="Only run resume analysis")
+    parser.add_argument("--parse-workers", type=int, default=os.cpu_count() or 2,
+                        help="Processes used for PDF/DOCX text extraction")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum in-flight LLM requests")
+    args = parser.parse_args(argv)
+
+    from Agents.agent import get_agents
+    agents = get_agents()
+
+    completed = load_completed(args.output)
+    paths = list(find_resumes(args.directory))
+    print(f"Found {len(paths)} resumes, {len(completed)} already screened")
+
+    latencies, queue_waits = [], []
+    counts = {"ok": 0, "error": 0, "skipped": 0}
+    started = {}
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=args.parse_workers) as parse_pool, \
+            ThreadPoolExecutor(max_workers=args.concurrency) as llm_pool, \
+            open(args.output, "a", encoding="utf-8") as output:
+        pending = set()
+        for path in paths:
+            # Hashing is far cheaper than extraction, so known files never reach the parse pool
+            try:
+                sha256, cache_key = fingerprint(path)
+            except OSError as e:
+                counts["error"] += 1
+                print(f"Error reading resume {path}: {str(e)}", file=sys.stderr)
+                continue
+            if sha256 in completed:
+                counts["skipped"] += 1
+                continue
+            completed.add(sha256)
+            future = parse_pool.submit(parse_resume_file, path, sha256, cache_key)
+            started[future] = time.perf_counter()
+            pending.add(future)
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                file_started = started.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    counts["error"] += 1
+                    print(f"Error screening resume: {str(e)}", file=sys.stderr)
+                    continue
+
+                # A parse result: hand it to the LLM pool
+                if "text" in result:
+                    llm_future = llm_pool.submit(
+                        screen_resume, agents, result, args.position, not args.no_questions
+                    )
+                    started[llm_future] = file_started
+                    pending.add(llm_future)
+                    continue
+
+                # Time spent parsing and screening, apart from waiting for a free worker
+                total = time.perf_counter() - file_started
+                result["latency_seconds"] = round(result["parse_seconds"] + result["llm_seconds"], 4)
+                result["queue_seconds"] = round(max(total - result["latency_seconds"], 0.0), 4)
+                latencies.append(result["latency_seconds"])
+                queue_waits.append(result["queue_seconds"])
+                counts[result["status"]] += 1
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+                print(f"[{result['status']}] {result['file']}")
+
+    elapsed = time.perf_counter() - start
+    processed = counts["ok"] + counts["error"]
+    print(
+        f"\nScreened {processed} files in {elapsed:.1f}s "
+        f"({processed / elapsed if elapsed else 0:.2f} files/sec): "
+        f"{counts['ok']} ok, {counts['error']} failed, {counts['skipped']} skipped"
+    )
+    print(f"Latency p50 {percentile(latencies, 50):.2f}s, p95 {percentile(latencies, 95):.2f}s; "
+          f"queue wait p50 {percentile(queue_waits, 50):.2f}s, p95 {percentile(queue_waits, 95):.2f}s")
+    return 0 if counts["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,24 @@
 import os
 import streamlit as st
 import json
-from dotenv import load_dotenv
-import google.generativeai as gen_ai
-from Agents.agent import Agents
-import PyPDF2
-from docx import Document
-import io
+from Agents.agent import get_agents
+from utils.cache import get_cache
+from utils.question_bank import get_question_bank
+from utils.session_store import get_session_store, new_token
+from utils.job_queue import get_job_queue
+from utils.prefetch import QuestionPrefetcher, rank_positions
+from utils import resume
+from utils.evaluation import (
+    AnswerEvaluationPipeline, aggregate_scores, evaluation_key, get_evaluation_cache, is_valid_evaluation
+)
+from utils.adaptive import AssessmentPolicy, CONTINUE, FAIL, PASS
+from utils.prescreen import strip_screened_answers
+from utils.prompt_budget import compact_json, fit_evaluation_context
+from utils.json_parser import EVALUATION_SCHEMA
+from Agents.schemas import Evaluation
 
-# Initialize Agents
-agents = Agents()
+# Shared across reruns and sessions; model discovery happens lazily
+agents = get_agents()
 
 # Streamlit Page Configuration
 st.set_page_config(
@@ -66,48 +75,89 @@ st.markdown("""
     """, unsafe_allow_html=True)
 
 # Initialize Session State
+# Defaults for missing keys; callables are factories so each session gets
+# its own mutable values and nothing is built for keys that already exist
+STATE_DEFAULTS = {
+    "user_data": dict,
+    "evaluation_data": dict,
+    "resume_text": "",
+    "resume_analysis": None,
+    "position_selected": False,
+    "position": None,
+    "technical_questions": None,
+    "current_question_index": 0,
+    "current_question_key": None,
+    "answers": dict,
+    "evaluation_complete": False,
+    "evaluation_result": None
+}
+
 def initialize_session_state():
-    state_defaults = {
-        "chat_session": agents.model.start_chat(history=[]),
-        "user_data": {},
-        "evaluation_data": {},
-        "resume_text": "",
-        "resume_analysis": None,
-        "position_selected": False,
-        "technical_questions": None,
-        "current_question_index": 0,
-        "answers": {},
-        "evaluation_complete": False
-    }
-    for key, value in state_defaults.items():
+    for key, default in STATE_DEFAULTS.items():
         if key not in st.session_state:
-            st.session_state[key] = value
+            st.session_state[key] = default() if callable(default) else default
 
 initialize_session_state()
 
+# Keys checkpointed after each stage so a rerun, restart or reconnect resumes the interview
+PERSISTED_KEYS = (
+    "resume_analysis",
+    "position_selected",
+    "position",
+    "technical_questions",
+    "current_question_index",
+    "current_question_key",
+    "answers",
+    "answer_scores",
+    "evaluation_complete",
+    "evaluation_result",
+)
+session_store = get_session_store()
+
+def restore_session():
+    """Resume the session named by the ``session`` URL parameter, or start a new one."""
+    if session_store is None or st.session_state.get("session_token"):
+        return
+    token = st.query_params.get("session")
+    saved_state = session_store.load(token) if token else None
+    if saved_state:
+        for key in PERSISTED_KEYS:
+            if key in saved_state:
+                st.session_state[key] = saved_state[key]
+    else:
+        token = new_token()
+        st.query_params["session"] = token
+    st.session_state.session_token = token
+
+def checkpoint_session():
+    """Queue a snapshot of this session's progress; written in the background."""
+    token = st.session_state.get("session_token")
+    if session_store is None or not token:
+        return
+    state = {key: st.session_state.get(key) for key in PERSISTED_KEYS}
+    pipeline = st.session_state.get("evaluation_pipeline")
+    if pipeline is not None:
+        state["answer_scores"] = pipeline.completed()
+    session_store.save(token, state)
+
+restore_session()
+
+resume_cache = get_cache("resume_analysis")
+# Questions generated for earlier candidates, reused across sessions
+question_bank = get_question_bank()
+# With INTERVIEWMATE_JOB_QUEUE=1 model calls run in `python worker.py` processes
+job_queue = get_job_queue()
+# Question order and when to stop; INTERVIEWMATE_ADAPTIVE=1 stops once the result is clear
+assessment_policy = AssessmentPolicy()
+# Scores and evaluations by content; identical requests in flight share one model call
+evaluation_cache = get_evaluation_cache()
+
 # [File Processing Functions remain the same]
 def extract_text_from_pdf(pdf_file):
-    try:
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
-    except Exception as e:
-        st.error(f"Error reading PDF: {str(e)}")
-        return ""
+    return resume.extract_text_from_pdf(pdf_file, on_error=st.error)
 
 def extract_text_from_docx(docx_file):
-    try:
-        docx_bytes = io.BytesIO(docx_file.read())
-        doc = Document(docx_bytes)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
-    except Exception as e:
-        st.error(f"Error reading DOCX: {str(e)}")
-        return ""
+    return resume.extract_text_from_docx(docx_file, on_error=st.error)
 
 def handle_file_upload(uploaded_file):
     try:
@@ -122,163 +172,108 @@ def handle_file_upload(uploaded_file):
         st.error(f"Error processing file: {str(e)}")
         return ""
 
-def analyze_resume(resume_text):
-    analysis_prompt = f"""
-    Analyze the following resume to extract key technical information and generate a structured summary:
-    {resume_text}
-
-    Focus on:
-    1. Technical skills and proficiency levels
-    2. Years of experience with each technology
-    3. Project highlights and technical achievements
-    4. Technical roles and responsibilities
-    5. Areas that need clarification or more detail
-
-    Provide analysis in JSON format with these keys:
-    - primary_skills
-    - experience_summary
-    - key_projects
-    - areas_for_clarification
-    - suggested_question_topics
-    
-    Return ONLY the JSON object with no surrounding text, code blocks, or markdown.
-    """
-    
-    response = None
-    
-    try:
-        response = agents.model.generate_content(analysis_prompt)
-        response_text = response.text.strip()
-        
-        # Check if response is wrapped in code blocks and extract just the JSON
-        if response_text.startswith("```") and "```" in response_text:
-            # Extract text between the first and last backtick markers
-            start_idx = response_text.find("{")
-            end_idx = response_text.rfind("}") + 1
-            if start_idx >= 0 and end_idx > start_idx:
-                response_text = response_text[start_idx:end_idx]
-        
-        # Now try to parse the JSON
-        return json.loads(response_text)
-    except Exception as e:
-        st.error(f"Error analyzing resume: {str(e)}")
-        
-        if response is not None:
-            st.error(f"Raw response: {response.text}")
-            
-            # Try to extract and parse the JSON as a fallback
-            try:
-                response_text = response.text.strip()
-                if "```json" in response_text:
-                    # Extract text between ```json and the last ```
-                    json_content = response_text.split("```json")[1].split("```")[0].strip()
-                    return json.loads(json_content)
-            except:
-                pass  # If this fails too, we'll use the default fallback
-        
-        # Return a fallback structure
-        return {
-            "primary_skills": ["Could not parse skills"],
-            "experience_summary": "Could not parse experience",
-            "key_projects": ["Could not parse projects"],
-            "areas_for_clarification": ["Need complete resume review"],
-            "suggested_question_topics": ["Basic skills assessment"]
-        }
-
-
-# Modified Question Generation Based on Resume and Position
-def generate_technical_questions(resume_analysis, position):
-    def format_list(items):
-        if not items:
-            return []
-        formatted = []
-        for item in items:
-            if isinstance(item, dict):
-                formatted.append(str(item.get('name', item.get('skill', str(item)))))
-            elif isinstance(item, str):
-                formatted.append(item)
-            else:
-                formatted.append(str(item))
-        return formatted
-
-    skills = format_list(resume_analysis.get('primary_skills', []))
-    projects = format_list(resume_analysis.get('key_projects', []))
-    experience = str(resume_analysis.get('experience_summary', ''))
-    suggested_topics = format_list(resume_analysis.get('suggested_question_topics', []))
-
-    # Ensure there are enough skills to avoid out-of-range errors
-    skill_1 = skills[0] if len(skills) > 0 else "a relevant skill"
-    skill_2 = skills[1] if len(skills) > 1 else "another relevant skill"
-
-    # Prompt with safe skill placeholders
-    question_prompt = f"""
-    You are a technical interviewer. Generate **10 UNIQUE and DIVERSE** interview questions for a candidate.
-
-    **Candidate Resume Details:**
-    - **Position Applied:** {position}
-    - **Skills:** {', '.join(skills) if skills else 'Not specified'}
-    - **Projects:** {', '.join(projects) if projects else 'Not specified'}
-    - **Experience Summary:** {experience}
-    - **Suggested Topics:** {', '.join(suggested_topics) if suggested_topics else 'Not specified'}
-
-    **STRICT RULES FOR QUESTION DIVERSITY:**
-    - **2 questions about past projects** (real-world challenges).
-    - **3 questions about primary technical skills** (deep-dive into hands-on experience).
-    - **2 system design or architecture questions** (scalability and performance).
-    - **3 problem-solving or algorithm-based questions** (require explanations).
-    - **Each question must be unique.**
-    - **Ensure the difficulty level increases from Question 1 to 10.**
-    
-    **Examples of Unique Questions (DO NOT COPY, FOLLOW THIS PATTERN):**
-    1. **(Project-Based)** "Can you describe a challenging problem you faced in {projects[0] if projects else 'one of your projects'} and how you solved it?"
-    2. **(Skill-Based)** "How does {skill_1} compare to {skill_2} in terms of performance and scalability?"
-    3. **(System Design)** "How would you design a fault-tolerant system for a {position} role?"
-    
-    **Output JSON Format (STRICTLY JSON ONLY, NO EXTRA TEXT):**
-    {{
-        "question1": {{ "question": "...", "type": "project/skill/design/problem", "focus_area": "specific skill or project" }},
-        ...
-        "question10": {{ "question": "...", "type": "project/skill/design/problem", "focus_area": "specific skill or project" }}
-    }}
-    """
+def analyze_uploaded_resume(uploaded_file):
+    """Analyze an uploaded resume, reusing cached results for identical files."""
+    cache_key = resume.analysis_cache_key(uploaded_file.getvalue())
+    cached_analysis = resume_cache.get(cache_key)
+    if cached_analysis is not None:
+        return cached_analysis
 
-    try:
-        response = agents.model.generate_content(question_prompt)
-        response_text = response.text.strip()
-
-        if response_text.startswith("```") and "```" in response_text:
-            start_idx = response_text.find("{")
-            end_idx = response_text.rfind("}") + 1
-            response_text = response_text[start_idx:end_idx]
-
-        questions = json.loads(response_text)
-
-        # Ensure all 10 questions exist, otherwise fill with defaults
-        for i in range(1, 11):
-            question_key = f"question{i}"
-            if question_key not in questions:
-                questions[question_key] = {
-                    "question": f"Describe your experience with {position} related technologies.",
-                    "type": "general",
-                    "focus_area": "general experience"
-                }
+    resume_text = handle_file_upload(uploaded_file)
+    if not resume_text:
+        return None
 
-        return questions
+    with st.spinner("Analyzing resume..."):
+        analysis = analyze_resume(resume_text)
+    # Don't pin a failed parse; the next upload should get a fresh attempt
+    if not resume.is_degraded_analysis(analysis):
+        resume_cache.set(cache_key, analysis)
+    return analysis
 
-    except Exception as e:
-        st.error(f"Error generating questions: {str(e)}")
-
-        fallback_questions = {}
-        for i in range(1, 11):
-            fallback_questions[f"question{i}"] = {
-                "question": f"Question {i}: Please describe your experience with {position} related technologies.",
-                "type": "general",
-                "focus_area": "general experience"
-            }
-        return fallback_questions
+def run_job(kind, payload, run_inline):
+    """Run a model-bound job on the worker pool, or inline without a job queue."""
+    if job_queue is not None:
+        try:
+            return job_queue.run(kind, payload, on_error=st.error)
+        except Exception as e:
+            st.error(f"Background job failed, retrying here: {str(e)}")
+    return run_inline()
+
+def analyze_resume(resume_text):
+    # Most resumes are answered by the local skill index; only queue the rest for the model
+    if job_queue is not None:
+        analysis = resume.confident_local_analysis(resume_text)
+        if analysis is not None:
+            return analysis
+    return run_job(
+        "resume_analysis",
+        {"resume_text": resume_text},
+        lambda: resume.analyze_resume(agents, resume_text, on_error=st.error)
+    )
+
+def generate_technical_questions(resume_analysis, position, on_question=None):
+    if job_queue is None:
+        return resume.generate_technical_questions(
+            agents, resume_analysis, position, on_question=on_question, on_error=st.error, bank=question_bank
+        )
+    questions = run_job(
+        "technical_questions",
+        {"resume_analysis": resume_analysis, "position": position},
+        lambda: resume.generate_technical_questions(
+            agents, resume_analysis, position, on_error=st.error, bank=question_bank
+        )
+    )
+    # Questions arrive all at once from a worker; still report each one for progress
+    if on_question:
+        for question_key, question_data in questions.items():
+            on_question(question_key, question_data)
+    return questions
+
+def generate_question_batch(resume_analysis, position, question_types, existing_questions):
+    # Runs in the background while the candidate answers, so errors are only logged
+    return run_job(
+        "question_batch",
+        {"resume_analysis": resume_analysis, "position": position,
+         "question_types": question_types, "existing_questions": existing_questions},
+        lambda: resume.generate_question_batch(
+            agents, resume_analysis, position, question_types, existing_questions,
+            on_error=print, bank=question_bank
+        )
+    )
+
+def start_question_pipeline(position, questions=None):
+    """Generate this session's questions in batches; the first batch is ready soonest."""
+    resume_analysis = st.session_state.resume_analysis
+    st.session_state.question_pipeline = resume.start_question_pipeline(
+        lambda question_types, existing: generate_question_batch(resume_analysis, position, question_types, existing),
+        position,
+        questions
+    )
+    return st.session_state.question_pipeline
+
+def evaluate_answer(resume_analysis, answer):
+    return evaluation_cache.get_or_compute(
+        evaluation_key("answer", resume_analysis, answer),
+        lambda: run_job(
+            "evaluate_answer",
+            {"resume_analysis": resume_analysis, "answer": answer},
+            lambda: agents.evaluate_answer(resume_analysis, answer)
+        )
+    )
 
 
 # UI Components
+POSITIONS = [
+    "Software Engineer",
+    "Frontend Developer",
+    "Backend Developer",
+    "Full Stack Developer",
+    "DevOps Engineer",
+    "Data Scientist",
+    "Machine Learning Engineer",
+    "Other"
+]
+
 def display_header():
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
@@ -295,22 +290,24 @@ def display_header():
         </div>
         """, unsafe_allow_html=True)
 
+def start_question_prefetch(resume_analysis):
+    """Start generating questions for the most likely positions in the background."""
+    prefetcher = QuestionPrefetcher(generate_technical_questions)
+    prefetcher.start(
+        resume_analysis,
+        rank_positions(resume_analysis.get('primary_skills', []), POSITIONS)
+    )
+    st.session_state.question_prefetcher = prefetcher
+
 def display_position_selection():
     st.subheader("🎯 Select Position")
-    positions = [
-        "Software Engineer",
-        "Frontend Developer",
-        "Backend Developer",
-        "Full Stack Developer",
-        "DevOps Engineer",
-        "Data Scientist",
-        "Machine Learning Engineer",
-        "Other"
-    ]
+    prefetcher = st.session_state.get("question_prefetcher")
+    likely_positions = prefetcher.positions() if prefetcher else []
     
     selected_position = st.selectbox(
         "What position are you applying for?",
-        positions
+        POSITIONS,
+        index=POSITIONS.index(likely_positions[0]) if likely_positions else 0
     )
     
     if selected_position == "Other":
@@ -320,20 +317,93 @@ def display_position_selection():
     
     if st.button("Continue with Assessment"):
         st.session_state.position_selected = True
-        with st.spinner("Generating position-specific questions..."):
-            st.session_state.technical_questions = generate_technical_questions(
-                st.session_state.resume_analysis,
-                selected_position
-            )
+        st.session_state.position = selected_position
+        if prefetcher:
+            with st.spinner("Preparing your questions..."):
+                prefetched_questions = prefetcher.take(selected_position)
+            if prefetched_questions:
+                st.session_state.technical_questions = prefetched_questions
+                checkpoint_session()
+                st.rerun()
+
+        # Generate just the first batch now; the rest follows while the candidate answers
+        with st.spinner("Preparing your first questions..."):
+            pipeline = start_question_pipeline(selected_position)
+            pipeline.wait(1)
+        st.session_state.technical_questions = pipeline.ready()
+        checkpoint_session()
         st.rerun()
 
+def get_evaluation_pipeline():
+    """Return this session's per-answer evaluation pipeline, creating it on first use."""
+    if st.session_state.get("evaluation_pipeline") is None:
+        pipeline = AnswerEvaluationPipeline(
+            evaluate_answer,
+            st.session_state.resume_analysis
+        )
+        # A restored session keeps its saved scores and rescores only the rest
+        saved_scores = st.session_state.get("answer_scores") or {}
+        unscored = {}
+        for question_key, answer in st.session_state.answers.items():
+            if question_key in saved_scores:
+                pipeline.preload(question_key, answer, saved_scores[question_key])
+            else:
+                unscored[question_key] = answer
+        pipeline.submit_many(unscored)
+        st.session_state.evaluation_pipeline = pipeline
+    return st.session_state.evaluation_pipeline
+
+def planned_question_count():
+    """Size of the question set while it is still being generated, otherwise ``None``."""
+    pipeline = st.session_state.get("question_pipeline")
+    return pipeline.size if pipeline is not None else None
+
+def wait_for_questions(count):
+    """Questions generated so far, waiting for the next batch when fewer than ``count`` are ready."""
+    pipeline = st.session_state.get("question_pipeline")
+    questions = st.session_state.technical_questions or {}
+    if pipeline is None and st.session_state.position and len(questions) < resume.QUESTION_COUNT:
+        # A restored session whose set was still being generated
+        pipeline = start_question_pipeline(st.session_state.position, questions)
+    if pipeline is None:
+        return questions
+    if len(pipeline.ready()) < count and not pipeline.done():
+        with st.spinner("Preparing the next question..."):
+            pipeline.wait(count)
+    st.session_state.technical_questions = pipeline.ready()
+    if pipeline.done():
+        st.session_state.question_pipeline = None
+        checkpoint_session()
+    return st.session_state.technical_questions
+
+def get_answer_scores():
+    """Per-answer scores finished so far, without waiting for pending ones."""
+    pipeline = st.session_state.get("evaluation_pipeline")
+    if pipeline is not None:
+        return pipeline.completed()
+    return st.session_state.get("answer_scores") or {}
+
+def current_question_key():
+    """Key of the question being asked, choosing the next one if there is none yet."""
+    questions = st.session_state.technical_questions
+    question_key = st.session_state.current_question_key
+    if question_key not in questions or question_key in st.session_state.answers:
+        question_key = assessment_policy.next_question(questions, st.session_state.answers, get_answer_scores())
+        st.session_state.current_question_key = question_key
+    return question_key
+
 def display_technical_assessment():
+    if st.session_state.evaluation_complete and st.session_state.evaluation_result:
+        st.markdown("## Evaluation Results")
+        for key, value in st.session_state.evaluation_result.items():
+            display_evaluation_section(key, value)
+        return
     if not st.session_state.technical_questions or st.session_state.evaluation_complete:
         return
+    wait_for_questions(len(st.session_state.answers) + 1)
 
-    current_question_data = st.session_state.technical_questions.get(
-        f"question{st.session_state.current_question_index + 1}"
-    )
+    question_key = current_question_key()
+    current_question_data = st.session_state.technical_questions.get(question_key)
     
     # Handle both dict and string formats for backward compatibility
     if isinstance(current_question_data, dict):
@@ -346,8 +416,10 @@ def display_technical_assessment():
         focus_area = 'general'
     
     # Display progress
-    st.progress((st.session_state.current_question_index) / 10)
-    st.write(f"Question {st.session_state.current_question_index + 1} of 10")
+    answered = len(st.session_state.answers)
+    question_limit = assessment_policy.question_limit(st.session_state.technical_questions, planned_question_count())
+    st.progress(answered / question_limit)
+    st.write(f"Question {answered + 1} of {'up to ' if assessment_policy.adaptive else ''}{question_limit}")
     
     # Display question metadata
     st.markdown(f"**Type:** {question_type.capitalize()}")
@@ -363,26 +435,74 @@ def display_technical_assessment():
         key=f"answer_area_{st.session_state.current_question_index}"
     )
     
-    if st.button("Next Question" if st.session_state.current_question_index < 9 else "Submit Assessment"):
+    if st.button("Next Question" if answered + 1 < question_limit else "Submit Assessment"):
         if answer.strip():
             # Save answer with metadata
-            question_key = f"question{st.session_state.current_question_index + 1}"
+            pipeline = get_evaluation_pipeline()
             st.session_state.answers[question_key] = {
                 'question': current_question,
                 'type': question_type,
                 'focus_area': focus_area,
                 'answer': answer
             }
-            
-            if st.session_state.current_question_index < 9:
+            # Score this answer in the background while the candidate moves on
+            pipeline.submit(question_key, st.session_state.answers[question_key])
+
+            questions = wait_for_questions(len(st.session_state.answers) + 1)
+            decision = assessment_policy.decide(
+                questions, st.session_state.answers, pipeline.completed(), planned_question_count()
+            )
+            next_key = None
+            if decision == CONTINUE:
+                next_key = assessment_policy.next_question(questions, st.session_state.answers, pipeline.completed())
+            if next_key:
                 st.session_state.current_question_index += 1
+                st.session_state.current_question_key = next_key
+                checkpoint_session()
                 st.rerun()
             else:
-                evaluate_responses()
+                if decision in (PASS, FAIL):
+                    st.info(f"The assessment finished early: your answers gave a clear result "
+                            f"after {len(st.session_state.answers)} questions.")
+                evaluation_result = evaluate_responses()
+                if evaluation_result:
+                    st.session_state.evaluation_result = evaluation_result
+                    st.session_state.evaluation_complete = True
+                checkpoint_session()
         else:
             st.warning("Please provide an answer before continuing.")
 
 
+def display_evaluation_section(key, value):
+    """Render one section of the evaluation result as soon as it is available."""
+    if key == "overall_score":
+        # Display overall score with color coding
+        score_color = (
+            "red" if value < 60 
+            else "orange" if value < 75 
+            else "green"
+        )
+        st.markdown(
+            f"### Overall Score: "
+            f"<span style='color:{score_color}'>{value}/100</span>", 
+            unsafe_allow_html=True
+        )
+    elif key == "category_scores":
+        st.markdown("### Category Scores")
+        for category, score in value.items():
+            st.write(f"- {category.replace('_', ' ').title()}: {score}/20")
+    elif key == "strengths":
+        st.markdown("### Key Strengths")
+        for strength in value:
+            st.write(f"- {strength}")
+    elif key == "areas_for_improvement":
+        st.markdown("### Areas for Improvement")
+        for area in value:
+            st.write(f"- {area}")
+    elif key == "detailed_feedback":
+        st.markdown("### Detailed Feedback")
+        st.write(value)
+
 def evaluate_responses():
     """
     Evaluates candidate interview responses and generates a detailed assessment.
@@ -392,28 +512,63 @@ def evaluate_responses():
         st.error("Missing required session state data")
         return None
         
-    if len(st.session_state.answers) != 10:
-        st.warning(f"Expected 10 answers, got {len(st.session_state.answers)}")
+    if not st.session_state.answers:
+        st.warning("There are no answers to evaluate yet.")
         return None
 
-    # Evaluation process
+    # The same analysis and answers were already evaluated (e.g. a double-click or a rerun)
+    cache_key = evaluation_key("evaluation", st.session_state.resume_analysis, st.session_state.answers)
+    cached_result = evaluation_cache.get(cache_key)
+    if cached_result is not None:
+        st.markdown("## Evaluation Results")
+        for key, value in cached_result.items():
+            display_evaluation_section(key, value)
+        return cached_result
+
+    # Combine the per-answer scores collected during the assessment
+    pipeline = st.session_state.get("evaluation_pipeline")
+    if pipeline is not None:
+        scores = {}
+
+        def combine_scores():
+            scores.update(pipeline.results())
+            missing = [key for key in st.session_state.answers if key not in scores]
+            if missing:
+                # Averaging only the scored answers would inflate the result
+                print(f"{len(missing)} answer(s) could not be scored; evaluating all answers at once")
+                return None
+            return aggregate_scores(scores, st.session_state.answers)
+
+        with st.spinner("Evaluating your responses..."):
+            evaluation_result = evaluation_cache.get_or_compute(cache_key, combine_scores, is_valid_evaluation)
+        if evaluation_result:
+            st.markdown("## Evaluation Results")
+            for key, value in evaluation_result.items():
+                display_evaluation_section(key, value)
+            return evaluation_result
+
+    # Fall back to scoring every answer in a single request
     with st.spinner("Evaluating your responses..."):
         try:
             # Prepare evaluation data - ensure clean JSON serialization
             evaluation_data = {
                 "resume_analysis": st.session_state.resume_analysis,
-                "answers": st.session_state.answers
+                # Empty or junk answers are described rather than sent in full
+                "answers": strip_screened_answers(st.session_state.answers)
             }
+            # Long answers and low-priority analysis fields are cut to the prompt budget
+            resume_context, answers_context = fit_evaluation_context(
+                evaluation_data['resume_analysis'], evaluation_data['answers'])
             
             # Construct evaluation prompt with robust error handling
             evaluation_prompt = f"""
 Carefully evaluate the candidate's technical interview responses.
 
 Resume Analysis:
-{json.dumps(evaluation_data['resume_analysis'], indent=2)}
+{compact_json(resume_context)}
 
 Candidate Answers:
-{json.dumps(evaluation_data['answers'], indent=2)}
+{compact_json(answers_context)}
 
 **Evaluation Instructions:**
 1. Assess technical knowledge, problem-solving, and communication skills
@@ -430,65 +585,25 @@ Return the JSON WITHOUT any additional text or formatting.
 """
             
             try:
-                # Generate evaluation with error handling
-                response = agents.model.generate_content(evaluation_prompt)
-                
-                # Clean response text - remove any potential code blocks or extra formatting
-                response_text = response.text.strip()
-                if response_text.startswith("```json"):
-                    response_text = response_text.replace("```json", "").replace("```", "").strip()
-                
-                # Parse JSON with additional error handling
-                try:
-                    evaluation_result = json.loads(response_text)
-                except json.JSONDecodeError:
-                    st.error(f"JSON Parsing Error. Raw response: {response_text}")
-                    return None
-                
-                # Validate required keys
-                required_keys = [
-                    "overall_score", "category_scores", 
-                    "strengths", "areas_for_improvement", 
-                    "detailed_feedback"
-                ]
-                
-                if not all(key in evaluation_result for key in required_keys):
-                    st.error("Evaluation result missing required fields")
-                    return None
-                
-                # Display results (same as previous implementation)
+                # Render each section as soon as it streams in; the schema
+                # check raises if required fields are still missing at the end
                 st.markdown("## Evaluation Results")
-                
-                # Display overall score with color coding
-                score = evaluation_result["overall_score"]
-                score_color = (
-                    "red" if score < 60 
-                    else "orange" if score < 75 
-                    else "green"
-                )
-                st.markdown(
-                    f"### Overall Score: "
-                    f"<span style='color:{score_color}'>{score}/100</span>", 
-                    unsafe_allow_html=True
-                )
-                
-                # Display category scores
-                st.markdown("### Category Scores")
-                for category, score in evaluation_result["category_scores"].items():
-                    st.write(f"- {category.replace('_', ' ').title()}: {score}/20")
-                
-                # Display strengths and improvements
-                st.markdown("### Key Strengths")
-                for strength in evaluation_result["strengths"]:
-                    st.write(f"- {strength}")
-                    
-                st.markdown("### Areas for Improvement")
-                for area in evaluation_result["areas_for_improvement"]:
-                    st.write(f"- {area}")
-                
-                st.markdown("### Detailed Feedback")
-                st.write(evaluation_result["detailed_feedback"])
-                
+                streamed = []
+
+                def stream_evaluation():
+                    evaluation_result = {}
+                    for key, value in agents.stream_json(evaluation_prompt, task="evaluation",
+                                                         schema=EVALUATION_SCHEMA, response_schema=Evaluation):
+                        evaluation_result[key] = value
+                        streamed.append(key)
+                        display_evaluation_section(key, value)
+                    return Evaluation.from_dict(evaluation_result).to_dict()
+
+                # An identical evaluation already in flight is shared rather than requested again
+                evaluation_result = evaluation_cache.get_or_compute(cache_key, stream_evaluation, is_valid_evaluation)
+                if not streamed:
+                    for key, value in evaluation_result.items():
+                        display_evaluation_section(key, value)
                 return evaluation_result
                 
             except Exception as e:
@@ -510,10 +625,11 @@ def main():
         uploaded_file = st.file_uploader("Upload your resume (PDF or DOCX)", type=['pdf', 'docx'])
         
         if uploaded_file:
-            resume_text = handle_file_upload(uploaded_file)
-            if resume_text:
-                with st.spinner("Analyzing resume..."):
-                    st.session_state.resume_analysis = analyze_resume(resume_text)
+            resume_analysis = analyze_uploaded_resume(uploaded_file)
+            if resume_analysis:
+                st.session_state.resume_analysis = resume_analysis
+                start_question_prefetch(resume_analysis)
+                checkpoint_session()
                 st.rerun()
     
     # Step 2: Position Selection
@@ -525,7 +641,14 @@ def main():
         display_technical_assessment()
     
     if st.button("Reset Application"):
+        if st.session_state.get("question_prefetcher"):
+            st.session_state.question_prefetcher.cancel()
+        if st.session_state.get("question_pipeline"):
+            st.session_state.question_pipeline.cancel()
+        if session_store is not None and st.session_state.get("session_token"):
+            session_store.delete(st.session_state.session_token)
         st.session_state.clear()
+        st.query_params.clear()
         st.rerun()
 
 if __name__ == "__main__":
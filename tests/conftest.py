@@ -0,0 +1,9 @@
+import os
+import sys
+import tempfile
+
+# Keep caches, traces and the job queue out of the user's ~/.interviewmate
+os.environ.setdefault("INTERVIEWMATE_CACHE_DIR", tempfile.mkdtemp(prefix="interviewmate-tests-"))
+os.environ.setdefault("INTERVIEWMATE_TELEMETRY", "0")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,102 @@
+import json
+from collections import Counter
+
+from Agents.agent import Agents
+from Agents.fake import FakeModel, FakeRegistry, SimulatedModel
+from utils.evaluation import AnswerEvaluationPipeline, CATEGORIES, aggregate_scores, is_valid_evaluation
+from utils.prescreen import NO_ANSWER
+
+ANALYSIS = {"primary_skills": ["Python", "Django"], "experience_summary": "5 years of backend work"}
+SCORE = {
+    "category_scores": {category: 15 for category in CATEGORIES},
+    "strengths": ["Concrete example"],
+    "areas_for_improvement": ["Discuss trade-offs"],
+    "feedback": "Good answer.",
+}
+
+
+def make_answers(count):
+    return {
+        f"question{i}": {"question": f"How would you scale service {i}?", "type": "design", "focus_area": "Django",
+                         "answer": f"I would cache reads in Redis and shard writes by tenant for service {i}."}
+        for i in range(1, count + 1)
+    }
+
+
+def pipeline_for(model, prescreen=False):
+    agents = Agents(FakeRegistry(model), structured=False, fallback_models=[])
+    return AnswerEvaluationPipeline(agents.evaluate_answer, ANALYSIS, prescreen=prescreen)
+
+
+def test_pipeline_scores_every_answer():
+    pipeline = pipeline_for(SimulatedModel(seed=1))
+    answers = make_answers(5)
+    pipeline.submit_many(answers)
+    results = pipeline.results(timeout=10)
+    assert set(results) == set(answers)
+    evaluation = aggregate_scores(results, answers)
+    assert is_valid_evaluation(evaluation)
+    assert evaluation["overall_score"] == sum(evaluation["category_scores"].values())
+
+
+def test_pipeline_leaves_out_answers_that_keep_failing():
+    def respond(prompt):
+        return "not json at all" if "service 2." in prompt else json.dumps(SCORE)
+
+    model = FakeModel(respond)
+    pipeline = pipeline_for(model)
+    answers = make_answers(3)
+    pipeline.submit_many(answers)
+    results = pipeline.results(timeout=10)
+    # The failed answer is missing rather than averaged away, so callers can see the gap
+    assert set(results) == {"question1", "question3"}
+    assert sum("service 2." in call["prompt"] for call in model.calls) == 2
+
+
+def test_pipeline_retries_a_failed_answer_once():
+    attempts = Counter()
+
+    def respond(prompt):
+        attempts[prompt] += 1
+        if "service 2." in prompt and attempts[prompt] == 1:
+            raise RuntimeError("model unavailable")
+        return json.dumps(SCORE)
+
+    pipeline = pipeline_for(FakeModel(respond))
+    answers = make_answers(3)
+    pipeline.submit_many(answers)
+    assert set(pipeline.results(timeout=10)) == set(answers)
+
+
+def test_pipeline_completed_only_reports_valid_scores():
+    def respond(prompt):
+        return "{}" if "service 1." in prompt else json.dumps(SCORE)
+
+    pipeline = pipeline_for(FakeModel(respond))
+    pipeline.submit_many(make_answers(2))
+    pipeline.results(timeout=10, retry_failed=False)
+    assert set(pipeline.completed()) == {"question2"}
+
+
+def test_pipeline_prescreens_junk_answers_without_the_model():
+    model = FakeModel(json.dumps(SCORE))
+    pipeline = pipeline_for(model, prescreen=True)
+    answers = make_answers(2)
+    answers["question2"]["answer"] = "idk"
+    pipeline.submit_many(answers)
+    results = pipeline.results(timeout=10)
+    assert results["question2"]["prescreen"] == NO_ANSWER
+    assert all(score == 0 for score in results["question2"]["category_scores"].values())
+    assert len(model.calls) == 1
+
+    evaluation = aggregate_scores(results, answers)
+    assert evaluation["category_scores"]["communication"] == 8  # (15 + 0) / 2, rounded
+    assert evaluation["detailed_feedback"].startswith("1 of 2 answers")
+
+
+def test_pipeline_resubmitting_replaces_the_answer():
+    pipeline = pipeline_for(FakeModel(json.dumps(SCORE)))
+    answers = make_answers(1)
+    pipeline.submit("question1", answers["question1"])
+    pipeline.submit("question1", dict(answers["question1"], answer="A longer, revised answer about sharding."))
+    assert list(pipeline.results(timeout=10)) == ["question1"]
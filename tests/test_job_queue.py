@@ -0,0 +1,76 @@
+import pytest
+
+from utils.job_queue import DONE, FAILED, QUEUED, RUNNING, JobFailed, JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(str(tmp_path / "jobs.sqlite3"), lease=60, max_attempts=2)
+
+
+def test_claim_returns_jobs_in_submission_order(queue):
+    first = queue.submit("resume_analysis", {"text": "a"})
+    second = queue.submit("resume_analysis", {"text": "b"})
+    assert queue.claim("worker-1")["id"] == first
+    assert queue.claim("worker-2") == {"id": second, "kind": "resume_analysis", "payload": {"text": "b"}}
+    assert queue.claim("worker-3") is None
+
+
+def test_claim_filters_by_kind(queue):
+    queue.submit("resume_analysis", {"text": "a"})
+    scoring = queue.submit("evaluate_answer", {"answer": "b"})
+    assert queue.claim("worker-1", kinds=["evaluate_answer"])["id"] == scoring
+    assert queue.claim("worker-1", kinds=["evaluate_answer"]) is None
+
+
+def test_identical_pending_jobs_are_shared(queue):
+    job_id = queue.submit("resume_analysis", {"text": "a", "n": 1})
+    assert queue.submit("resume_analysis", {"n": 1, "text": "a"}) == job_id
+    queue.claim("worker-1")
+    assert queue.submit("resume_analysis", {"text": "a", "n": 1}) == job_id
+    queue.complete(job_id, {"ok": True})
+    assert queue.submit("resume_analysis", {"text": "a", "n": 1}) != job_id
+
+
+def test_complete_and_fail_are_visible_to_waiters(queue):
+    done = queue.submit("resume_analysis", {"text": "a"})
+    failed = queue.submit("resume_analysis", {"text": "b"})
+    queue.claim("worker-1")
+    queue.claim("worker-1")
+    queue.complete(done, {"primary_skills": ["Python"]}, warnings=["used the local analysis"])
+    queue.fail(failed, "model unavailable")
+
+    job = queue.wait(done, timeout=1)
+    assert job["status"] == DONE and job["result"] == {"primary_skills": ["Python"]}
+    assert job["warnings"] == ["used the local analysis"]
+    with pytest.raises(JobFailed, match="model unavailable"):
+        queue.wait(failed, timeout=1)
+
+
+def test_wait_times_out_without_a_worker(queue):
+    job_id = queue.submit("resume_analysis", {"text": "a"})
+    with pytest.raises(TimeoutError):
+        queue.wait(job_id, timeout=0.05, poll_interval=0.01)
+
+
+def test_stale_jobs_are_requeued_then_failed(queue):
+    queue.lease = 0
+    job_id = queue.submit("resume_analysis", {"text": "a"})
+
+    queue.claim("lost-worker")
+    assert queue.requeue_stale() == 1
+    assert queue.status(job_id)["status"] == QUEUED
+
+    queue.claim("lost-worker")
+    assert queue.stats()[RUNNING] == 1
+    assert queue.requeue_stale() == 0
+    assert queue.status(job_id)["status"] == FAILED
+
+
+def test_purge_keeps_recent_results(queue):
+    job_id = queue.submit("resume_analysis", {"text": "a"})
+    queue.claim("worker-1")
+    queue.complete(job_id, {})
+    assert queue.purge() == 0
+    assert queue.purge(max_age=-1) == 1
+    assert queue.status(job_id) is None
@@ -0,0 +1,114 @@
+import json
+
+import pytest
+
+from Agents.agent import Agents
+from Agents.fake import FakeModel, FakeRegistry, SimulatedModel
+from utils.json_parser import EVALUATION_SCHEMA, JSONResponseError, parse_json_response
+from utils.json_stream import IncrementalJSONParser
+
+EVALUATION = {
+    "overall_score": 70,
+    "category_scores": {"technical_accuracy": 14, "knowledge_depth": 14, "problem_solving": 14,
+                        "communication": 14, "experience_relevance": 14},
+    "strengths": ["Clear structure"],
+    "areas_for_improvement": ["More depth"],
+    "detailed_feedback": "Solid answers overall.",
+}
+
+
+def feed_in_chunks(parser, text, size):
+    members = []
+    for i in range(0, len(text), size):
+        members.extend(parser.feed(text[i:i + size]))
+    return members
+
+
+@pytest.mark.parametrize("size", [1, 7, 1000])
+def test_parser_emits_every_member_in_order(size):
+    parser = IncrementalJSONParser()
+    members = feed_in_chunks(parser, "```json\n" + json.dumps(EVALUATION) + "\n```", size)
+    assert [key for key, _ in members] == list(EVALUATION)
+    assert parser.done and not parser.failed
+    assert parser.result() == EVALUATION
+
+
+def test_parser_emits_nested_value_before_the_next_member():
+    parser = IncrementalJSONParser()
+    members = parser.feed('{"category_scores": {"communication": 12}')
+    assert members == [("category_scores", {"communication": 12})]
+    assert not parser.done
+
+
+def test_parser_ignores_braces_inside_strings():
+    parser = IncrementalJSONParser()
+    members = parser.feed('{"detailed_feedback": "use {} and [, ]", "overall_score": 1}')
+    assert dict(members) == {"detailed_feedback": "use {} and [, ]", "overall_score": 1}
+
+
+def test_parser_keeps_malformed_members_for_repair():
+    parser = IncrementalJSONParser()
+    members = parser.feed('{"overall_score": 70, "detailed_feedback": "line one\nline two", "strengths": []}')
+    assert dict(members) == {"overall_score": 70, "strengths": []}
+    assert parser.done
+    assert parser.failed == ['"detailed_feedback": "line one\nline two"']
+
+
+def test_parse_json_response_repairs_prose_and_fences():
+    text = "Sure! Here it is:\n```json\n" + json.dumps(EVALUATION) + "\n```\nAnything else?"
+    assert parse_json_response(text, EVALUATION_SCHEMA) == EVALUATION
+
+
+def test_parse_json_response_rejects_text_without_json():
+    with pytest.raises(JSONResponseError):
+        parse_json_response("I'm sorry, but I can't provide that in JSON format.")
+
+
+def stream(model, streaming=True):
+    agents = Agents(FakeRegistry(model), streaming=streaming, structured=False, fallback_models=[])
+    return list(agents.stream_json("Evaluate the candidate's responses", task="evaluation",
+                                   schema=EVALUATION_SCHEMA))
+
+
+def test_stream_json_yields_members_once():
+    members = stream(FakeModel(json.dumps(EVALUATION), chunk_size=5))
+    assert [key for key, _ in members] == list(EVALUATION)
+    assert dict(members) == EVALUATION
+
+
+def test_stream_json_repairs_a_member_that_failed_to_parse():
+    # A raw newline inside a string: the member can't be parsed on its own
+    text = json.dumps(EVALUATION).replace("Solid answers overall.", "Solid answers\noverall.")
+    members = stream(FakeModel(text, chunk_size=8))
+    assert [key for key, _ in members].count("detailed_feedback") == 1
+    assert dict(members)["detailed_feedback"] == "Solid answers\noverall."
+    assert set(dict(members)) == set(EVALUATION)
+
+
+class BrokenStreamModel(FakeModel):
+    """Drops the connection after the first chunk of a streamed response."""
+    def _stream(self, text, latency):
+        yield from list(super()._stream(text, latency))[:1]
+        raise ConnectionError("stream reset")
+
+
+def test_stream_json_falls_back_to_a_blocking_call_mid_stream():
+    model = BrokenStreamModel(json.dumps(EVALUATION), chunk_size=40)
+    members = stream(model)
+    assert [key for key, _ in members] == list(EVALUATION)
+    assert dict(members) == EVALUATION
+    assert [call["stream"] for call in model.calls] == [True, False]
+
+
+def test_stream_json_handles_simulated_malformed_responses():
+    # Prose-wrapped responses are repaired; refusals and truncations raise
+    outcomes = set()
+    for seed in range(20):
+        try:
+            members = stream(SimulatedModel(malformed_rate=1.0, seed=seed), streaming=False)
+        except JSONResponseError:
+            outcomes.add("error")
+        else:
+            assert isinstance(dict(members)["overall_score"], (int, float))
+            outcomes.add("repaired")
+    assert outcomes == {"error", "repaired"}
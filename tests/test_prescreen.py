@@ -0,0 +1,52 @@
+import pytest
+
+from utils.prescreen import COPY, GIBBERISH, NO_ANSWER, screen_answers, strip_screened_answers
+
+QUESTION = {"question": "How would you find duplicate values in a large array?", "type": "problem",
+            "focus_area": "algorithms"}
+
+
+@pytest.mark.parametrize("answer, verdict", [
+    ("", NO_ANSWER),
+    ("   ", NO_ANSWER),
+    ("idk", NO_ANSWER),
+    ("I don't know.", NO_ANSWER),
+    ("How would you find duplicate values in a large array?", COPY),
+    ("find duplicate values in a large array", COPY),
+    ("asdkjh sdfkjhsdf qwrtplk zxcvbnm", GIBBERISH),
+    ("aaaa aaaa aaaa aaaa", GIBBERISH),
+    ("blah blah blah blah blah blah blah blah blah", GIBBERISH),
+])
+def test_junk_answers_are_screened_out(answer, verdict):
+    assert screen_answers({"question1": dict(QUESTION, answer=answer)}) == {"question1": verdict}
+
+
+@pytest.mark.parametrize("answer", [
+    "Use a hash map",
+    "Dijkstra algorithm",
+    "Sort then scan, O(n log n); or a HashSet for O(n) with more RAM",
+    "h[k] = h.get(k, []) + [v]",
+    "To find duplicate values in a large array I would sort it and compare neighbours",
+    "用哈希集合记录已经见过的值，再次出现的就是重复值。",
+    "Храню увиденные значения в хеш-таблице; если значение уже там, это дубликат.",
+])
+def test_real_answers_go_to_the_model(answer):
+    assert screen_answers({"question1": dict(QUESTION, answer=answer)}) == {}
+
+
+def test_a_batch_gets_one_verdict_per_screened_answer():
+    answers = {
+        "question1": dict(QUESTION, answer="Keep a set of seen values while streaming the array once."),
+        "question2": dict(QUESTION, answer="no idea"),
+        "question3": dict(QUESTION, answer="qwrtplk zxcvbnm sdfkjh"),
+    }
+    assert screen_answers(answers) == {"question2": NO_ANSWER, "question3": GIBBERISH}
+    assert screen_answers({}) == {}
+
+
+def test_stripped_answers_keep_the_question_but_not_the_junk():
+    answers = {"question1": dict(QUESTION, answer="asdkjh sdfkjhsdf qwrtplk zxcvbnm")}
+    stripped = strip_screened_answers(answers)["question1"]
+    assert stripped["answer"] == "" and stripped["question"] == QUESTION["question"]
+    assert stripped["prescreen"]
+    assert answers["question1"]["answer"]  # The input is not modified
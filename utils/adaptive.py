@@ -0,0 +1,112 @@
+"""
+Adaptive assessment: question order and early stopping from running scores.
+
+Each scored answer is reduced to a 0-100 total (the sum of its category
+scores). After every answer the policy puts a confidence interval around
+the candidate's mean; once it lies entirely above the pass score or below
+the fail score the assessment stops. While it continues, the next question
+is the unasked one whose difficulty best matches the scores so far.
+"""
+import math
+import os
+from statistics import NormalDist
+
+from utils.common import question_number
+from utils.evaluation import CATEGORIES, is_valid_answer_score
+from utils.resume import TYPE_DIFFICULTY
+
+ADAPTIVE = os.getenv("INTERVIEWMATE_ADAPTIVE", "0") == "1"
+MIN_QUESTIONS = int(os.getenv("INTERVIEWMATE_MIN_QUESTIONS", "4"))
+MAX_QUESTIONS = int(os.getenv("INTERVIEWMATE_MAX_QUESTIONS", "10"))
+PASS_SCORE = float(os.getenv("INTERVIEWMATE_PASS_SCORE", "75"))
+FAIL_SCORE = float(os.getenv("INTERVIEWMATE_FAIL_SCORE", "45"))
+STOP_CONFIDENCE = float(os.getenv("INTERVIEWMATE_STOP_CONFIDENCE", "0.9"))
+
+# Expected spread of one candidate's answer totals; keeps a few lucky
+# answers with nearly equal scores from looking like certainty
+PRIOR_SD = 15.0
+PRIOR_WEIGHT = 3
+
+CONTINUE, PASS, FAIL, COMPLETE = "continue", "pass", "fail", "complete"
+
+
+def answer_total(result):
+    """0-100 total of one per-answer score."""
+    return sum(max(0, min(20, result["category_scores"][category])) for category in CATEGORIES)
+
+
+def question_difficulty(question_key, question_data):
+    """Difficulty 1-10 of a question: its own, by type, or by its place in the set."""
+    if isinstance(question_data, dict):
+        if question_data.get("difficulty"):
+            return float(question_data["difficulty"])
+        if question_data.get("type") in TYPE_DIFFICULTY:
+            return float(TYPE_DIFFICULTY[question_data["type"]])
+    return float(min(10, max(1, question_number(question_key))))
+
+
+class AssessmentPolicy:
+    """
+    Decides which question comes next and when the assessment ends.
+
+    With ``adaptive=False`` questions are asked in order until
+    ``max_questions`` (or the set) runs out, as before.
+    """
+    def __init__(self, adaptive=ADAPTIVE, min_questions=MIN_QUESTIONS, max_questions=MAX_QUESTIONS,
+                 pass_score=PASS_SCORE, fail_score=FAIL_SCORE, confidence=STOP_CONFIDENCE):
+        self.adaptive = adaptive
+        self.min_questions = min_questions
+        self.max_questions = max_questions
+        self.pass_score = pass_score
+        self.fail_score = fail_score
+        self.z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    def question_limit(self, questions, planned=None):
+        """Questions to ask at most; ``planned`` is the set size while it is still being generated."""
+        return min(self.max_questions, planned or len(questions or {}))
+
+    def interval(self, totals):
+        """``(low, high)`` confidence bounds on the mean answer total."""
+        count = len(totals)
+        mean = sum(totals) / count
+        squares = sum((total - mean) ** 2 for total in totals)
+        sd = math.sqrt((PRIOR_SD ** 2 * PRIOR_WEIGHT + squares) / (PRIOR_WEIGHT + count - 1))
+        margin = self.z * sd / math.sqrt(count)
+        return mean - margin, mean + margin
+
+    def decide(self, questions, answered, scores, planned=None):
+        """
+        Return ``CONTINUE``, ``PASS``/``FAIL`` (stopped early) or ``COMPLETE``
+        given the answered question keys and the valid scores so far.
+        """
+        limit = self.question_limit(questions, planned)
+        if len(answered) >= limit:
+            return COMPLETE
+        totals = [answer_total(result) for result in scores.values() if is_valid_answer_score(result)]
+        if not self.adaptive or len(answered) < self.min_questions or len(totals) < self.min_questions:
+            return CONTINUE
+        low, high = self.interval(totals)
+        if low >= self.pass_score:
+            return PASS
+        if high <= self.fail_score:
+            return FAIL
+        return CONTINUE
+
+    def target_difficulty(self, scores):
+        """Difficulty to aim for next: harder for strong answers, easier for weak ones."""
+        totals = [answer_total(result) for result in scores.values() if is_valid_answer_score(result)]
+        if not totals:
+            return 5.0
+        midpoint = (self.pass_score + self.fail_score) / 2
+        return max(1.0, min(10.0, 5.0 + (sum(totals) / len(totals) - midpoint) / 6))
+
+    def next_question(self, questions, answered, scores):
+        """Key of the next question to ask, or ``None`` if none is left."""
+        remaining = [key for key in questions if key not in answered]
+        if not remaining:
+            return None
+        if not self.adaptive:
+            return min(remaining, key=question_number)
+        target = self.target_difficulty(scores)
+        return min(remaining, key=lambda key: (abs(question_difficulty(key, questions[key]) - target),
+                                               question_number(key)))
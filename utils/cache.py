@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from utils import telemetry
+
+DEFAULT_CACHE_DIR = os.getenv(
+    "INTERVIEWMATE_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".interviewmate")
+)
+DEFAULT_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIR, "cache.sqlite3")
+
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_AGE_SECONDS = 30 * 24 * 60 * 60
+
+
+def content_key(*parts):
+    """Build a content-addressed key from strings and/or raw bytes."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    SQLite-backed JSON cache for one namespace with LRU size and age eviction.
+
+    Hit and miss counters are stored alongside the entries so they add up
+    across Streamlit sessions and worker processes.
+    """
+    def __init__(self, namespace, path=DEFAULT_CACHE_PATH, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_bytes=DEFAULT_MAX_BYTES, max_age=DEFAULT_MAX_AGE_SECONDS):
+        self.namespace = namespace
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_stats (
+                    namespace TEXT PRIMARY KEY,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    misses INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+    def get(self, key):
+        """Return the cached value for ``key`` or ``None`` on a miss."""
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            ).fetchone()
+            if row and self.max_age is not None and now - row[1] > self.max_age:
+                self._conn.execute(
+                    "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                    (self.namespace, key),
+                )
+                row = None
+
+            if row:
+                self._conn.execute(
+                    "UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?",
+                    (now, self.namespace, key),
+                )
+            self._count("hits" if row else "misses")
+        telemetry.record_cache(self.namespace, row is not None)
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, value):
+        """Store a JSON-serialisable value and evict entries over the limits."""
+        payload = json.dumps(value, separators=(",", ":"))
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, payload, len(payload), now, now),
+            )
+            self._evict(now)
+
+    def delete(self, key):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND key = ?",
+                (self.namespace, key),
+            )
+
+    def stats(self):
+        """Return hit/miss counters and current size for this namespace."""
+        with self._lock:
+            counters = self._conn.execute(
+                "SELECT hits, misses FROM cache_stats WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone() or (0, 0)
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?",
+                (self.namespace,),
+            ).fetchone()
+        hits, misses = counters
+        lookups = hits + misses
+        return {
+            "namespace": self.namespace,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def _count(self, column):
+        self._conn.execute(
+            "INSERT OR IGNORE INTO cache_stats (namespace) VALUES (?)", (self.namespace,)
+        )
+        self._conn.execute(
+            f"UPDATE cache_stats SET {column} = {column} + 1 WHERE namespace = ?",
+            (self.namespace,),
+        )
+
+    def _evict(self, now):
+        if self.max_age is not None:
+            self._conn.execute(
+                "DELETE FROM cache_entries WHERE namespace = ? AND created_at < ?",
+                (self.namespace, now - self.max_age),
+            )
+
+        entries, size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries WHERE namespace = ?",
+            (self.namespace,),
+        ).fetchone()
+        if entries <= self.max_entries and size <= self.max_bytes:
+            return
+
+        # Drop least recently used entries until both limits are satisfied
+        rows = self._conn.execute(
+            "SELECT key, size FROM cache_entries WHERE namespace = ? ORDER BY accessed_at",
+            (self.namespace,),
+        ).fetchall()
+        evicted = []
+        for key, entry_size in rows:
+            if entries <= self.max_entries and size <= self.max_bytes:
+                break
+            evicted.append((self.namespace, key))
+            entries -= 1
+            size -= entry_size
+        self._conn.executemany(
+            "DELETE FROM cache_entries WHERE namespace = ? AND key = ?", evicted
+        )
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(namespace, **kwargs):
+    """Return the process-wide ``DiskCache`` for ``namespace``."""
+    with _caches_lock:
+        if namespace not in _caches:
+            _caches[namespace] = DiskCache(namespace, **kwargs)
+        return _caches[namespace]
+
+
+if __name__ == "__main__":
+    # python -m utils.cache [namespace ...] prints hit/miss counters
+    if not os.path.exists(DEFAULT_CACHE_PATH):
+        sys.exit(f"No cache found at {DEFAULT_CACHE_PATH}")
+    conn = sqlite3.connect(DEFAULT_CACHE_PATH)
+    namespaces = sys.argv[1:] or [
+        row[0] for row in conn.execute("SELECT namespace FROM cache_stats ORDER BY namespace")
+    ]
+    conn.close()
+    for name in namespaces:
+        stats = get_cache(name).stats()
+        print(f"{name}: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%} hit rate), {stats['entries']} entries, "
+              f"{stats['bytes']} bytes")
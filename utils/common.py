@@ -1,3 +1,14 @@
+import re
+
+from utils.prompt_budget import compact_resume_text, fit_answer
+
+
+def question_number(question_key):
+    """Place of a question in its set, from its key (``question7`` -> 7); 0 if it has none."""
+    digits = re.sub(r"\D", "", question_key)
+    return int(digits) if digits else 0
+
+
 
 
 def question_generation_prompt(data):
@@ -57,3 +68,143 @@ return the response in valid JSON format without any markdown or additional prea
 """
     return prompt
 
+
+
+def answer_evaluation_prompt(resume_context, answer):
+    # Only a very long answer is cut; the rubric, background and question stay whole
+    answer = fit_answer(answer, resume_context)
+    prompt = f"""
+You are a strict technical interviewer scoring ONE answer from a candidate's technical assessment.
+
+Score the answer on each criterion from 0 to 20:
+  - technical_accuracy: 20 perfect and detailed, 10 some errors but general understanding, 0 incorrect or irrelevant
+  - knowledge_depth: 20 advanced concepts, 10 basic understanding only, 0 no real understanding
+  - problem_solving: 20 clear structured approach, 10 basic structure, 0 no clear method
+  - communication: 20 exceptionally clear and concise, 10 somewhat clear, 0 incomprehensible
+  - experience_relevance: 20 exceeds the candidate's stated experience, 10 slightly below, 0 mismatched
+
+Vague or generic answers should never score above 10 in any category.
+
+Candidate background:
+{resume_context}
+
+Question ({answer.get('type', 'general')}, focus: {answer.get('focus_area', 'general')}):
+{answer.get('question', '')}
+
+Candidate answer:
+{answer.get('answer', '')}
+
+Return ONLY this JSON object with no surrounding text, code blocks, or markdown:
+{{
+  "category_scores": {{
+    "technical_accuracy": 0,
+    "knowledge_depth": 0,
+    "problem_solving": 0,
+    "communication": 0,
+    "experience_relevance": 0
+  }},
+  "strengths": ["string"],
+  "areas_for_improvement": ["string"],
+  "feedback": "one or two sentences"
+}}
+"""
+    return prompt
+
+
+def resume_analysis_prompt(resume_text):
+    resume_text = compact_resume_text(resume_text, task="resume_analysis.resume_text")
+    prompt = f"""
+    Analyze the following resume to extract key technical information and generate a structured summary:
+    {resume_text}
+
+    Focus on:
+    1. Technical skills and proficiency levels
+    2. Years of experience with each technology
+    3. Project highlights and technical achievements
+    4. Technical roles and responsibilities
+    5. Areas that need clarification or more detail
+
+    Provide analysis in JSON format with these keys:
+    - primary_skills
+    - experience_summary
+    - key_projects
+    - areas_for_clarification
+    - suggested_question_topics
+    
+    Return ONLY the JSON object with no surrounding text, code blocks, or markdown.
+    """
+    return prompt
+
+
+def technical_questions_prompt(position, skills, projects, experience, suggested_topics):
+    # Ensure there are enough skills to avoid out-of-range errors
+    skill_1 = skills[0] if len(skills) > 0 else "a relevant skill"
+    skill_2 = skills[1] if len(skills) > 1 else "another relevant skill"
+
+    # Prompt with safe skill placeholders
+    prompt = f"""
+    You are a technical interviewer. Generate **10 UNIQUE and DIVERSE** interview questions for a candidate.
+
+    **Candidate Resume Details:**
+    - **Position Applied:** {position}
+    - **Skills:** {', '.join(skills) if skills else 'Not specified'}
+    - **Projects:** {', '.join(projects) if projects else 'Not specified'}
+    - **Experience Summary:** {experience}
+    - **Suggested Topics:** {', '.join(suggested_topics) if suggested_topics else 'Not specified'}
+
+    **STRICT RULES FOR QUESTION DIVERSITY:**
+    - **2 questions about past projects** (real-world challenges).
+    - **3 questions about primary technical skills** (deep-dive into hands-on experience).
+    - **2 system design or architecture questions** (scalability and performance).
+    - **3 problem-solving or algorithm-based questions** (require explanations).
+    - **Each question must be unique.**
+    - **Ensure the difficulty level increases from Question 1 to 10.**
+    
+    **Examples of Unique Questions (DO NOT COPY, FOLLOW THIS PATTERN):**
+    1. **(Project-Based)** "Can you describe a challenging problem you faced in {projects[0] if projects else 'one of your projects'} and how you solved it?"
+    2. **(Skill-Based)** "How does {skill_1} compare to {skill_2} in terms of performance and scalability?"
+    3. **(System Design)** "How would you design a fault-tolerant system for a {position} role?"
+    
+    **Output JSON Format (STRICTLY JSON ONLY, NO EXTRA TEXT):**
+    {{
+        "question1": {{ "question": "...", "type": "project/skill/design/problem", "focus_area": "specific skill or project" }},
+        ...
+        "question10": {{ "question": "...", "type": "project/skill/design/problem", "focus_area": "specific skill or project" }}
+    }}
+    """
+    return prompt
+
+
+def additional_questions_prompt(position, skills, projects, experience, type_counts, existing_questions):
+    # Only the questions the bank couldn't supply, without repeating the ones it did
+    needed = "\n".join(
+        f"    - **{count} {question_type} question{'s' if count > 1 else ''}**"
+        for question_type, count in type_counts.items() if count > 0
+    )
+    existing = "\n".join(f"    - {question}" for question in existing_questions) or "    - (none)"
+    total = sum(type_counts.values())
+    prompt = f"""
+    You are a technical interviewer completing a set of interview questions for a candidate.
+
+    **Candidate Resume Details:**
+    - **Position Applied:** {position}
+    - **Skills:** {', '.join(skills) if skills else 'Not specified'}
+    - **Projects:** {', '.join(projects) if projects else 'Not specified'}
+    - **Experience Summary:** {experience}
+
+    **Generate exactly {total} new questions:**
+{needed}
+
+    Types: "project" = real-world challenges in the candidate's past projects, "skill" = deep-dive into a
+    primary skill, "design" = system design or architecture, "problem" = problem-solving or algorithms.
+
+    **The set already contains these questions; do not repeat or rephrase them:**
+{existing}
+
+    **Output JSON Format (STRICTLY JSON ONLY, NO EXTRA TEXT), in order of increasing difficulty:**
+    {{
+        "question1": {{ "question": "...", "type": "project/skill/design/problem", "focus_area": "specific skill or project" }},
+        ...
+    }}
+    """
+    return prompt
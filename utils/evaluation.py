@@ -0,0 +1,281 @@
+import json
+import os
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+
+from utils.cache import content_key, get_cache
+from utils.common import question_number
+from utils.prescreen import FEEDBACK, PRESCREEN, screen_answers
+
+CATEGORIES = [
+    "technical_accuracy",
+    "knowledge_depth",
+    "problem_solving",
+    "communication",
+    "experience_relevance",
+]
+
+# Bump whenever a scoring prompt or rubric changes so stale evaluations are not reused
+EVALUATION_RUBRIC_VERSION = "1"
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    # One pool per process, shared by every Streamlit session
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("INTERVIEWMATE_EVALUATION_WORKERS", "8")),
+                thread_name_prefix="answer-evaluation",
+            )
+        return _executor
+
+
+def is_valid_answer_score(result):
+    """Check that a per-answer result carries a numeric score for every category."""
+    if not isinstance(result, dict) or "error" in result:
+        return False
+    scores = result.get("category_scores")
+    if not isinstance(scores, dict):
+        return False
+    return all(isinstance(scores.get(category), (int, float)) for category in CATEGORIES)
+
+
+def prescreen_score(verdict):
+    """The deterministic score given to an answer the pre-screen ruled out."""
+    return {
+        "category_scores": {category: 0 for category in CATEGORIES},
+        "strengths": [],
+        "areas_for_improvement": ["Answer the question with a concrete explanation"],
+        "feedback": f"{FEEDBACK[verdict]} (Scored without model review.)",
+        "prescreen": verdict,
+    }
+
+
+def is_valid_evaluation(result):
+    """Check that a final evaluation has an overall score and every category score."""
+    return (isinstance(result, dict) and isinstance(result.get("overall_score"), (int, float))
+            and is_valid_answer_score(result))
+
+
+def evaluation_key(kind, resume_analysis, answers):
+    """
+    Content hash of an evaluation request: the same analysis and answers
+    give the same key regardless of dict order or session.
+    """
+    def canonical(value):
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return content_key(kind, EVALUATION_RUBRIC_VERSION, canonical(resume_analysis), canonical(answers))
+
+
+class SingleFlight:
+    """Runs one call per key at a time; concurrent callers with the same key share its result."""
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class EvaluationCache:
+    """
+    Idempotent evaluations: results are stored by ``evaluation_key`` in
+    ``cache`` (a ``DiskCache``, or ``None`` to only coalesce) and identical
+    requests in flight at the same time share one model call.
+    """
+    def __init__(self, cache=None):
+        self.cache = cache
+        self._flight = SingleFlight()
+
+    def get(self, key):
+        return self.cache.get(key) if self.cache is not None else None
+
+    def get_or_compute(self, key, compute, cacheable=is_valid_answer_score):
+        """
+        Return the stored result for ``key`` or run ``compute()`` once for
+        every concurrent caller. Only results passing ``cacheable`` are
+        stored, so errors and partial results are retried next time.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        def run():
+            # A caller that finished just before us may have stored it already
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+            result = compute()
+            if self.cache is not None and cacheable(result):
+                try:
+                    self.cache.set(key, result)
+                except Exception as e:
+                    print(f"Could not cache evaluation: {str(e)}")
+            return result
+
+        return self._flight.do(key, run)
+
+
+_evaluation_cache = None
+_evaluation_cache_lock = threading.Lock()
+
+
+def get_evaluation_cache():
+    """
+    Return the process-wide ``EvaluationCache``; with
+    ``INTERVIEWMATE_EVALUATION_CACHE=0`` results are not stored, but
+    identical requests in flight are still coalesced.
+    """
+    global _evaluation_cache
+    with _evaluation_cache_lock:
+        if _evaluation_cache is None:
+            enabled = os.getenv("INTERVIEWMATE_EVALUATION_CACHE", "1") != "0"
+            _evaluation_cache = EvaluationCache(get_cache("evaluation") if enabled else None)
+        return _evaluation_cache
+
+
+class AnswerEvaluationPipeline:
+    """
+    Scores answers in the background as soon as they are submitted.
+
+    ``score_answer`` is called as ``score_answer(resume_analysis, answer)``
+    and should return a dict with ``category_scores``, ``strengths``,
+    ``areas_for_improvement`` and ``feedback``. With ``prescreen`` on,
+    empty, copied or unreadable answers are scored locally instead.
+    """
+    def __init__(self, score_answer, resume_analysis, prescreen=PRESCREEN):
+        self.score_answer = score_answer
+        self.resume_analysis = resume_analysis
+        self.prescreen = prescreen
+        self._futures = {}
+        self._answers = {}
+        self._lock = threading.Lock()
+
+    def submit(self, question_key, answer):
+        """Start scoring ``answer``; resubmitting a question replaces its job."""
+        self.submit_many({question_key: answer})
+
+    def submit_many(self, answers):
+        """Start scoring several answers, pre-screening them in one pass."""
+        verdicts = screen_answers(answers) if self.prescreen else {}
+        with self._lock:
+            for question_key, answer in answers.items():
+                previous = self._futures.get(question_key)
+                if previous is not None:
+                    previous.cancel()
+                self._answers[question_key] = answer
+                if question_key in verdicts:
+                    future = self._futures[question_key] = Future()
+                    future.set_result(prescreen_score(verdicts[question_key]))
+                else:
+                    self._futures[question_key] = _get_executor().submit(
+                        self.score_answer, self.resume_analysis, answer
+                    )
+
+    def preload(self, question_key, answer, result):
+        """Add an answer that was already scored, e.g. in a restored session."""
+        future = Future()
+        future.set_result(result)
+        with self._lock:
+            self._answers[question_key] = answer
+            self._futures[question_key] = future
+
+    def completed(self):
+        """Valid scores of the jobs that have finished so far, without waiting."""
+        with self._lock:
+            futures = dict(self._futures)
+        results = {}
+        for question_key, future in futures.items():
+            if future.done() and not future.cancelled() and future.exception() is None:
+                if is_valid_answer_score(future.result()):
+                    results[question_key] = future.result()
+        return results
+
+    def results(self, timeout=None, retry_failed=True):
+        """
+        Wait for every submitted answer and return the valid per-question
+        scores keyed by question. Failed jobs are retried once inline.
+        """
+        with self._lock:
+            futures = dict(self._futures)
+        wait(futures.values(), timeout=timeout)
+
+        results = {}
+        for question_key, future in futures.items():
+            result = None
+            if future.done() and not future.cancelled():
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"Error scoring {question_key}: {str(e)}")
+            if not is_valid_answer_score(result) and retry_failed:
+                try:
+                    result = self.score_answer(self.resume_analysis, self._answers[question_key])
+                except Exception as e:
+                    print(f"Error scoring {question_key}: {str(e)}")
+            if is_valid_answer_score(result):
+                results[question_key] = result
+        return results
+
+
+def aggregate_scores(per_question, answers=None, max_items=5):
+    """Combine per-question scores into the final evaluation structure."""
+    if not per_question:
+        return None
+
+    category_scores = {}
+    for category in CATEGORIES:
+        values = [max(0, min(20, result["category_scores"][category]))
+                  for result in per_question.values()]
+        category_scores[category] = round(sum(values) / len(values))
+
+    def most_common(field):
+        counts = Counter()
+        for result in per_question.values():
+            for item in result.get(field) or []:
+                counts[str(item).strip()] += 1
+        return [item for item, _ in counts.most_common(max_items) if item]
+
+    feedback_lines = []
+    for question_key in sorted(per_question, key=question_number):
+        feedback = per_question[question_key].get("feedback")
+        if not feedback:
+            continue
+        focus_area = (answers or {}).get(question_key, {}).get("focus_area")
+        label = f"Q{question_number(question_key)}" + (f" ({focus_area})" if focus_area else "")
+        feedback_lines.append(f"{label}: {feedback}")
+
+    screened = sum(1 for result in per_question.values() if result.get("prescreen"))
+    if screened:
+        feedback_lines.insert(0, f"{screened} of {len(per_question)} answers were empty, repeated the question "
+                                 f"or unreadable and scored 0 without model review.")
+
+    return {
+        "overall_score": sum(category_scores.values()),
+        "category_scores": category_scores,
+        "strengths": most_common("strengths"),
+        "areas_for_improvement": most_common("areas_for_improvement"),
+        "detailed_feedback": "\n\n".join(feedback_lines),
+    }
@@ -0,0 +1,222 @@
+"""
+SQLite-backed job queue between the Streamlit front end and worker processes.
+
+The front end submits model-bound jobs (resume analysis, question
+generation, answer scoring) and polls for their results; ``worker.py``
+processes claim queued jobs, run them and store the result. Because the
+queue is a file in the cache directory, any number of UI and worker
+processes on one machine can share it.
+"""
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from utils.cache import DEFAULT_CACHE_DIR, content_key
+
+DEFAULT_QUEUE_PATH = os.path.join(DEFAULT_CACHE_DIR, "jobs.sqlite3")
+
+# A running job not finished within this many seconds is assumed lost with its worker
+LEASE_SECONDS = float(os.getenv("INTERVIEWMATE_JOB_LEASE", "300"))
+JOB_TIMEOUT = float(os.getenv("INTERVIEWMATE_JOB_TIMEOUT", "180"))
+MAX_ATTEMPTS = 3
+# Finished jobs are kept this long so slow pollers can still collect them
+RESULT_TTL_SECONDS = 60 * 60
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class JobFailed(Exception):
+    """Raised while waiting on a job that failed in the worker."""
+
+
+class JobQueue:
+    """
+    Durable FIFO of JSON jobs with at-least-once delivery.
+
+    Jobs submitted with the same ``kind`` and payload while one is still
+    queued or running share that job instead of doing the work twice.
+    """
+    def __init__(self, path=DEFAULT_QUEUE_PATH, lease=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id INTEGER PRIMARY KEY,
+                    key TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    result TEXT,
+                    warnings TEXT,
+                    error TEXT,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_key ON jobs (key, status)")
+
+    def submit(self, kind, payload):
+        """Queue a job and return its id."""
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        key = content_key(kind, encoded)
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM jobs WHERE key = ? AND status IN (?, ?) ORDER BY id DESC LIMIT 1",
+                (key, QUEUED, RUNNING),
+            ).fetchone()
+            if row:
+                return row[0]
+            return self._conn.execute(
+                "INSERT INTO jobs (key, kind, payload, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, kind, encoded, QUEUED, time.time()),
+            ).lastrowid
+
+    def claim(self, worker, kinds=None):
+        """
+        Take the oldest queued job for ``worker`` and return
+        ``{"id", "kind", "payload"}``, or ``None`` if there is nothing to do.
+        """
+        query = "SELECT id, kind, payload FROM jobs WHERE status = ?"
+        params = [QUEUED]
+        if kinds:
+            query += f" AND kind IN ({', '.join('?' * len(kinds))})"
+            params.extend(kinds)
+        with self._lock, self._conn:
+            # IMMEDIATE takes the write lock up front so two workers can't claim the same row
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute(query + " ORDER BY id LIMIT 1", params).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, started_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (RUNNING, worker, time.time(), row[0]),
+            )
+        return {"id": row[0], "kind": row[1], "payload": json.loads(row[2])}
+
+    def complete(self, job_id, result, warnings=()):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, warnings = ?, finished_at = ? WHERE id = ?",
+                (DONE, json.dumps(result, separators=(",", ":")), json.dumps(list(warnings)), time.time(), job_id),
+            )
+
+    def fail(self, job_id, error):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (FAILED, str(error), time.time(), job_id),
+            )
+
+    def status(self, job_id):
+        """Return ``{"status", "result", "warnings", "error"}`` for a job, or ``None``."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, result, warnings, error FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        status, result, warnings, error = row
+        return {
+            "status": status,
+            "result": json.loads(result) if result is not None else None,
+            "warnings": json.loads(warnings) if warnings else [],
+            "error": error,
+        }
+
+    def wait(self, job_id, timeout=JOB_TIMEOUT, poll_interval=0.05, max_poll_interval=0.5):
+        """
+        Poll until a job finishes and return its status dict. Raises
+        ``JobFailed`` if the worker failed it and ``TimeoutError`` after
+        ``timeout`` seconds.
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            job = self.status(job_id)
+            if job is None:
+                raise JobFailed(f"Job {job_id} no longer exists")
+            if job["status"] == DONE:
+                return job
+            if job["status"] == FAILED:
+                raise JobFailed(job["error"] or f"Job {job_id} failed")
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Job {job_id} did not finish within {timeout:.0f}s; is worker.py running?")
+            time.sleep(poll_interval)
+            # Back off so long jobs don't keep the database busy
+            poll_interval = min(poll_interval * 1.5, max_poll_interval)
+
+    def run(self, kind, payload, timeout=JOB_TIMEOUT, on_error=print):
+        """Submit a job, wait for it and return its result; worker warnings go to ``on_error``."""
+        job = self.wait(self.submit(kind, payload), timeout=timeout)
+        for warning in job["warnings"]:
+            on_error(warning)
+        return job["result"]
+
+    def requeue_stale(self):
+        """
+        Put running jobs whose lease expired back in the queue, or fail them
+        after ``max_attempts``. Returns how many jobs were requeued.
+        """
+        cutoff = time.time() - self.lease
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+                "WHERE status = ? AND started_at < ? AND attempts >= ?",
+                (FAILED, "Worker lost the job too many times", time.time(), RUNNING, cutoff, self.max_attempts),
+            )
+            return self._conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL WHERE status = ? AND started_at < ?",
+                (QUEUED, RUNNING, cutoff),
+            ).rowcount
+
+    def purge(self, max_age=RESULT_TTL_SECONDS):
+        """Delete finished jobs older than ``max_age`` seconds."""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (DONE, FAILED, time.time() - max_age),
+            ).rowcount
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+        return {status: counts.get(status, 0) for status in (QUEUED, RUNNING, DONE, FAILED)}
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    """
+    Return the process-wide ``JobQueue`` when ``INTERVIEWMATE_JOB_QUEUE=1``,
+    otherwise ``None`` and model calls run inline.
+    """
+    global _queue
+    if os.getenv("INTERVIEWMATE_JOB_QUEUE", "0") != "1":
+        return None
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue(os.getenv("INTERVIEWMATE_JOB_QUEUE_PATH", DEFAULT_QUEUE_PATH))
+        return _queue
+
+
+if __name__ == "__main__":
+    # python -m utils.job_queue prints how many jobs are in each state
+    path = os.getenv("INTERVIEWMATE_JOB_QUEUE_PATH", DEFAULT_QUEUE_PATH)
+    if not os.path.exists(path):
+        sys.exit(f"No job queue found at {path}")
+    print(", ".join(f"{count} {status}" for status, count in JobQueue(path).stats().items()))
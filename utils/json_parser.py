@@ -0,0 +1,180 @@
+"""
+Shared parser for JSON returned by the model.
+
+``extract_json_object`` makes a single pass over the response: it skips
+markdown fences and prose, locates the outermost object, drops trailing
+commas, escapes raw newlines inside strings and closes anything left open
+by a truncated response. ``parse_json_response`` then validates the result
+against a per-call schema, repairing values where it can instead of
+asking the model again.
+"""
+import json
+
+REQUIRED = object()
+NUMBER = (int, float)
+
+RESUME_ANALYSIS_SCHEMA = {
+    "primary_skills": (list, REQUIRED),
+    "experience_summary": (str, ""),
+    "key_projects": (list, []),
+    "areas_for_clarification": (list, []),
+    "suggested_question_topics": (list, []),
+}
+
+EVALUATION_SCHEMA = {
+    "overall_score": (NUMBER, REQUIRED),
+    "category_scores": (dict, REQUIRED),
+    "strengths": (list, []),
+    "areas_for_improvement": (list, []),
+    "detailed_feedback": (str, ""),
+}
+
+ANSWER_SCORE_SCHEMA = {
+    "category_scores": (dict, REQUIRED),
+    "strengths": (list, []),
+    "areas_for_improvement": (list, []),
+    "feedback": (str, ""),
+}
+
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class JSONResponseError(ValueError):
+    """Raised when a response can't be turned into a valid JSON object."""
+
+
+def _object_start(text):
+    # Prose before a fence may contain braces of its own, so prefer the fence
+    fence = text.find("```")
+    if fence >= 0 and text.find("{", fence) >= 0:
+        return text.find("{", fence)
+    return text.find("{")
+
+
+def extract_json_object(text):
+    """
+    Return the outermost JSON object in ``text`` as a repaired string.
+
+    Raises ``JSONResponseError`` when the text contains no object at all.
+    """
+    start = _object_start(text)
+    if start < 0:
+        raise JSONResponseError("No JSON object found in response")
+
+    out = []
+    stack = []
+    in_string = False
+    escape = False
+    pending_comma = None  # Index in ``out`` of a comma that may be trailing
+
+    for char in text[start:]:
+        if in_string:
+            if escape:
+                escape = False
+            elif char == "\\":
+                escape = True
+            elif char == '"':
+                in_string = False
+            elif char == "\n":
+                char = "\\n"
+            elif char in "\r\t":
+                char = "\\r" if char == "\r" else "\\t"
+            out.append(char)
+            continue
+
+        if char in "}]":
+            if pending_comma is not None:
+                out[pending_comma] = ""
+            pending_comma = None
+            if not stack:
+                break
+            stack.pop()
+            out.append(char)
+            if not stack:
+                break
+            continue
+
+        if char == ",":
+            pending_comma = len(out)
+        elif not char.isspace():
+            pending_comma = None
+
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append(char)
+        out.append(char)
+
+    # Truncated response: close the open string and containers
+    if in_string:
+        if escape:
+            out.pop()
+        out.append('"')
+    if pending_comma is not None and stack:
+        out[pending_comma] = ""
+    out.extend(_CLOSERS[opener] for opener in reversed(stack))
+    return "".join(out)
+
+
+def _coerce(value, expected):
+    """Return ``value`` converted to ``expected`` or raise ``ValueError``."""
+    if isinstance(value, expected) and not (isinstance(value, bool) and expected is NUMBER):
+        return value
+    if expected is NUMBER and isinstance(value, str):
+        number = float(value.strip().split("/")[0])
+        return int(number) if number.is_integer() else number
+    if expected is list:
+        if isinstance(value, str):
+            return [value] if value.strip() else []
+        if isinstance(value, dict):
+            # e.g. {"languages": [...], "frameworks": [...]} -> one flat list
+            flat = []
+            for item in value.values():
+                flat.extend(item if isinstance(item, list) else [item])
+            return flat
+    if expected is str and isinstance(value, (list, NUMBER)):
+        return ", ".join(map(str, value)) if isinstance(value, list) else str(value)
+    raise ValueError(f"expected {getattr(expected, '__name__', 'number')}, got {type(value).__name__}")
+
+
+def validate_field(key, value, schema):
+    """Coerce a single member to its schema type; unknown keys pass through."""
+    if key not in schema or value is None:
+        return value
+    try:
+        return _coerce(value, schema[key][0])
+    except (TypeError, ValueError) as e:
+        raise JSONResponseError(f"Invalid field '{key}': {str(e)}")
+
+
+def validate_json(data, schema):
+    """Check ``data`` against ``schema``, filling defaults and coercing types."""
+    if not isinstance(data, dict):
+        raise JSONResponseError("Response is not a JSON object")
+    result = dict(data)
+    for key, (expected, default) in schema.items():
+        if key not in result or result[key] is None:
+            if default is REQUIRED:
+                raise JSONResponseError(f"Missing required field '{key}'")
+            result[key] = list(default) if isinstance(default, list) else default
+            continue
+        result[key] = validate_field(key, result[key], schema)
+    return result
+
+
+def parse_json_response(text, schema=None):
+    """Parse (and optionally validate) the JSON object in a model response."""
+    if text is None:
+        raise JSONResponseError("Empty response")
+    # Fast path for well-formed output; the repairing scan only runs on failure
+    start, end = _object_start(text), text.rfind("}") + 1
+    try:
+        data = json.loads(text[start:end]) if 0 <= start < end else None
+    except json.JSONDecodeError:
+        data = None
+    if data is None:
+        try:
+            data = json.loads(extract_json_object(text))
+        except json.JSONDecodeError as e:
+            raise JSONResponseError(f"Invalid JSON in response: {str(e)}")
+    return validate_json(data, schema) if schema else data
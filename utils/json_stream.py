@@ -0,0 +1,101 @@
+import json
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed JSON object.
+
+    Text is fed in arbitrary chunks; ``feed`` returns the top-level
+    ``(key, value)`` members of the outermost object that have been completed
+    since the previous call. Anything before the first ``{`` (markdown fences,
+    prose) is skipped, and each chunk is scanned only once. Members that
+    complete but don't parse (e.g. a raw newline inside a string) are kept
+    in ``failed`` so the caller can repair the whole response instead.
+    """
+    def __init__(self):
+        self.buffer = ""
+        self.members = {}
+        self.done = False
+        self._failed = {}
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+        self._member_emitted = False
+
+    def feed(self, chunk):
+        """Consume a chunk of text and return the newly completed members."""
+        if self.done or not chunk:
+            return []
+        self.buffer += chunk
+        completed = []
+
+        while self._pos < len(self.buffer):
+            char = self.buffer[self._pos]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._start_member()
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1:
+                    # A nested object/array value just closed; emit it now
+                    # instead of waiting for the next comma
+                    completed.extend(self._emit_member(self._pos))
+                elif self._depth == 0:
+                    completed.extend(self._emit_member(self._pos - 1))
+                    self.done = True
+                    break
+            elif char == "," and self._depth == 1:
+                completed.extend(self._emit_member(self._pos - 1))
+                self._start_member()
+
+        return completed
+
+    def result(self):
+        """Return every member parsed so far as a dict."""
+        return dict(self.members)
+
+    @property
+    def failed(self):
+        """Raw text of the completed members that could not be parsed."""
+        return list(self._failed.values())
+
+    def _start_member(self):
+        self._member_start = self._pos
+        self._member_emitted = False
+
+    def _emit_member(self, end):
+        if self._member_emitted or self._member_start is None:
+            return []
+        text = self.buffer[self._member_start:end].strip()
+        if not text:
+            return []
+        try:
+            member = json.loads("{" + text + "}")
+        except json.JSONDecodeError:
+            self._failed[self._member_start] = text
+            return []
+        self._failed.pop(self._member_start, None)
+        self._member_emitted = True
+        self.members.update(member)
+        return list(member.items())
+
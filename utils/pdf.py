@@ -0,0 +1,153 @@
+"""
+Page-streaming PDF text extraction with page and character budgets.
+
+Resume analysis only needs the first few thousand characters, so pages are
+extracted lazily and extraction stops as soon as the budget is met. Callers
+that read whole documents outside the web server can ask for page ranges to
+be extracted in a process pool instead.
+"""
+import io
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+# Budgets sized for the resume analysis prompt; a long portfolio PDF is cut off
+DEFAULT_MAX_PAGES = int(os.getenv("INTERVIEWMATE_PDF_MAX_PAGES", "20"))
+DEFAULT_MAX_CHARS = int(os.getenv("INTERVIEWMATE_PDF_MAX_CHARS", "40000"))
+
+PAGES_PER_TASK = 4
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+        return _pool
+
+
+def _read_bytes(pdf_file):
+    if isinstance(pdf_file, (bytes, bytearray)):
+        return bytes(pdf_file)
+    if hasattr(pdf_file, "getvalue"):
+        return pdf_file.getvalue()
+    if hasattr(pdf_file, "seek"):
+        pdf_file.seek(0)
+    return pdf_file.read()
+
+
+def _pdf_reader(pdf_bytes):
+    # Imported on the first PDF so startup doesn't pay for it
+    import PyPDF2
+    return PyPDF2.PdfReader(io.BytesIO(pdf_bytes))
+
+
+def _extract_page_range(pdf_bytes, start, stop):
+    # Runs in a worker process, so it parses its own reader
+    reader = _pdf_reader(pdf_bytes)
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def _open(pdf_file, max_pages):
+    pdf_bytes = _read_bytes(pdf_file)
+    reader = _pdf_reader(pdf_bytes)
+    page_count = len(reader.pages)
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+    return pdf_bytes, reader, page_count
+
+
+def _serial_pages(reader, page_count):
+    for i in range(page_count):
+        yield reader.pages[i].extract_text() or ""
+
+
+def _parallel_pages(pdf_bytes, page_count, workers, pages_per_task, bounded=True):
+    workers = workers or os.cpu_count() or 2
+    pool = _get_pool(workers)
+    if not bounded:
+        # Every task re-parses the document, so don't split finer than the pool needs
+        pages_per_task = max(pages_per_task, -(-page_count // workers))
+    starts = iter(range(0, page_count, pages_per_task))
+    futures = deque()
+
+    def submit_next():
+        start = next(starts, None)
+        if start is not None:
+            futures.append(pool.submit(_extract_page_range, pdf_bytes, start,
+                                       min(start + pages_per_task, page_count)))
+
+    # Only a pool's worth of ranges is in flight, so a met budget stops extraction
+    for _ in range(workers):
+        submit_next()
+    try:
+        while futures:
+            pages = futures.popleft().result()
+            submit_next()
+            yield from pages
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def _apply_budget(pages, max_chars):
+    """Yield pages until ``max_chars`` is reached, truncating the last one."""
+    remaining = max_chars
+    for text in pages:
+        if remaining is not None:
+            if remaining <= 0:
+                return
+            text = text[:remaining]
+            remaining -= len(text)
+        yield text
+
+
+def iter_pdf_pages(pdf_file, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS):
+    """Yield the text of each page in order, stopping once a budget is met."""
+    _, reader, page_count = _open(pdf_file, max_pages)
+    pages = _serial_pages(reader, page_count)
+    try:
+        yield from _apply_budget(pages, max_chars)
+    finally:
+        pages.close()
+
+
+def iter_pdf_pages_parallel(pdf_file, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS,
+                            workers=None, pages_per_task=PAGES_PER_TASK):
+    """
+    Like ``iter_pdf_pages`` but extracts page ranges in a process pool.
+
+    Pages are still yielded in document order; outstanding ranges are
+    cancelled once the character budget is met.
+    """
+    pdf_bytes, _, page_count = _open(pdf_file, max_pages)
+    pages = _parallel_pages(pdf_bytes, page_count, workers, pages_per_task, max_chars is not None)
+    try:
+        yield from _apply_budget(pages, max_chars)
+    finally:
+        pages.close()
+
+
+def extract_pdf_text(pdf_file, max_pages=DEFAULT_MAX_PAGES, max_chars=DEFAULT_MAX_CHARS,
+                     parallel=False, workers=None):
+    """
+    Return the text of a PDF within the page/character budgets.
+
+    Pages are extracted serially unless ``parallel`` is set. Each pool task
+    parses the whole document again, so the pool only pays off for long
+    documents read without a character budget; never use it inside the
+    Streamlit server or a worker process.
+    """
+    pdf_bytes, reader, page_count = _open(pdf_file, max_pages)
+    if parallel:
+        pages = _parallel_pages(pdf_bytes, page_count, workers, PAGES_PER_TASK, max_chars is not None)
+    else:
+        pages = _serial_pages(reader, page_count)
+    try:
+        return "".join(f"{text}\n" for text in _apply_budget(pages, max_chars))
+    finally:
+        pages.close()
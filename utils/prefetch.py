@@ -0,0 +1,146 @@
+import os
+import threading
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+
+# Skill keywords (lower-case substrings) that point towards each position
+POSITION_KEYWORDS = {
+    "Frontend Developer": [
+        "react", "angular", "vue", "javascript", "typescript", "html", "css",
+        "tailwind", "redux", "next.js", "frontend", "front-end", "ui",
+    ],
+    "Backend Developer": [
+        "django", "flask", "fastapi", "spring", "node", "express", "sql",
+        "postgres", "mysql", "mongodb", "redis", "rest", "graphql", "backend",
+        "back-end", "java", "golang", "microservice",
+    ],
+    "Full Stack Developer": [
+        "full stack", "full-stack", "mern", "mean", "react", "node", "django",
+        "javascript", "typescript",
+    ],
+    "DevOps Engineer": [
+        "docker", "kubernetes", "terraform", "ansible", "jenkins", "ci/cd",
+        "aws", "azure", "gcp", "linux", "devops", "helm", "prometheus",
+    ],
+    "Data Scientist": [
+        "pandas", "numpy", "statistics", "data analysis", "tableau", "power bi",
+        "r", "sql", "matplotlib", "data science", "excel",
+    ],
+    "Machine Learning Engineer": [
+        "tensorflow", "pytorch", "keras", "scikit", "machine learning", "deep learning",
+        "nlp", "computer vision", "llm", "mlops", "transformers",
+    ],
+    "Software Engineer": [
+        "python", "java", "c++", "c#", "algorithms", "data structures", "git",
+    ],
+}
+
+DEFAULT_POSITION = "Software Engineer"
+PREFETCH_POSITIONS = int(os.getenv("INTERVIEWMATE_PREFETCH_POSITIONS", "2"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class PrefetchCancelled(Exception):
+    """Raised inside a prefetch job once its result is no longer wanted."""
+
+
+def _get_executor():
+    # One pool per process, shared by every Streamlit session
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("INTERVIEWMATE_PREFETCH_WORKERS", "4")),
+                thread_name_prefix="question-prefetch",
+            )
+        return _executor
+
+
+def rank_positions(primary_skills, positions=None, limit=PREFETCH_POSITIONS):
+    """Return the ``limit`` positions that best match the candidate's skills."""
+    skills = []
+    for skill in primary_skills or []:
+        if isinstance(skill, dict):
+            skill = skill.get('name', skill.get('skill', ''))
+        skills.append(str(skill).lower())
+
+    scores = {}
+    for position, keywords in POSITION_KEYWORDS.items():
+        if positions is not None and position not in positions:
+            continue
+        scores[position] = sum(
+            1 for skill in skills for keyword in keywords
+            if keyword == skill or (len(keyword) > 2 and keyword in skill)
+        )
+
+    ranked = sorted(scores, key=lambda position: -scores[position])
+    ranked = [position for position in ranked if scores[position] > 0]
+    if DEFAULT_POSITION in scores and DEFAULT_POSITION not in ranked:
+        ranked.append(DEFAULT_POSITION)
+    return ranked[:limit]
+
+
+class QuestionPrefetcher:
+    """
+    Speculatively generates question sets for the most likely positions.
+
+    ``generate`` is called as ``generate(resume_analysis, position,
+    on_question=callback)``; the callback raises ``PrefetchCancelled`` once
+    the job has lost, which stops consuming the streamed response.
+    """
+    def __init__(self, generate):
+        self.generate = generate
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def start(self, resume_analysis, positions):
+        """Start background generation for each position not already running."""
+        with self._lock:
+            for position in positions:
+                if position in self._jobs:
+                    continue
+                cancelled = threading.Event()
+                future = _get_executor().submit(self._run, resume_analysis, position, cancelled)
+                self._jobs[position] = (future, cancelled)
+
+    def positions(self):
+        with self._lock:
+            return list(self._jobs)
+
+    def take(self, position, timeout=None):
+        """
+        Return the prefetched questions for ``position`` (waiting for the job
+        if it is still running) and cancel every other job. Returns ``None``
+        when the position was not prefetched or its job failed.
+        """
+        with self._lock:
+            job = self._jobs.pop(position, None)
+        self.cancel()
+        if job is None:
+            return None
+        future, _ = job
+        try:
+            return future.result(timeout=timeout)
+        except (CancelledError, PrefetchCancelled):
+            return None
+        except Exception as e:
+            print(f"Prefetched question generation failed: {str(e)}")
+            return None
+
+    def cancel(self):
+        """Cancel every outstanding job."""
+        with self._lock:
+            jobs, self._jobs = self._jobs, {}
+        for future, cancelled in jobs.values():
+            cancelled.set()
+            future.cancel()
+
+    def _run(self, resume_analysis, position, cancelled):
+        def check_cancelled(question_key, question_data):
+            if cancelled.is_set():
+                raise PrefetchCancelled(position)
+
+        if cancelled.is_set():
+            raise PrefetchCancelled(position)
+        return self.generate(resume_analysis, position, on_question=check_cancelled)
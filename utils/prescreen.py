@@ -0,0 +1,144 @@
+"""
+Local pre-screen that scores obviously empty or junk answers without the model.
+
+Every answer is reduced to a few cheap features: its length, how much of
+it just repeats the question and focus area, whether its tokens look like
+words and the character entropy of its text. The features of a whole
+batch are computed together with numpy. An answer that is empty or a
+non-answer ("I don't know"), a copy of the question, or unreadable gets a
+deterministic zero score; everything else goes to the model as before.
+The rules are deliberately conservative: a terse but real answer such as
+"Use a hash map", a one-line code snippet or an answer in another script
+is never screened out; only an empty answer or an exact non-answer is
+judged by its length.
+"""
+import os
+import re
+
+PRESCREEN = os.getenv("INTERVIEWMATE_PRESCREEN", "1") != "0"
+# The entropy check needs a few words to mean anything
+MIN_ENTROPY_WORDS = 3
+# Share of the answer's words already in the question/focus area, and how few new words make it a copy
+COPY_OVERLAP = 0.8
+COPY_MAX_NEW_WORDS = 2
+# Bits per character; English prose is around 4, "aaaa" or "asdf asdf asdf" far below
+MIN_ENTROPY = 2.5
+MIN_WORDLIKE = 0.5
+MIN_UNIQUE = 0.3
+
+NO_ANSWER, COPY, GIBBERISH = "no_answer", "copy", "gibberish"
+FEEDBACK = {
+    NO_ANSWER: "No substantive answer was given.",
+    COPY: "The answer repeats the question without answering it.",
+    GIBBERISH: "The answer is not readable text.",
+}
+NON_ANSWERS = {
+    "i don't know", "i dont know", "don't know", "dont know", "idk", "no idea", "not sure", "no clue",
+    "pass", "skip", "n/a", "na", "none", "nothing", "no", "yes", "ok", "test",
+}
+
+_TOKEN = re.compile(r"\w+(?:[.+#'-]\w+)*")
+_VOWEL = re.compile(r"[aeiouy0-9]")
+_CONSONANT_RUN = re.compile(r"[bcdfghjklmnpqrstvwxz]{5,}")
+# Assignments, calls, indexing, arrows: answered in code rather than prose
+_CODE = re.compile(r"[=(){}\[\];<>]|->|=>|\w\.\w+\(")
+
+
+def _tokens(text):
+    return _TOKEN.findall(str(text or "").lower())
+
+
+def _is_checked(token):
+    # Identifiers like "h" or "k" say nothing about whether the answer is a keyboard mash
+    return len(token) > 2
+
+
+def _is_wordlike(token):
+    # Numbers, versions and acronyms count; keyboard mashes such as "sdfgh" don't.
+    # Only Latin-script tokens are judged; any other script counts as words.
+    if not token.isascii():
+        return True
+    return bool(_VOWEL.search(token)) and not _CONSONANT_RUN.search(token)
+
+
+def char_entropy(texts):
+    """Shannon entropy in bits per character of each text, computed in one pass."""
+    import numpy as np
+    encoded = [str(text).lower().encode("utf-8") for text in texts]
+    lengths = np.array([len(data) for data in encoded], dtype=np.int64)
+    if not lengths.sum():
+        return np.zeros(len(texts))
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.int64)
+    rows = np.repeat(np.arange(len(texts)), lengths)
+    counts = np.bincount(rows * 256 + data, minlength=len(texts) * 256).reshape(len(texts), 256)
+    probabilities = counts / np.maximum(lengths, 1)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return -np.nansum(np.where(probabilities > 0, probabilities * np.log2(probabilities), 0.0), axis=1)
+
+
+def features(answers):
+    """Feature arrays for a list of answer dicts (``question``, ``focus_area``, ``answer``)."""
+    import numpy as np
+    words, unique, overlap, new_words, wordlike, checked, non_answer, code = [], [], [], [], [], [], [], []
+    for answer in answers:
+        text = str(answer.get("answer") or "")
+        tokens = _tokens(text)
+        prompt_tokens = set(_tokens(answer.get("question"))) | set(_tokens(answer.get("focus_area")))
+        words.append(len(tokens))
+        unique.append(len(set(tokens)))
+        overlap.append(sum(token in prompt_tokens for token in tokens))
+        new_words.append(len(set(tokens) - prompt_tokens))
+        checked_tokens = [token for token in tokens if _is_checked(token)]
+        checked.append(len(checked_tokens))
+        wordlike.append(sum(_is_wordlike(token) for token in checked_tokens))
+        non_answer.append(" ".join(tokens) in NON_ANSWERS)
+        code.append(bool(_CODE.search(text)))
+    words = np.array(words, dtype=float)
+    denominator = np.maximum(words, 1)
+    return {
+        "words": words,
+        "unique_ratio": np.array(unique) / denominator,
+        "overlap": np.array(overlap) / denominator,
+        "new_words": np.array(new_words, dtype=float),
+        # Share of the checked tokens that look like words; 1 when there are none to check
+        "wordlike": np.where(np.array(checked) > 0, np.array(wordlike) / np.maximum(checked, 1), 1.0),
+        "entropy": char_entropy([answer.get("answer") or "" for answer in answers]),
+        "non_answer": np.array(non_answer, dtype=bool),
+        "code": np.array(code, dtype=bool),
+    }
+
+
+def screen_answers(answers):
+    """
+    Screen ``answers`` (question key -> answer dict) in one vectorised pass.
+    Returns question key -> verdict (``NO_ANSWER``, ``COPY``, ``GIBBERISH``)
+    for the answers that don't need the model; substantive ones are absent.
+    """
+    if not answers:
+        return {}
+    import numpy as np
+    keys = list(answers)
+    f = features([answers[key] for key in keys])
+    no_answer = (f["words"] == 0) | f["non_answer"]
+    copy = (f["overlap"] >= COPY_OVERLAP) & (f["new_words"] <= COPY_MAX_NEW_WORDS)
+    gibberish = (
+        ((f["wordlike"] < MIN_WORDLIKE) & ~f["code"])
+        | ((f["entropy"] < MIN_ENTROPY) & (f["words"] >= MIN_ENTROPY_WORDS))
+        | ((f["unique_ratio"] < MIN_UNIQUE) & (f["words"] >= 8))
+    )
+    # First matching rule wins, in order of how certain it is
+    verdicts = np.select([no_answer, copy, gibberish], [NO_ANSWER, COPY, GIBBERISH], default="")
+    return {key: str(verdict) for key, verdict in zip(keys, verdicts) if verdict}
+
+
+def strip_screened_answers(answers):
+    """
+    Copy of ``answers`` for a prompt, with screened-out answers replaced
+    by their verdict so they cost no tokens and the model still sees them.
+    """
+    verdicts = screen_answers(answers) if PRESCREEN else {}
+    return {
+        question_key: dict(answer, answer="", prescreen=FEEDBACK[verdicts[question_key]])
+        if question_key in verdicts else answer
+        for question_key, answer in answers.items()
+    }
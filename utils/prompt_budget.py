@@ -0,0 +1,329 @@
+"""
+Prompt compaction and token budgeting.
+
+Extracted resume text is normalised (whitespace, boilerplate, repeated
+header/footer lines) and truncated section by section to fit a token
+budget, context JSON is serialised without indentation, and every prompt
+sent through ``Agents`` gets a before/after token report. The context of
+the whole-interview evaluation prompt (resume analysis plus every answer)
+is fitted to the prompt budget the same way, field by field, and so is the
+answer in each per-answer scoring prompt.
+"""
+import json
+import logging
+import os
+import re
+import threading
+from collections import deque, namedtuple
+
+logger = logging.getLogger(__name__)
+
+# Gemini averages roughly four characters per token for English prose
+CHARS_PER_TOKEN = 4
+
+RESUME_TOKEN_BUDGET = int(os.getenv("INTERVIEWMATE_RESUME_TOKEN_BUDGET", "6000"))
+PROMPT_TOKEN_BUDGET = int(os.getenv("INTERVIEWMATE_PROMPT_TOKEN_BUDGET", "12000"))
+# Room left for the instructions and output format around an evaluation prompt's context
+PROMPT_RESERVE_TOKENS = 1000
+TRUNCATION_MARK = " [...]"
+# Opening lines of a resume that page headers repeat (name, title, contact line)
+HEADER_LINES = 3
+
+BOILERPLATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in [
+        r"^page \d+( of \d+)?$",
+        r"^-?\s*\d+\s*-?$",  # Bare page numbers
+        r"^\d+\s*/\s*\d+$",
+        r"^(curriculum vitae|resume|résumé|cv)$",
+        r"^references (are )?(available )?(up)?on request\.?$",
+        r"^confidential$",
+    ]
+]
+
+# Relative share of the budget each section gets when the resume is too long;
+# sections with weight 0 are dropped first
+SECTION_WEIGHTS = {
+    "skills": 3,
+    "experience": 3,
+    "projects": 3,
+    "summary": 2,
+    "education": 1,
+    "certifications": 1,
+    "achievements": 1,
+    "other": 1,
+    "interests": 0,
+    "references": 0,
+}
+
+SECTION_HEADINGS = {
+    "skills": ["skills", "technical skills", "core competencies", "technologies", "tech stack", "tools"],
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history"],
+    "projects": ["projects", "personal projects", "key projects", "academic projects"],
+    "summary": ["summary", "profile", "professional summary", "objective", "about me", "about"],
+    "education": ["education", "academic background", "qualifications"],
+    "certifications": ["certifications", "certificates", "licenses", "courses"],
+    "achievements": ["achievements", "awards", "honors", "publications"],
+    "interests": ["interests", "hobbies", "extracurricular activities", "languages"],
+    "references": ["references", "referees"],
+}
+_HEADING_LOOKUP = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+
+# Relative share of the evaluation prompt's analysis budget per field; weight 0 is dropped first
+ANALYSIS_FIELD_WEIGHTS = {
+    "primary_skills": 3,
+    "experience_summary": 3,
+    "key_projects": 2,
+    "areas_for_clarification": 0,
+    "suggested_question_topics": 0,
+}
+# Share of an over-budget evaluation context kept for the resume analysis; the answers get the rest
+ANALYSIS_SHARE = 0.2
+
+PromptReport = namedtuple("PromptReport", "task tokens_before tokens_after truncated")
+
+_reports = deque(maxlen=200)
+_reports_lock = threading.Lock()
+
+
+def estimate_tokens(text):
+    """Cheap token estimate used for budgeting and reporting."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def compact_json(data):
+    """Serialise prompt context without indentation or padding."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def record_report(task, before, after, truncated=False):
+    """Record (and log) the token counts of one compaction step."""
+    report = PromptReport(task, before, after, truncated)
+    with _reports_lock:
+        _reports.append(report)
+    logger.info(
+        "%s prompt: %d -> %d tokens%s", task, before, after, " (truncated)" if truncated else ""
+    )
+    if after > PROMPT_TOKEN_BUDGET:
+        logger.warning("%s prompt is %d tokens, over the %d token budget",
+                       task, after, PROMPT_TOKEN_BUDGET)
+    return report
+
+
+def recent_reports():
+    """Return the most recent prompt reports, oldest first."""
+    with _reports_lock:
+        return list(_reports)
+
+
+def compact_prompt(prompt):
+    """
+    Trim trailing whitespace, inner runs of spaces and repeated blank lines.
+
+    Leading indentation is kept so code in candidate answers stays readable.
+    """
+    lines = []
+    for line in prompt.splitlines():
+        stripped = line.lstrip(" \t")
+        indent = line[:len(line) - len(stripped)]
+        line = indent + re.sub(r"[ \t]{2,}", " ", stripped).rstrip()
+        if not line and lines and not lines[-1]:
+            continue
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def normalise_resume_text(text):
+    """
+    Normalise whitespace and drop boilerplate, repeated page headers and
+    consecutive duplicate lines.
+
+    A page header is the document's opening lines (name, contact line)
+    repeated later starting from the first one; other repeated lines, such
+    as the same job title under two roles, are content and are kept.
+    """
+    lines = []
+    header = []
+    in_header = None  # Position in ``header`` while skipping a repeated one
+    for line in text.splitlines():
+        line = re.sub(r"\s+", " ", line).strip()
+        if not line:
+            if lines and lines[-1]:
+                lines.append("")
+            continue
+        if any(pattern.match(line) for pattern in BOILERPLATE_PATTERNS):
+            continue
+        key = line.lower()
+        if in_header is not None and in_header < len(header) and key == header[in_header]:
+            in_header += 1
+            continue
+        in_header = None
+        if len(lines) > len(header) and header and key == header[0]:
+            in_header = 1
+            continue
+        if lines and lines[-1].lower() == key:
+            continue
+        if len(header) < HEADER_LINES and len(header) == len(lines):
+            header.append(key)
+        lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def _heading_section(line):
+    candidate = line.strip().rstrip(":").strip().lower()
+    if len(candidate) > 40:
+        return None
+    return _HEADING_LOOKUP.get(candidate)
+
+
+def split_sections(text):
+    """Split resume text into ``(section, lines)`` pairs in document order."""
+    sections = [["summary", []]]
+    for line in text.splitlines():
+        section = _heading_section(line)
+        if section:
+            sections.append([section, [line]])
+        else:
+            sections[-1][1].append(line)
+    return [(section, lines) for section, lines in sections if any(lines)]
+
+
+def _truncate_lines(lines, max_tokens):
+    kept, used = [], 0
+    for line in lines:
+        cost = estimate_tokens(line) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(line)
+        used += cost
+    return kept
+
+
+def _water_fill(sizes, weights, budget):
+    """
+    Share ``budget`` by weight: items smaller than their share keep their
+    size and free the rest for the others; weight 0 gets nothing.
+    """
+    allowance = [0] * len(sizes)
+    open_items = [i for i, weight in enumerate(weights) if weight > 0]
+    while open_items:
+        total_weight = sum(weights[i] for i in open_items)
+        share = {i: budget * weights[i] / total_weight for i in open_items}
+        fitting = [i for i in open_items if sizes[i] <= share[i]]
+        if not fitting:
+            for i in open_items:
+                allowance[i] = int(share[i])
+            break
+        for i in fitting:
+            allowance[i] = sizes[i]
+            budget -= sizes[i]
+            open_items.remove(i)
+    return allowance
+
+
+def truncate_to_budget(text, max_tokens):
+    """
+    Fit resume text into ``max_tokens`` by section priority.
+
+    Zero-weight sections are dropped; the remaining budget is shared
+    by weight, sections smaller than their share are kept whole and the
+    rest keep their leading lines.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text, False
+
+    sections = split_sections(text)
+    sizes = [estimate_tokens("\n".join(lines)) + 1 for _, lines in sections]
+    allowance = _water_fill(sizes, [SECTION_WEIGHTS.get(name, 1) for name, _ in sections], max_tokens)
+
+    kept = []
+    for (name, lines), limit in zip(sections, allowance):
+        if limit <= 0:
+            continue
+        kept.extend(lines if estimate_tokens("\n".join(lines)) < limit else _truncate_lines(lines, limit))
+    return "\n".join(kept).strip(), True
+
+
+def compact_resume_text(text, max_tokens=RESUME_TOKEN_BUDGET, task="resume_text"):
+    """Normalise and budget resume text, recording the before/after sizes."""
+    before = estimate_tokens(text)
+    compacted, truncated = truncate_to_budget(normalise_resume_text(text), max_tokens)
+    record_report(task, before, estimate_tokens(compacted), truncated)
+    return compacted
+
+
+def _truncate_value(value, max_tokens):
+    """Cut a list to its leading items, or text to its start, to fit ``max_tokens``."""
+    if isinstance(value, list):
+        kept, used = [], 1
+        for item in value:
+            cost = estimate_tokens(compact_json(item)) + 1
+            if used + cost > max_tokens:
+                break
+            kept.append(item)
+            used += cost
+        return kept
+    text = value if isinstance(value, str) else compact_json(value)
+    max_chars = max_tokens * CHARS_PER_TOKEN - len(TRUNCATION_MARK)
+    return text[:max(max_chars, 0)].rstrip() + TRUNCATION_MARK
+
+
+def fit_answer(answer, context="", max_tokens=PROMPT_TOKEN_BUDGET - PROMPT_RESERVE_TOKENS,
+               task="evaluate_answer.answer"):
+    """
+    Cut the text of one answer so that it, its question and ``context``
+    fit ``max_tokens``, recording the before/after sizes. The question is
+    kept whole; returns the answer dict, copied only if it was cut.
+    """
+    text = str(answer.get("answer", ""))
+    before = estimate_tokens(text)
+    budget = max_tokens - estimate_tokens(context) - estimate_tokens(str(answer.get("question", "")))
+    if before <= budget:
+        record_report(task, before, before)
+        return answer
+    text = _truncate_value(text, max(budget, 1))
+    record_report(task, before, estimate_tokens(text), truncated=True)
+    return dict(answer, answer=text)
+
+
+def fit_evaluation_context(resume_analysis, answers, max_tokens=PROMPT_TOKEN_BUDGET - PROMPT_RESERVE_TOKENS,
+                           task="evaluation.context"):
+    """
+    Fit the resume analysis and answers of a whole-interview evaluation
+    prompt into ``max_tokens``, recording the before/after sizes.
+
+    The analysis gets ``ANALYSIS_SHARE`` of the budget, shared by field
+    weight; the answers get the rest. Questions are always kept whole and
+    only the longest answers are cut, so every answer is still seen.
+    Returns the (possibly trimmed) ``(resume_analysis, answers)``.
+    """
+    before = estimate_tokens(compact_json(resume_analysis)) + estimate_tokens(compact_json(answers))
+    if before <= max_tokens:
+        record_report(task, before, before)
+        return resume_analysis, answers
+
+    keys = list(resume_analysis)
+    sizes = [estimate_tokens(compact_json({key: resume_analysis[key]})) for key in keys]
+    allowance = _water_fill(sizes, [ANALYSIS_FIELD_WEIGHTS.get(key, 1) for key in keys],
+                            int(max_tokens * ANALYSIS_SHARE))
+    analysis = {
+        key: resume_analysis[key] if size <= limit else _truncate_value(resume_analysis[key], limit)
+        for key, size, limit in zip(keys, sizes, allowance) if limit > 0
+    }
+
+    answer_keys = [key for key, answer in answers.items() if isinstance(answer, dict) and "answer" in answer]
+    skeleton = {key: dict(answer, answer="") if key in answer_keys else answer for key, answer in answers.items()}
+    budget = max_tokens - estimate_tokens(compact_json(analysis)) - estimate_tokens(compact_json(skeleton))
+    sizes = [estimate_tokens(compact_json(str(answers[key]["answer"]))) for key in answer_keys]
+    allowance = dict(zip(answer_keys, _water_fill(sizes, [1] * len(sizes), max(budget, 0))))
+    fitted = {
+        key: dict(answer, answer=_truncate_value(str(answer["answer"]), allowance[key]))
+        if key in allowance and estimate_tokens(compact_json(str(answer["answer"]))) > allowance[key] else answer
+        for key, answer in answers.items()
+    }
+
+    after = estimate_tokens(compact_json(analysis)) + estimate_tokens(compact_json(fitted))
+    record_report(task, before, after, truncated=True)
+    return analysis, fitted
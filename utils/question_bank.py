@@ -0,0 +1,258 @@
+"""
+Local bank of generated interview questions for reuse across candidates.
+
+Every generated question is stored with its type, focus area, position,
+the candidate's skills and its place in the original set (used as a
+difficulty rank). Questions are indexed with TF-IDF over their text and
+tags, so a new candidate's set can be assembled mostly from existing
+questions that match the position and skills, leaving only the
+candidate-specific ones for the model.
+"""
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import Counter
+
+from utils.cache import DEFAULT_CACHE_DIR, content_key
+from utils.common import question_number
+
+DEFAULT_BANK_PATH = os.path.join(DEFAULT_CACHE_DIR, "question_bank.sqlite3")
+
+# Below this relevance a stored question isn't reused
+MIN_SCORE = float(os.getenv("INTERVIEWMATE_QUESTION_BANK_MIN_SCORE", "0.2"))
+# Questions more similar than this to one already picked are skipped
+MAX_OVERLAP = 0.8
+SAME_POSITION_BONUS = 0.15
+# Rotates between comparable questions so candidates don't all get the same set
+USE_PENALTY = 0.05
+
+# Types tied to a specific candidate's background are never reused
+REUSABLE_TYPES = ("skill", "design", "problem")
+
+STOPWORDS = frozenset("""
+a an and are as at be by can could describe did do does for from had has have how i if in into is it
+its of on or our that the their them then there these this to was we were what when where which while
+who why will with would you your explain discuss tell us me about
+""".split())
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def tokenize(text):
+    """Lower-case word tokens without stopwords; keeps ``c++``, ``c#``, ``node.js``."""
+    tokens = (token.rstrip(".") for token in _TOKEN.findall(str(text).lower()))
+    return [token for token in tokens if token and token not in STOPWORDS]
+
+
+def _document_terms(question, focus_area, position, skills):
+    # Tags count twice so a short question still matches on its skill
+    return Counter(tokenize(question) + 2 * tokenize(focus_area) + tokenize(position)
+                   + tokenize(" ".join(skills)))
+
+
+class QuestionBank:
+    """
+    SQLite-backed question store with an in-memory TF-IDF index.
+
+    The index is built lazily on first search and picks up rows written
+    by other processes before each search.
+    """
+    def __init__(self, path=DEFAULT_BANK_PATH):
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS bank_questions (
+                    id INTEGER PRIMARY KEY,
+                    key TEXT NOT NULL UNIQUE,
+                    question TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    focus_area TEXT NOT NULL,
+                    position TEXT NOT NULL,
+                    skills TEXT NOT NULL,
+                    difficulty INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    uses INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+
+        # In-memory index: id -> (row, term counts), term -> ids, document frequencies
+        self._docs = {}
+        self._postings = {}
+        self._df = Counter()
+        self._norms = {}
+        self._idf_cache = None
+        self._last_id = 0
+
+    def add(self, questions, position, skills):
+        """
+        Store a ``{"question1": {...}, ...}`` set. The number in each key is
+        its difficulty rank unless a question carries its own ``difficulty``.
+        Returns how many questions were new.
+        """
+        skills = [str(skill) for skill in skills or []]
+        rows = []
+        now = time.time()
+        for key, data in questions.items():
+            if not isinstance(data, dict) or data.get("type") not in REUSABLE_TYPES + ("project",):
+                continue  # Placeholders from a failed generation aren't worth keeping
+            text = str(data.get("question", "")).strip()
+            if not text:
+                continue
+            difficulty = int(data.get("difficulty") or question_number(key) or 5)
+            rows.append((
+                content_key(position.lower(), text.lower()), text, data["type"],
+                str(data.get("focus_area", "")), position, json.dumps(skills), difficulty, now,
+            ))
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO bank_questions "
+                "(key, question, type, focus_area, position, skills, difficulty, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            return self._conn.total_changes - before
+
+    def search(self, position, skills, topics=(), question_type=None, limit=10):
+        """
+        Return ``(score, question)`` pairs best matching a candidate, best
+        first. Heavily reused questions score slightly lower.
+        """
+        query = Counter(tokenize(position) + tokenize(" ".join(map(str, skills or [])))
+                        + tokenize(" ".join(map(str, topics or []))))
+        with self._lock:
+            self._refresh()
+            idf = self._idf()
+            weights = {term: count * idf.get(term, 0.0) for term, count in query.items()}
+            query_norm = math.sqrt(sum(w * w for w in weights.values()))
+            if not query_norm:
+                return []
+
+            scores = Counter()
+            for term, weight in weights.items():
+                for doc_id in self._postings.get(term, ()):
+                    scores[doc_id] += weight * self._docs[doc_id][1][term] * idf[term]
+
+            results = []
+            for doc_id, dot in scores.items():
+                row = self._docs[doc_id][0]
+                if question_type and row["type"] != question_type:
+                    continue
+                score = dot / (query_norm * self._norm(doc_id, idf))
+                if row["position"].lower() == position.lower():
+                    score += SAME_POSITION_BONUS
+                results.append((score - USE_PENALTY * math.log1p(row["uses"]), row))
+        results.sort(key=lambda item: -item[0])
+        return results[:limit]
+
+    def select(self, position, skills, topics, type_counts, min_score=MIN_SCORE):
+        """
+        Pick up to ``type_counts[type]`` relevant, mutually distinct questions
+        per reusable type.
+        """
+        picked = []
+        for question_type, count in type_counts.items():
+            if question_type not in REUSABLE_TYPES or count <= 0:
+                continue
+            chosen = []
+            for score, row in self.search(position, skills, topics, question_type, limit=count * 5):
+                if score < min_score or len(chosen) >= count:
+                    break
+                if any(self.similarity(row["id"], other["id"]) > MAX_OVERLAP for other in chosen):
+                    continue
+                chosen.append(row)
+            picked.extend(chosen)
+        return picked
+
+    def record_use(self, rows):
+        """Count questions from ``select`` that went into a candidate's set."""
+        with self._lock, self._conn:
+            for row in rows:
+                row["uses"] += 1
+            self._conn.executemany(
+                "UPDATE bank_questions SET uses = uses + 1 WHERE id = ?", [(row["id"],) for row in rows]
+            )
+
+    def similarity(self, first_id, second_id):
+        """Cosine similarity of two stored questions."""
+        with self._lock:
+            idf = self._idf()
+            first, second = self._docs[first_id][1], self._docs[second_id][1]
+            dot = sum(count * second[term] * idf[term] ** 2 for term, count in first.items() if term in second)
+            return dot / (self._norm(first_id, idf) * self._norm(second_id, idf))
+
+    def stats(self):
+        with self._lock:
+            questions, reused, uses = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(uses > 0), 0), COALESCE(SUM(uses), 0) FROM bank_questions"
+            ).fetchone()
+            by_type = dict(self._conn.execute("SELECT type, COUNT(*) FROM bank_questions GROUP BY type"))
+        return {"questions": questions, "reused_questions": reused, "reuses": uses, "by_type": by_type}
+
+    def _refresh(self):
+        """Index rows added since the last search (by any process)."""
+        rows = self._conn.execute(
+            "SELECT id, question, type, focus_area, position, skills, difficulty, uses "
+            "FROM bank_questions WHERE id > ? ORDER BY id",
+            (self._last_id,),
+        ).fetchall()
+        for doc_id, question, question_type, focus_area, position, skills, difficulty, uses in rows:
+            skills = json.loads(skills)
+            terms = _document_terms(question, focus_area, position, skills)
+            self._docs[doc_id] = ({
+                "id": doc_id, "question": question, "type": question_type, "focus_area": focus_area,
+                "position": position, "skills": skills, "difficulty": difficulty, "uses": uses,
+            }, terms)
+            for term in terms:
+                self._postings.setdefault(term, set()).add(doc_id)
+                self._df[term] += 1
+            self._last_id = doc_id
+        if rows:
+            # Document frequencies changed
+            self._norms = {}
+            self._idf_cache = None
+
+    def _idf(self):
+        if self._idf_cache is None:
+            total = len(self._docs)
+            self._idf_cache = {term: math.log((total + 1) / (df + 1)) + 1 for term, df in self._df.items()}
+        return self._idf_cache
+
+    def _norm(self, doc_id, idf):
+        if doc_id not in self._norms:
+            terms = self._docs[doc_id][1]
+            self._norms[doc_id] = math.sqrt(sum((count * idf[term]) ** 2 for term, count in terms.items())) or 1.0
+        return self._norms[doc_id]
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank():
+    """Return the process-wide ``QuestionBank``, or ``None`` if it is disabled."""
+    global _bank
+    if os.getenv("INTERVIEWMATE_QUESTION_BANK", "1") == "0":
+        return None
+    with _bank_lock:
+        if _bank is None:
+            _bank = QuestionBank()
+        return _bank
+
+
+if __name__ == "__main__":
+    # python -m utils.question_bank prints what the bank holds
+    if not os.path.exists(DEFAULT_BANK_PATH):
+        sys.exit(f"No question bank found at {DEFAULT_BANK_PATH}")
+    stats = QuestionBank().stats()
+    print(f"{stats['questions']} questions ({', '.join(f'{t}: {n}' for t, n in sorted(stats['by_type'].items()))}), "
+          f"{stats['reused_questions']} reused {stats['reuses']} times")
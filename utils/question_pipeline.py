@@ -0,0 +1,130 @@
+"""
+Just-in-time question generation in small batches.
+
+Instead of one large response with the whole set, a set is generated in
+consecutive batches of its slots (question types in easy-to-hard order).
+The first batch is all the candidate waits for; the rest are generated in
+the background while they answer, each batch seeing the questions before
+it so nothing is repeated.
+"""
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Questions per batch; the last batch takes whatever slots are left
+BATCH_SIZES = [int(size) for size in os.getenv("INTERVIEWMATE_QUESTION_BATCHES", "3,3,4").split(",") if size.strip()]
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    # One pool per process, shared by every Streamlit session
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("INTERVIEWMATE_QUESTION_WORKERS", "4")),
+                thread_name_prefix="question-batches",
+            )
+        return _executor
+
+
+def split_batches(slots, batch_sizes=None):
+    """Split ``slots`` into consecutive batches of ``batch_sizes``."""
+    batches, start = [], 0
+    for size in batch_sizes or BATCH_SIZES:
+        if start >= len(slots):
+            break
+        batches.append(list(range(start, min(start + size, len(slots)))))
+        start += size
+    if start < len(slots):
+        batches.append(list(range(start, len(slots))))
+    return batches
+
+
+class QuestionPipeline:
+    """
+    Fills ``question1``..``questionN`` batch by batch in the background.
+
+    ``generate_batch(question_types, existing_questions)`` returns one
+    question dict per requested type; if it raises, the batch's slots get
+    ``default_question``. Slots already present in ``questions`` (e.g.
+    from a restored session) are kept and not generated again.
+    """
+    def __init__(self, generate_batch, slots, default_question, questions=None, batch_sizes=None):
+        self.generate_batch = generate_batch
+        self.slots = list(slots)
+        self.default_question = default_question
+        self._questions = {
+            key: value for key, value in (questions or {}).items()
+            if key in {f"question{i}" for i in range(1, len(self.slots) + 1)}
+        }
+        self._batches = [
+            [i for i in batch if f"question{i + 1}" not in self._questions]
+            for batch in split_batches(self.slots, batch_sizes)
+        ]
+        self._batches = [batch for batch in self._batches if batch]
+        self._done = not self._batches
+        self._cancelled = threading.Event()
+        self._condition = threading.Condition()
+
+    @property
+    def size(self):
+        return len(self.slots)
+
+    def start(self):
+        if not self._done:
+            _get_executor().submit(self._run)
+        return self
+
+    def ready(self):
+        """Questions generated so far, in set order."""
+        with self._condition:
+            return {
+                f"question{i}": self._questions[f"question{i}"]
+                for i in range(1, self.size + 1) if f"question{i}" in self._questions
+            }
+
+    def done(self):
+        with self._condition:
+            return self._done
+
+    def wait(self, count, timeout=None):
+        """Block until at least ``count`` questions are ready or generation has finished."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._done or len(self._questions) >= min(count, self.size), timeout=timeout
+            )
+
+    def result(self, timeout=None):
+        """The whole set, waiting for every batch."""
+        self.wait(self.size, timeout=timeout)
+        return self.ready()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def _run(self):
+        try:
+            for batch in self._batches:
+                if self._cancelled.is_set():
+                    return
+                with self._condition:
+                    existing = [question["question"] for question in self._questions.values()
+                                if isinstance(question, dict) and question.get("question")]
+                question_types = [self.slots[i] for i in batch]
+                try:
+                    generated = list(self.generate_batch(question_types, existing))
+                except Exception as e:
+                    print(f"Error generating questions: {str(e)}")
+                    generated = []
+                with self._condition:
+                    for position, i in enumerate(batch):
+                        question = generated[position] if position < len(generated) else None
+                        self._questions[f"question{i + 1}"] = question or dict(self.default_question)
+                    self._condition.notify_all()
+        finally:
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
@@ -0,0 +1,359 @@
+"""
+Resume parsing, analysis and question generation shared by the Streamlit
+app and the headless batch tools. Nothing here imports Streamlit; errors
+are reported through the ``on_error`` callback (``print`` by default).
+"""
+import io
+from collections import Counter
+
+from Agents.resilience import is_upstream_failure
+from Agents.schemas import QuestionBatch, QuestionSet, ResumeAnalysis
+from utils.cache import content_key
+from utils import telemetry
+from utils.common import additional_questions_prompt, resume_analysis_prompt, technical_questions_prompt
+from utils.json_parser import RESUME_ANALYSIS_SCHEMA, parse_json_response
+from utils.pdf import extract_pdf_text
+from utils.prefetch import PrefetchCancelled
+from utils.question_pipeline import QuestionPipeline
+from utils.skills import (
+    LOCAL_ANALYSIS, MIN_CONFIDENCE, local_analysis_mode, local_resume_analysis, merge_analyses,
+)
+
+# Bump whenever the resume analysis prompt changes so stale results are not reused
+RESUME_ANALYSIS_PROMPT_VERSION = "2"
+
+FALLBACK_RESUME_ANALYSIS = {
+    "primary_skills": ["Could not parse skills"],
+    "experience_summary": "Could not parse experience",
+    "key_projects": ["Could not parse projects"],
+    "areas_for_clarification": ["Need complete resume review"],
+    "suggested_question_topics": ["Basic skills assessment"]
+}
+
+QUESTION_COUNT = 10
+
+# Question types in a set, as asked for by technical_questions_prompt
+QUESTION_MIX = {"project": 2, "skill": 3, "design": 2, "problem": 3}
+# Typical place of each type in a set ordered from easy to hard
+TYPE_DIFFICULTY = {"project": 2, "skill": 4, "design": 7, "problem": 8}
+# Below this many matches the bank isn't worth it and the whole set is generated
+MIN_BANK_QUESTIONS = 4
+
+
+def is_degraded_analysis(analysis):
+    """True for an analysis standing in for a failed model call; it must not be cached."""
+    return analysis == FALLBACK_RESUME_ANALYSIS or bool(analysis.get("degraded"))
+
+
+def analysis_cache_key(file_bytes):
+    """
+    Content-addressed cache key for the analysis of a resume file; it also
+    covers the local analysis mode and skill taxonomy that produced it.
+    """
+    return content_key(RESUME_ANALYSIS_PROMPT_VERSION, local_analysis_mode(), file_bytes)
+
+
+def extract_text_from_pdf(pdf_file, on_error=print, parallel=False):
+    try:
+        return extract_pdf_text(pdf_file, parallel=parallel)
+    except Exception as e:
+        on_error(f"Error reading PDF: {str(e)}")
+        return ""
+
+
+def extract_text_from_docx(docx_file, on_error=print):
+    try:
+        # python-docx is only imported once a DOCX is actually uploaded
+        from docx import Document
+        docx_bytes = io.BytesIO(docx_file.read())
+        doc = Document(docx_bytes)
+        text = ""
+        for paragraph in doc.paragraphs:
+            text += paragraph.text + "\n"
+        return text
+    except Exception as e:
+        on_error(f"Error reading DOCX: {str(e)}")
+        return ""
+
+
+def _local_analysis(resume_text):
+    """The skill index's analysis of a resume, and whether it can stand in for the model."""
+    if LOCAL_ANALYSIS == "off":
+        return None, False
+    local = local_resume_analysis(resume_text)
+    answered = LOCAL_ANALYSIS == "always" or local.confidence >= MIN_CONFIDENCE
+    telemetry.record_cache("skill_index", answered)
+    return local.analysis, answered
+
+
+def confident_local_analysis(resume_text):
+    """The skill index's analysis if it is confident enough to skip the model, else None."""
+    analysis, answered = _local_analysis(resume_text)
+    return analysis if answered else None
+
+
+def analyze_resume(agents, resume_text, on_error=print):
+    with telemetry.span("resume_analysis") as span:
+        local, answered = _local_analysis(resume_text)
+        if answered:
+            return local
+
+        analysis = _model_resume_analysis(agents, resume_text, on_error, span)
+        if local is None:
+            return analysis
+        # A partial local analysis still beats the placeholder when the model fails,
+        # but it is marked so callers don't cache it
+        if analysis == FALLBACK_RESUME_ANALYSIS:
+            return dict(local, degraded=True) if local["primary_skills"] else analysis
+        return merge_analyses(analysis, local)
+
+
+def _model_resume_analysis(agents, resume_text, on_error, span):
+    analysis_prompt = resume_analysis_prompt(resume_text)
+    response = None
+
+    if getattr(agents, "structured", False):
+        try:
+            return agents.generate_structured(analysis_prompt, ResumeAnalysis, task="resume_analysis").to_dict()
+        except Exception as e:
+            if is_upstream_failure(e):
+                on_error(f"Error analyzing resume: {str(e)}")
+                span.fail(e)
+                return dict(FALLBACK_RESUME_ANALYSIS)
+            print(f"Structured resume analysis failed, retrying as free text: {str(e)}")
+
+    try:
+        response = agents.generate_content(analysis_prompt, task="resume_analysis")
+        result = parse_json_response(response.text, RESUME_ANALYSIS_SCHEMA)
+        telemetry.mark_parse(True)
+        return result
+    except Exception as e:
+        on_error(f"Error analyzing resume: {str(e)}")
+        span.fail(e)
+
+        if response is not None:
+            telemetry.mark_parse(False)
+            on_error(f"Raw response: {response.text}")
+
+        # Return a fallback structure
+        return dict(FALLBACK_RESUME_ANALYSIS)
+
+
+def format_list(items):
+    if not items:
+        return []
+    formatted = []
+    for item in items:
+        if isinstance(item, dict):
+            formatted.append(str(item.get('name', item.get('skill', str(item)))))
+        elif isinstance(item, str):
+            formatted.append(item)
+        else:
+            formatted.append(str(item))
+    return formatted
+
+
+def fallback_questions(position):
+    questions = {}
+    for i in range(1, QUESTION_COUNT + 1):
+        questions[f"question{i}"] = {
+            "question": f"Question {i}: Please describe your experience with {position} related technologies.",
+            "type": "general",
+            "focus_area": "general experience"
+        }
+    return questions
+
+
+def _default_question(position):
+    return {
+        "question": f"Describe your experience with {position} related technologies.",
+        "type": "general",
+        "focus_area": "general experience"
+    }
+
+
+# Question Generation Based on Resume and Position
+def generate_technical_questions(agents, resume_analysis, position, on_question=None, on_error=print, bank=None):
+    """
+    Generate the 10-question set for a candidate.
+
+    With a question ``bank``, relevant questions from earlier candidates are
+    reused and only the rest are generated; new questions are added to it.
+    """
+    skills = format_list(resume_analysis.get('primary_skills', []))
+    projects = format_list(resume_analysis.get('key_projects', []))
+    experience = str(resume_analysis.get('experience_summary', ''))
+    topics = format_list(resume_analysis.get('suggested_question_topics', []))
+
+    with telemetry.span("question_generation") as span:
+        if bank is not None:
+            try:
+                reused = bank.select(position, skills, topics, QUESTION_MIX)
+            except Exception as e:
+                print(f"Question bank lookup failed: {str(e)}")
+                reused = []
+            telemetry.record_cache("question_bank", len(reused) >= MIN_BANK_QUESTIONS)
+            if len(reused) >= MIN_BANK_QUESTIONS:
+                bank.record_use(reused)
+                return _complete_from_bank(
+                    agents, bank, reused, position, skills, projects, experience, on_question, on_error
+                )
+
+        question_prompt = technical_questions_prompt(position, skills, projects, experience, topics)
+
+        try:
+            # Questions arrive one by one as the response streams in
+            questions = {}
+            for question_key, question_data in agents.stream_json(
+                    question_prompt, task="question_generation", response_schema=QuestionSet):
+                questions[question_key] = question_data
+                if on_question:
+                    on_question(question_key, question_data)
+
+            if not questions:
+                raise ValueError("No questions found in model response")
+            questions = QuestionSet.from_dict(questions).to_dict()
+            _add_to_bank(bank, questions, position, skills)
+
+            # Ensure all 10 questions exist, otherwise fill with defaults
+            for i in range(1, QUESTION_COUNT + 1):
+                question_key = f"question{i}"
+                if question_key not in questions:
+                    questions[question_key] = _default_question(position)
+
+            return questions
+
+        except PrefetchCancelled:
+            raise
+
+        except Exception as e:
+            on_error(f"Error generating questions: {str(e)}")
+            span.fail(e)
+            return fallback_questions(position)
+
+
+def _add_to_bank(bank, questions, position, skills):
+    if bank is None:
+        return
+    try:
+        bank.add(questions, position, skills)
+    except Exception as e:
+        print(f"Could not save questions to the question bank: {str(e)}")
+
+
+def _complete_from_bank(agents, bank, reused, position, skills, projects, experience, on_question, on_error):
+    """Fill the question mix around the reused questions with fresh ones."""
+    # (difficulty, question) pairs; sorting them restores the easy-to-hard order
+    ranked = []
+    for row in reused:
+        question = {"question": row["question"], "type": row["type"], "focus_area": row["focus_area"]}
+        ranked.append((row["difficulty"], question))
+        if on_question:
+            on_question(f"bank{row['id']}", question)
+
+    reused_types = Counter(row["type"] for row in reused)
+    missing = {question_type: count - reused_types[question_type] for question_type, count in QUESTION_MIX.items()}
+    missing = {question_type: count for question_type, count in missing.items() if count > 0}
+
+    if missing:
+        prompt = additional_questions_prompt(
+            position, skills, projects, experience, missing, [question["question"] for _, question in ranked]
+        )
+        try:
+            fresh = {}
+            for question_key, question_data in agents.stream_json(
+                    prompt, task="question_generation", response_schema=QuestionBatch):
+                fresh[question_key] = question_data
+                if on_question:
+                    on_question(question_key, question_data)
+            fresh_questions = QuestionSet.from_dict(fresh).to_dict()
+            for question in fresh_questions.values():
+                question["difficulty"] = TYPE_DIFFICULTY.get(question["type"], 5)
+            _add_to_bank(bank, fresh_questions, position, skills)
+            ranked.extend((question.pop("difficulty"), question) for question in fresh_questions.values())
+        except PrefetchCancelled:
+            raise
+        except Exception as e:
+            on_error(f"Error generating questions: {str(e)}")
+
+    ranked.sort(key=lambda item: item[0])
+    questions = [question for _, question in ranked][:QUESTION_COUNT]
+    while len(questions) < QUESTION_COUNT:
+        questions.append(_default_question(position))
+    return {f"question{i}": question for i, question in enumerate(questions, start=1)}
+
+
+def question_slots():
+    """Question types of a set in easy-to-hard order, one per question."""
+    return [question_type for question_type, count in QUESTION_MIX.items() for _ in range(count)]
+
+
+def generate_question_batch(agents, resume_analysis, position, question_types, existing_questions,
+                            on_error=print, bank=None):
+    """
+    Generate one question per entry of ``question_types`` (in that order)
+    that doesn't repeat ``existing_questions``. With a question ``bank``,
+    matching stored questions are used first.
+    """
+    skills = format_list(resume_analysis.get('primary_skills', []))
+    projects = format_list(resume_analysis.get('key_projects', []))
+    experience = str(resume_analysis.get('experience_summary', ''))
+    topics = format_list(resume_analysis.get('suggested_question_topics', []))
+    needed = Counter(question_types)
+    existing = set(existing_questions)
+
+    with telemetry.span("question_batch") as span:
+        pool = []
+        if bank is not None:
+            try:
+                reused = [row for row in bank.select(position, skills, topics, needed) if row["question"] not in existing]
+            except Exception as e:
+                print(f"Question bank lookup failed: {str(e)}")
+                reused = []
+            telemetry.record_cache("question_bank", bool(reused))
+            if reused:
+                bank.record_use(reused)
+            pool.extend({"question": row["question"], "type": row["type"], "focus_area": row["focus_area"]}
+                        for row in reused)
+
+        missing = needed - Counter(question["type"] for question in pool)
+        if missing:
+            prompt = additional_questions_prompt(
+                position, skills, projects, experience, dict(missing),
+                list(existing_questions) + [question["question"] for question in pool]
+            )
+            try:
+                fresh = {}
+                for question_key, question_data in agents.stream_json(
+                        prompt, task="question_generation", response_schema=QuestionBatch):
+                    fresh[question_key] = question_data
+                fresh_questions = QuestionSet.from_dict(fresh).to_dict()
+                for question in fresh_questions.values():
+                    question["difficulty"] = TYPE_DIFFICULTY.get(question["type"], 5)
+                _add_to_bank(bank, fresh_questions, position, skills)
+                for question in fresh_questions.values():
+                    question.pop("difficulty")
+                    pool.append(question)
+            except Exception as e:
+                on_error(f"Error generating questions: {str(e)}")
+                span.fail(e)
+
+        # Match questions to the requested types; a question of the wrong type beats a placeholder
+        batch = []
+        for question_type in question_types:
+            match = next((question for question in pool if question["type"] == question_type), None)
+            if match is None and pool:
+                match = pool[0]
+            if match is not None:
+                pool.remove(match)
+            batch.append(match or _default_question(position))
+        return batch
+
+
+def start_question_pipeline(generate_batch, position, questions=None):
+    """
+    Start generating a question set batch by batch with
+    ``generate_batch(question_types, existing_questions)``; ``questions``
+    already generated (e.g. in a restored session) are kept.
+    """
+    return QuestionPipeline(generate_batch, question_slots(), _default_question(position), questions).start()
@@ -0,0 +1,213 @@
+"""
+Persistent interview sessions that survive reruns, restarts and reconnects.
+
+Session state is checkpointed under a random token (kept in the page URL)
+after each stage. ``SessionStore.save`` only records the latest snapshot
+in memory; a background thread compresses and writes pending snapshots in
+batches, so persistence never blocks the interactive path. Backends are
+SQLite (default) or one file per session.
+"""
+import atexit
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import zlib
+
+from utils.cache import DEFAULT_CACHE_DIR
+
+DEFAULT_SESSION_PATH = os.path.join(DEFAULT_CACHE_DIR, "sessions.sqlite3")
+DEFAULT_SESSION_DIR = os.path.join(DEFAULT_CACHE_DIR, "sessions")
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+FLUSH_INTERVAL = float(os.getenv("INTERVIEWMATE_SESSION_FLUSH_INTERVAL", "0.5"))
+
+
+def new_token():
+    return secrets.token_urlsafe(16)
+
+
+def encode_state(snapshot):
+    """zlib-compress a compact JSON snapshot for storage."""
+    return zlib.compress(snapshot.encode("utf-8"), 6)
+
+
+def decode_state(payload):
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+class SQLiteSessionBackend:
+    """All sessions in one SQLite table; a batch is written in one transaction."""
+    def __init__(self, path=DEFAULT_SESSION_PATH, max_age=DEFAULT_MAX_AGE_SECONDS):
+        self.path = path
+        self.max_age = max_age
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    token TEXT PRIMARY KEY,
+                    state BLOB NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def read(self, token):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state, updated_at FROM sessions WHERE token = ?", (token,)
+            ).fetchone()
+        if row is None or (self.max_age is not None and time.time() - row[1] > self.max_age):
+            return None
+        return row[0]
+
+    def write_many(self, items):
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+                [(token, payload, now) for token, payload in items],
+            )
+            if self.max_age is not None:
+                self._conn.execute("DELETE FROM sessions WHERE updated_at < ?", (now - self.max_age,))
+
+    def delete(self, token):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM sessions WHERE token = ?", (token,))
+
+
+class FileSessionBackend:
+    """One compressed file per session, replaced atomically on every write."""
+    def __init__(self, directory=DEFAULT_SESSION_DIR, max_age=DEFAULT_MAX_AGE_SECONDS):
+        self.directory = directory
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, token):
+        # Tokens come from the URL, so never let one name a path outside the directory
+        safe = "".join(char for char in token if char.isalnum() or char in "-_")
+        return os.path.join(self.directory, f"{safe}.json.z")
+
+    def read(self, token):
+        path = self._path(token)
+        try:
+            if self.max_age is not None and time.time() - os.path.getmtime(path) > self.max_age:
+                return None
+            with open(path, "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def write_many(self, items):
+        for token, payload in items:
+            path = self._path(token)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+
+    def delete(self, token):
+        try:
+            os.remove(self._path(token))
+        except FileNotFoundError:
+            pass
+
+
+class SessionStore:
+    """
+    Write-behind session persistence on top of a backend.
+
+    Repeated saves of one session between flushes are coalesced into a
+    single write; ``load`` sees pending snapshots before they hit disk.
+    """
+    def __init__(self, backend, flush_interval=FLUSH_INTERVAL):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.writes = 0
+        self.batches = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="session-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def save(self, token, state):
+        """Queue a snapshot of ``state`` (a JSON-serialisable dict) for writing."""
+        snapshot = json.dumps(state, separators=(",", ":"))
+        with self._lock:
+            self._pending[token] = snapshot
+        self._wakeup.set()
+
+    def load(self, token):
+        """Return the latest saved state for ``token`` or ``None``."""
+        with self._lock:
+            snapshot = self._pending.get(token)
+        if snapshot is not None:
+            return json.loads(snapshot)
+        try:
+            payload = self.backend.read(token)
+            return decode_state(payload) if payload is not None else None
+        except Exception as e:
+            print(f"Error loading session: {str(e)}")
+            return None
+
+    def delete(self, token):
+        with self._lock:
+            self._pending.pop(token, None)
+        self.backend.delete(token)
+
+    def flush(self):
+        """Write every pending snapshot now."""
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            items = [(token, encode_state(snapshot)) for token, snapshot in pending.items()]
+            try:
+                self.backend.write_many(items)
+                self.writes += len(items)
+                self.batches += 1
+            except Exception as e:
+                print(f"Error saving sessions: {str(e)}")
+                with self._lock:
+                    # Keep them for the next flush unless a newer snapshot arrived
+                    for token, snapshot in pending.items():
+                        self._pending.setdefault(token, snapshot)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            # Let a burst of checkpoints accumulate into one batch
+            time.sleep(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_session_store():
+    """
+    Return the process-wide ``SessionStore`` chosen by
+    ``INTERVIEWMATE_SESSION_BACKEND`` (``sqlite``, ``file`` or ``none``).
+    """
+    global _store
+    backend_name = os.getenv("INTERVIEWMATE_SESSION_BACKEND", "sqlite").lower()
+    if backend_name == "none":
+        return None
+    with _store_lock:
+        if _store is None:
+            if backend_name == "file":
+                backend = FileSessionBackend(os.getenv("INTERVIEWMATE_SESSION_DIR", DEFAULT_SESSION_DIR))
+            else:
+                backend = SQLiteSessionBackend()
+            _store = SessionStore(backend)
+        return _store
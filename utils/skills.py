@@ -0,0 +1,744 @@
+"""
+Local resume analysis: a precompiled skill taxonomy index and section detection.
+
+``SKILL_TAXONOMY`` maps canonical technology names to their aliases, by
+category. All aliases are compiled once into an Aho-Corasick automaton,
+so a single pass over a resume finds every mention of every skill.
+``local_resume_analysis`` combines those mentions with the resume's
+sections (skills, experience, projects) to build the same structure the
+model returns for ``analyze_resume``, plus a confidence. The model is only
+asked when that confidence is low, and then the local skills fill in what
+it missed.
+
+Extra skills can be added without a code change: point
+``INTERVIEWMATE_SKILL_TAXONOMY`` at a JSON file of
+``{"category": {"Canonical name": ["alias", ...]}}``.
+
+    python -m utils.skills resume.txt
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from utils.cache import content_key
+from utils.prompt_budget import normalise_resume_text, split_sections
+
+# auto: use the local analysis when it is confident enough, otherwise ask the model
+# always: never ask the model; off: always ask the model
+LOCAL_ANALYSIS = os.getenv("INTERVIEWMATE_LOCAL_ANALYSIS", "auto")
+MIN_CONFIDENCE = float(os.getenv("INTERVIEWMATE_LOCAL_ANALYSIS_MIN_CONFIDENCE", "0.7"))
+TAXONOMY_FILE = os.getenv("INTERVIEWMATE_SKILL_TAXONOMY", "")
+
+MAX_PRIMARY_SKILLS = 10
+MAX_PROJECTS = 5
+MAX_TOPICS = 5
+
+SKILL_TAXONOMY = {
+    "languages": {
+        "Python": ["python", "python3", "python 3", "cpython"],
+        "Java": ["java", "java 8", "java 11", "java 17", "j2ee", "java ee", "jakarta ee"],
+        "JavaScript": ["javascript", "java script", "js", "es6", "es2015", "ecmascript", "vanilla js"],
+        "TypeScript": ["typescript"],
+        "Go": ["Go", "golang"],
+        "C": ["C", "ansi c", "c99", "c11"],
+        "C++": ["c++", "cpp", "c++11", "c++14", "c++17", "c++20"],
+        "C#": ["c#", "csharp", "c sharp"],
+        "Rust": ["Rust", "rustlang"],
+        "Kotlin": ["kotlin"],
+        "Swift": ["Swift", "swiftui"],
+        "Objective-C": ["objective-c", "objective c", "objc"],
+        "Ruby": ["ruby"],
+        "PHP": ["php", "php7", "php8"],
+        "Scala": ["scala"],
+        "R": ["R", "rlang", "r programming"],
+        "MATLAB": ["matlab"],
+        "Julia": ["Julia", "julialang"],
+        "Perl": ["perl"],
+        "Haskell": ["haskell"],
+        "Elixir": ["elixir"],
+        "Erlang": ["erlang"],
+        "Clojure": ["clojure", "clojurescript"],
+        "F#": ["f#", "fsharp"],
+        "Dart": ["Dart"],
+        "Lua": ["lua"],
+        "Groovy": ["groovy"],
+        "Bash": ["bash", "shell scripting", "shell script", "shell scripts", "zsh"],
+        "PowerShell": ["powershell"],
+        "SQL": ["sql", "t-sql", "tsql", "pl/sql", "plsql", "ansi sql"],
+        "HTML": ["html", "html5"],
+        "CSS": ["css", "css3"],
+        "Solidity": ["solidity"],
+        "Assembly": ["assembly", "x86 assembly", "arm assembly"],
+        "COBOL": ["cobol"],
+        "Fortran": ["fortran"],
+        "VBA": ["vba", "visual basic"],
+        "Verilog": ["verilog", "systemverilog"],
+        "VHDL": ["vhdl"],
+        "Zig": ["Zig"],
+        "OCaml": ["ocaml"],
+    },
+    "frontend": {
+        "React": ["react", "react.js", "reactjs", "react js", "react hooks"],
+        "Angular": ["angular", "angularjs", "angular.js"],
+        "Vue.js": ["vue", "vue.js", "vuejs", "vue 3", "vuex", "pinia"],
+        "Svelte": ["svelte", "sveltekit"],
+        "Next.js": ["next.js", "nextjs", "next js"],
+        "Nuxt.js": ["nuxt", "nuxt.js", "nuxtjs"],
+        "Redux": ["redux", "redux toolkit", "rtk query"],
+        "jQuery": ["jquery"],
+        "Tailwind CSS": ["tailwind", "tailwind css", "tailwindcss"],
+        "Bootstrap": ["bootstrap"],
+        "Sass": ["sass", "scss"],
+        "Material UI": ["material ui", "material-ui", "mui"],
+        "Webpack": ["webpack"],
+        "Vite": ["vite"],
+        "Babel": ["babel"],
+        "Storybook": ["storybook"],
+        "Three.js": ["three.js", "threejs"],
+        "D3.js": ["d3", "d3.js", "d3js"],
+        "Gatsby": ["gatsby"],
+        "Ember.js": ["ember.js", "emberjs"],
+        "Backbone.js": ["backbone.js", "backbonejs"],
+        "Web Components": ["web components"],
+        "WebAssembly": ["webassembly", "wasm"],
+        "Streamlit": ["streamlit"],
+        "Figma": ["figma"],
+    },
+    "backend": {
+        "Node.js": ["node.js", "nodejs", "node js", "Node"],
+        "Express": ["express.js", "expressjs", "Express"],
+        "NestJS": ["nestjs", "nest.js"],
+        "Django": ["django", "django rest framework", "drf"],
+        "Flask": ["flask"],
+        "FastAPI": ["fastapi", "fast api"],
+        "Spring Boot": ["spring boot", "springboot", "Spring", "spring framework", "spring mvc", "spring cloud"],
+        "Hibernate": ["hibernate", "jpa"],
+        "Ruby on Rails": ["ruby on rails", "rails", "ror"],
+        "Laravel": ["laravel"],
+        "Symfony": ["symfony"],
+        ".NET": [".net", "dotnet", ".net core", "asp.net", "asp.net core", "asp.net mvc"],
+        "Entity Framework": ["entity framework", "ef core"],
+        "Gin": ["gin-gonic"],
+        "Phoenix": ["phoenix framework"],
+        "Celery": ["celery"],
+        "gRPC": ["grpc", "protobuf", "protocol buffers"],
+        "GraphQL": ["graphql", "apollo", "apollo server"],
+        "REST APIs": ["REST", "rest api", "rest apis", "restful", "restful api", "restful apis", "restful services"],
+        "WebSockets": ["websocket", "websockets", "socket.io"],
+        "Microservices": ["microservice", "microservices", "micro-services", "microservice architecture"],
+        "Kafka": ["kafka", "apache kafka", "kafka streams"],
+        "RabbitMQ": ["rabbitmq", "rabbit mq"],
+        "ActiveMQ": ["activemq"],
+        "NATS": ["NATS"],
+        "Nginx": ["nginx"],
+        "Apache HTTP Server": ["apache httpd", "apache http server"],
+        "Tomcat": ["tomcat"],
+        "OAuth": ["oauth", "oauth2", "oauth 2.0", "openid connect", "oidc"],
+        "JWT": ["jwt", "json web tokens"],
+        "Keycloak": ["keycloak"],
+        "SQLAlchemy": ["sqlalchemy"],
+        "Prisma": ["prisma"],
+        "Sequelize": ["sequelize"],
+        "Mongoose": ["mongoose"],
+        "Pydantic": ["pydantic"],
+        "Asyncio": ["asyncio", "async/await"],
+        "Twisted": ["twisted"],
+        "Quarkus": ["quarkus"],
+        "Micronaut": ["micronaut"],
+        "Deno": ["deno"],
+        "Bun": ["bun.js"],
+    },
+    "databases": {
+        "PostgreSQL": ["postgresql", "postgres", "psql", "postgis"],
+        "MySQL": ["mysql", "mariadb"],
+        "SQLite": ["sqlite", "sqlite3"],
+        "Oracle Database": ["oracle database", "oracle db", "oracle 12c", "oracle 19c"],
+        "SQL Server": ["sql server", "mssql", "ms sql", "microsoft sql server"],
+        "MongoDB": ["mongodb", "mongo", "mongo db"],
+        "Redis": ["redis", "redis cluster"],
+        "Memcached": ["memcached"],
+        "RocksDB": ["rocksdb", "leveldb"],
+        "Cassandra": ["cassandra", "apache cassandra", "scylladb"],
+        "DynamoDB": ["dynamodb", "dynamo db"],
+        "Elasticsearch": ["elasticsearch", "elastic search", "opensearch", "elk", "elk stack"],
+        "Solr": ["solr", "apache solr"],
+        "Neo4j": ["neo4j", "cypher"],
+        "CouchDB": ["couchdb", "couchbase"],
+        "Firebase": ["firebase", "firestore"],
+        "Supabase": ["supabase"],
+        "InfluxDB": ["influxdb"],
+        "TimescaleDB": ["timescaledb"],
+        "ClickHouse": ["clickhouse"],
+        "Snowflake": ["snowflake"],
+        "BigQuery": ["bigquery", "big query"],
+        "Redshift": ["redshift", "amazon redshift"],
+        "CockroachDB": ["cockroachdb"],
+        "HBase": ["hbase"],
+        "Pinecone": ["pinecone"],
+        "FAISS": ["faiss"],
+        "Chroma": ["chromadb"],
+        "pgvector": ["pgvector"],
+    },
+    "cloud": {
+        "AWS": ["aws", "amazon web services"],
+        "AWS Lambda": ["aws lambda", "lambda functions", "serverless framework"],
+        "Amazon EC2": ["ec2", "amazon ec2"],
+        "Amazon S3": ["s3", "amazon s3", "aws s3"],
+        "Amazon SQS": ["sqs", "amazon sqs"],
+        "Amazon SNS": ["sns", "amazon sns"],
+        "Amazon ECS": ["ecs", "amazon ecs", "fargate"],
+        "Amazon EKS": ["eks", "amazon eks"],
+        "Amazon RDS": ["rds", "amazon rds", "aurora"],
+        "CloudFormation": ["cloudformation", "aws cdk", "cdk"],
+        "API Gateway": ["api gateway"],
+        "Azure": ["azure", "microsoft azure", "azure devops", "azure functions", "aks"],
+        "Google Cloud": ["gcp", "google cloud", "google cloud platform", "cloud run", "app engine", "gke"],
+        "Heroku": ["heroku"],
+        "Vercel": ["vercel"],
+        "Netlify": ["netlify"],
+        "DigitalOcean": ["digitalocean", "digital ocean"],
+        "Cloudflare": ["cloudflare", "cloudflare workers"],
+        "Serverless": ["serverless"],
+        "OpenStack": ["openstack"],
+    },
+    "devops": {
+        "Docker": ["docker", "dockerfile", "docker compose", "docker-compose", "containerization", "containers"],
+        "Kubernetes": ["kubernetes", "k8s", "kubectl", "openshift"],
+        "Helm": ["helm", "helm charts"],
+        "Terraform": ["terraform", "hcl", "terragrunt"],
+        "Ansible": ["ansible"],
+        "Puppet": ["Puppet"],
+        "Chef": ["Chef"],
+        "Pulumi": ["pulumi"],
+        "Jenkins": ["jenkins"],
+        "GitHub Actions": ["github actions"],
+        "GitLab CI": ["gitlab ci", "gitlab ci/cd", "gitlab pipelines"],
+        "CircleCI": ["circleci", "circle ci"],
+        "Travis CI": ["travis ci", "travis-ci"],
+        "Argo CD": ["argo cd", "argocd", "argo workflows"],
+        "CI/CD": ["ci/cd", "ci / cd", "cicd", "continuous integration", "continuous delivery",
+                  "continuous deployment"],
+        "Prometheus": ["prometheus"],
+        "Grafana": ["grafana"],
+        "Datadog": ["datadog"],
+        "New Relic": ["new relic"],
+        "Splunk": ["splunk"],
+        "OpenTelemetry": ["opentelemetry", "otel"],
+        "Jaeger": ["jaeger"],
+        "Sentry": ["sentry"],
+        "Linux": ["linux", "ubuntu", "debian", "centos", "red hat", "rhel", "unix"],
+        "Istio": ["istio", "service mesh"],
+        "Vault": ["hashicorp vault"],
+        "Consul": ["consul"],
+        "Nomad": ["hashicorp nomad"],
+        "Vagrant": ["vagrant"],
+        "Packer": ["hashicorp packer"],
+        "Git": ["git", "github", "gitlab", "bitbucket", "version control"],
+        "SRE": ["sre", "site reliability engineering", "site reliability"],
+    },
+    "data": {
+        "Pandas": ["pandas"],
+        "NumPy": ["numpy"],
+        "SciPy": ["scipy"],
+        "Polars": ["polars"],
+        "Apache Spark": ["spark", "apache spark", "pyspark", "spark sql", "spark streaming"],
+        "Hadoop": ["hadoop", "hdfs", "mapreduce"],
+        "Hive": ["Hive", "apache hive", "hiveql"],
+        "Apache Flink": ["flink", "apache flink"],
+        "Apache Beam": ["apache beam", "dataflow"],
+        "Airflow": ["airflow", "apache airflow"],
+        "Dagster": ["dagster"],
+        "Prefect": ["prefect"],
+        "dbt": ["dbt", "data build tool"],
+        "Databricks": ["databricks", "delta lake"],
+        "Kinesis": ["kinesis", "amazon kinesis"],
+        "AWS Glue": ["aws glue", "glue jobs"],
+        "Presto": ["presto", "trino", "athena"],
+        "ETL": ["etl", "elt", "data pipelines", "data pipeline"],
+        "Data Warehousing": ["data warehouse", "data warehousing", "data lake", "lakehouse"],
+        "Tableau": ["tableau"],
+        "Power BI": ["power bi", "powerbi"],
+        "Looker": ["looker", "looker studio"],
+        "Excel": ["Excel", "microsoft excel"],
+        "Matplotlib": ["matplotlib"],
+        "Seaborn": ["seaborn"],
+        "Plotly": ["plotly"],
+        "Jupyter": ["jupyter", "jupyter notebook", "jupyterlab", "ipython"],
+        "Statistics": ["statistics", "statistical analysis", "hypothesis testing", "a/b testing", "ab testing",
+                       "regression analysis", "bayesian statistics"],
+        "Data Analysis": ["data analysis", "data analytics", "exploratory data analysis", "eda"],
+        "Data Visualization": ["data visualization", "data visualisation", "dashboards", "dashboarding"],
+    },
+    "ml": {
+        "Machine Learning": ["machine learning", "ml", "supervised learning", "unsupervised learning"],
+        "Deep Learning": ["deep learning", "neural networks", "neural network", "cnn", "cnns", "rnn", "lstm",
+                          "gans"],
+        "TensorFlow": ["tensorflow", "tensorflow 2", "tf.keras", "tflite"],
+        "PyTorch": ["pytorch", "torch", "pytorch lightning"],
+        "Keras": ["keras"],
+        "scikit-learn": ["scikit-learn", "sklearn", "scikit learn", "scikit"],
+        "Gradient Boosting": ["xgboost", "lightgbm", "catboost", "gradient boosting"],
+        "JAX": ["jax"],
+        "Hugging Face Transformers": ["hugging face", "huggingface", "transformers", "hugging face transformers"],
+        "NLP": ["nlp", "natural language processing", "text classification", "named entity recognition",
+                "spacy", "nltk"],
+        "Computer Vision": ["computer vision", "opencv", "image classification", "object detection", "yolo"],
+        "LLMs": ["llm", "llms", "large language models", "large language model", "gpt", "prompt engineering",
+                 "fine-tuning", "fine tuning", "rag", "retrieval augmented generation"],
+        "LangChain": ["langchain", "llamaindex", "llama index"],
+        "OpenAI API": ["openai", "openai api", "chatgpt api"],
+        "Gemini API": ["gemini", "google gemini", "gemini api", "vertex ai"],
+        "MLOps": ["mlops", "ml ops", "model deployment", "model serving"],
+        "MLflow": ["mlflow"],
+        "Kubeflow": ["kubeflow"],
+        "SageMaker": ["sagemaker", "amazon sagemaker"],
+        "Weights & Biases": ["weights & biases", "weights and biases", "wandb"],
+        "ONNX": ["onnx", "onnx runtime"],
+        "Reinforcement Learning": ["reinforcement learning"],
+        "Recommender Systems": ["recommender systems", "recommendation systems", "recommendation engine",
+                                "collaborative filtering"],
+        "Time Series": ["time series", "time-series forecasting", "forecasting"],
+        "Feature Engineering": ["feature engineering"],
+    },
+    "mobile": {
+        "Android": ["android", "android sdk", "jetpack compose"],
+        "iOS": ["ios", "uikit", "xcode"],
+        "React Native": ["react native", "react-native", "Expo"],
+        "Flutter": ["flutter"],
+        "Xamarin": ["xamarin", ".net maui"],
+        "Ionic": ["ionic", "cordova"],
+    },
+    "testing": {
+        "Unit Testing": ["unit testing", "unit tests", "tdd", "test-driven development", "test driven development"],
+        "pytest": ["pytest", "unittest"],
+        "JUnit": ["junit", "mockito", "testng"],
+        "Jest": ["jest", "react testing library"],
+        "Mocha": ["mocha", "chai"],
+        "Jasmine": ["jasmine", "karma"],
+        "Cypress": ["cypress"],
+        "Playwright": ["playwright"],
+        "Selenium": ["selenium", "webdriver"],
+        "Postman": ["postman", "newman"],
+        "Load Testing": ["load testing", "jmeter", "gatling", "locust", "k6"],
+        "SonarQube": ["sonarqube", "sonar"],
+        "Integration Testing": ["integration testing", "integration tests", "end-to-end testing", "e2e testing"],
+    },
+    "practices": {
+        "System Design": ["system design", "distributed systems", "scalability", "high availability",
+                          "fault tolerance", "load balancing"],
+        "Data Structures & Algorithms": ["data structures", "algorithms", "dsa", "data structures and algorithms"],
+        "Object-Oriented Design": ["oop", "object-oriented programming", "object oriented programming",
+                                   "object-oriented design", "design patterns", "solid principles"],
+        "Event-Driven Architecture": ["event-driven", "event driven", "event sourcing", "cqrs", "pub/sub"],
+        "Caching": ["caching", "cdn"],
+        "Concurrency": ["concurrency", "multithreading", "multi-threading", "parallel processing"],
+        "Security": ["security", "owasp", "penetration testing", "encryption", "tls", "ssl", "iam"],
+        "Agile": ["agile", "scrum", "kanban", "jira"],
+        "Performance Optimization": ["performance optimization", "performance tuning", "profiling",
+                                     "query optimization"],
+        "Networking": ["networking", "tcp/ip", "http/2", "dns"],
+        "Blockchain": ["blockchain", "ethereum", "web3", "smart contracts"],
+        "Embedded Systems": ["embedded systems", "embedded c", "firmware", "rtos", "arduino", "raspberry pi"],
+        "Game Development": ["unity", "unreal engine", "game development", "godot"],
+    },
+}
+
+# Question topics suggested for the categories a candidate leans on most
+CATEGORY_TOPICS = {
+    "frontend": "Frontend state management and rendering performance",
+    "backend": "API design and service architecture",
+    "databases": "Data modelling and query performance",
+    "cloud": "Cloud architecture and cost/scaling trade-offs",
+    "devops": "CI/CD, infrastructure as code and observability",
+    "data": "Data pipelines and processing at scale",
+    "ml": "Model training, evaluation and deployment",
+    "mobile": "Mobile app architecture and offline behaviour",
+    "testing": "Testing strategy and test automation",
+    "practices": "System design and engineering trade-offs",
+}
+
+# Lowercase aliases that are also everyday English words ("unity", "react", "security").
+# Like capitalised aliases, they only count next to an unambiguous skill or in a skills section.
+AMBIGUOUS_ALIASES = {
+    "agile", "airflow", "angular", "apollo", "assembly", "athena", "aurora", "babel", "bash", "bootstrap",
+    "caching", "cassandra", "celery", "chai", "consul", "containers", "cordova", "cypher", "cypress", "elixir",
+    "elk", "encryption", "flask", "flutter", "forecasting", "gatsby", "gemini", "groovy", "helm", "hibernate",
+    "iam", "ionic", "jasmine", "jenkins", "jest", "kafka", "karma", "locust", "looker", "mocha", "mongoose",
+    "networking", "pandas", "playwright", "polars", "postman", "prefect", "presto", "prisma", "profiling", "rag",
+    "rails", "react", "redshift", "ruby", "sass", "security", "selenium", "sentry", "snowflake", "solidity",
+    "sonar", "spark", "storybook", "tableau", "tomcat", "torch", "transformers", "twisted", "unity", "vagrant",
+    "yolo",
+}
+# How far (in characters) an ambiguous match may be from an unambiguous one
+CONTEXT_CHARS = 60
+
+# How much a mention counts for, by the section it appears in
+SECTION_SKILL_WEIGHTS = {"skills": 2.0, "experience": 1.5, "projects": 1.5, "summary": 1.0}
+OTHER_SECTION_WEIGHT = 0.5
+
+# Characters that continue a token, so a match next to them is part of a longer word
+_WORD_CHARS = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_+#")
+# Case-sensitive aliases ("Go", "R", "Swift") are plain English words too; these also end them
+_STRICT_BOUNDARY = _WORD_CHARS | set("&'-")
+_BULLET = re.compile(r"^[\-•*▪◦–·>]\s*")
+_YEARS = re.compile(r"\b(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years|yrs)\b", re.IGNORECASE)
+_DATE_RANGE = re.compile(
+    r"\b((?:19|20)\d{2})\s*(?:-|–|—|to|until)\s*(?:[a-z]{3,9}\.?\s+)?"
+    r"((?:19|20)\d{2}|present|current|now|date|today)\b",
+    re.IGNORECASE,
+)
+_ROLE = re.compile(
+    r"\b(engineer|developer|architect|analyst|scientist|intern|consultant|lead|manager|administrator|"
+    r"designer|programmer|sre|devops|cto|founder)\b",
+    re.IGNORECASE,
+)
+_TITLE_SEPARATOR = re.compile(r"\s+(?:-|–|—|\|)\s+|:\s+|\s+\(|\s+at\s+|,\s+")
+_PROJECT_SEPARATOR = re.compile(r"\s+(?:-|–|—|\|)\s+|:\s+|\s+\(")
+_ACHIEVEMENT = re.compile(
+    r"^(built|developed|designed|implemented|created|led|launched|migrated|rewrote|architected|automated|"
+    r"delivered|shipped|scaled|optimi[sz]ed|introduced)\b",
+    re.IGNORECASE,
+)
+
+SkillMatch = namedtuple("SkillMatch", "start end skill category ambiguous")
+LocalAnalysis = namedtuple("LocalAnalysis", "analysis confidence seconds")
+
+
+class SkillIndex:
+    """
+    Aho-Corasick automaton over every alias in a taxonomy.
+
+    Lowercase aliases match in any case. An alias written with capitals
+    ("Go", "R", "Swift") is an ordinary English word too, so it only
+    matches exactly as written. Matches must sit on word boundaries, and
+    overlapping matches resolve to the leftmost, then longest, alias.
+    Capitalised aliases and ``AMBIGUOUS_ALIASES`` are ambiguous: with
+    ``context`` they are only kept near an unambiguous match, so "Go
+    getter" or "passionate about unity" find nothing. ``fingerprint``
+    changes whenever the taxonomy or the ambiguity rules do.
+    """
+    def __init__(self, taxonomy):
+        self.fingerprint = content_key(
+            json.dumps(taxonomy, sort_keys=True), json.dumps(sorted(AMBIGUOUS_ALIASES)), str(CONTEXT_CHARS)
+        )
+        self.categories = {}
+        self.aliases = 0
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for category, skills in taxonomy.items():
+            for skill, aliases in skills.items():
+                self.categories[skill] = category
+                aliases = set(aliases)
+                if skill.lower() not in {alias.lower() for alias in aliases}:
+                    aliases.add(skill.lower())
+                for alias in aliases:
+                    self._add(alias, skill)
+        self._build()
+
+    def _add(self, alias, skill):
+        state = 0
+        for char in alias.lower():
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = next_state
+        exact = alias if alias != alias.lower() else None
+        ambiguous = exact is not None or alias in AMBIGUOUS_ALIASES
+        self._out[state].append((len(alias), skill, exact, ambiguous))
+        self.aliases += 1
+
+    def _build(self):
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] = self._out[next_state] + self._out[self._fail[next_state]]
+
+    def _on_boundary(self, text, start, end, exact):
+        boundary = _STRICT_BOUNDARY if exact is not None else _WORD_CHARS
+        if start > 0 and text[start - 1] in boundary and text[start] in _WORD_CHARS:
+            return False
+        if end < len(text) and text[end - 1] in _WORD_CHARS:
+            # "R." is more often an initial than the language
+            if text[end] in boundary or (exact is not None and len(exact) == 1 and text[end] == "."):
+                return False
+        return True
+
+    def find(self, text, context=True):
+        """
+        Every skill mention in ``text`` as ``SkillMatch`` tuples, in order.
+        Without ``context`` (a list of skills) ambiguous matches are kept as they are.
+        """
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters (e.g. "İ") lower to two; keep offsets aligned with the original
+            lowered = "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+        goto, fail, out = self._goto, self._fail, self._out
+        candidates = []
+        state = 0
+        for end, char in enumerate(lowered, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, skill, exact, ambiguous in out[state]:
+                start = end - length
+                if exact is not None and text[start:end] != exact:
+                    continue
+                if self._on_boundary(text, start, end, exact):
+                    candidates.append((start, -end, skill, ambiguous))
+
+        matches, covered = [], 0
+        for start, end, skill, ambiguous in sorted(candidates):
+            if start >= covered:
+                matches.append(SkillMatch(start, -end, skill, self.categories[skill], ambiguous))
+                covered = -end
+        if not context:
+            return matches
+        anchors = [match for match in matches if not match.ambiguous]
+        return [
+            match for match in matches
+            if not match.ambiguous or any(
+                anchor.start - CONTEXT_CHARS <= match.end and match.start <= anchor.end + CONTEXT_CHARS
+                for anchor in anchors
+            )
+        ]
+
+    def skills(self, text, context=True):
+        """Canonical skills mentioned in ``text``, in order of first mention."""
+        return list(dict.fromkeys(match.skill for match in self.find(text, context)))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def load_taxonomy(path=TAXONOMY_FILE):
+    """The built-in taxonomy merged with the categories in the JSON file at ``path``, if any."""
+    taxonomy = {category: dict(skills) for category, skills in SKILL_TAXONOMY.items()}
+    if path:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                extra = json.load(f)
+            for category, skills in extra.items():
+                for skill, aliases in skills.items():
+                    merged = taxonomy.setdefault(category, {}).get(skill, [])
+                    taxonomy[category][skill] = list(merged) + list(aliases)
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"Could not load skill taxonomy {path}: {str(e)}")
+    return taxonomy
+
+
+def get_skill_index():
+    """Process-wide skill index, compiled on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SkillIndex(load_taxonomy())
+    return _index
+
+
+def local_analysis_mode():
+    """
+    What decides whether and how the index stands in for the model: the
+    mode, the confidence threshold and the index's fingerprint.
+    """
+    if LOCAL_ANALYSIS == "off":
+        return "off"
+    return f"{LOCAL_ANALYSIS}:{MIN_CONFIDENCE}:{get_skill_index().fingerprint}"
+
+
+def _strip_bullet(line):
+    return _BULLET.sub("", line.strip()).strip()
+
+
+def _shorten(text, words=12):
+    text = re.split(r"(?<=[.;])\s", text, maxsplit=1)[0].rstrip(".;")
+    parts = text.split()
+    return " ".join(parts[:words]) + ("..." if len(parts) > words else "")
+
+
+def _experience_years(sections):
+    """Years of experience: stated outright, else the union of the date ranges in the experience section."""
+    stated = [float(value) for name, lines in sections if name in ("summary", "experience")
+              for value in _YEARS.findall("\n".join(lines))]
+    if stated:
+        return max(stated)
+    this_year = time.localtime().tm_year
+    spans = []
+    for name, lines in sections:
+        if name != "experience":
+            continue
+        for start, end in _DATE_RANGE.findall("\n".join(lines)):
+            end = int(end) if end.isdigit() else this_year
+            if int(start) <= end <= this_year:
+                spans.append((int(start), end))
+    years, covered_to = 0, None
+    for start, end in sorted(spans):
+        if covered_to is None or start > covered_to:
+            years += end - start
+        elif end > covered_to:
+            years += end - covered_to
+        covered_to = end if covered_to is None else max(covered_to, end)
+    return years or None
+
+
+def _roles(lines):
+    roles = []
+    for line in lines[1:]:
+        # Bullets describe the work ("Led a team of 5 engineers"); titles are on their own lines
+        if _BULLET.match(line.strip()):
+            continue
+        for part in _TITLE_SEPARATOR.split(line.strip()):
+            part = part.strip(" ,.")
+            if _ROLE.search(part) and len(part.split()) <= 6 and part not in roles:
+                roles.append(part)
+                break
+        if len(roles) == 2:
+            break
+    return roles
+
+
+def _projects(lines, index):
+    """Project names with the skills used in each, from the lines of a projects section."""
+    entries = []
+    for line in lines[1:]:
+        text = _strip_bullet(line)
+        if not text:
+            continue
+        head = _PROJECT_SEPARATOR.split(text, maxsplit=1)[0].strip()
+        titled = head != text and len(head.split()) <= 6
+        if titled or (len(text.split()) <= 6 and not _BULLET.match(line.strip())):
+            entries.append([head if titled else text.rstrip("."), list(index.skills(text))])
+        elif entries and _BULLET.match(line.strip()):
+            entries[-1][1].extend(index.skills(text))
+        else:
+            entries.append([_shorten(text), list(index.skills(text))])
+    projects = []
+    for name, skills in entries[:MAX_PROJECTS]:
+        skills = [skill for skill in dict.fromkeys(skills) if skill.lower() not in name.lower()][:3]
+        projects.append(f"{name} ({', '.join(skills)})" if skills else name)
+    return projects
+
+
+def local_resume_analysis(resume_text, index=None):
+    """
+    Analyse a resume without the model. Returns a ``LocalAnalysis`` with
+    the same keys as the model's analysis and a confidence between 0 and 1
+    built from what was found: several skills, an experience section with
+    roles or dates, projects and a skills section.
+    """
+    start = time.perf_counter()
+    index = index or get_skill_index()
+    sections = split_sections(normalise_resume_text(resume_text or ""))
+    found = {name for name, _ in sections}
+
+    scores, first_seen, used, listed = {}, {}, set(), set()
+    category_scores = {}
+    for name, lines in sections:
+        weight = SECTION_SKILL_WEIGHTS.get(name, OTHER_SECTION_WEIGHT)
+        # A skills section is a list of skills, so ambiguous names there need no context
+        for match in index.find("\n".join(lines), context=name != "skills"):
+            scores[match.skill] = scores.get(match.skill, 0.0) + weight
+            category_scores[match.category] = category_scores.get(match.category, 0.0) + weight
+            first_seen.setdefault(match.skill, len(first_seen))
+            (listed if name == "skills" else used).add(match.skill)
+    ranked = sorted(scores, key=lambda skill: (-scores[skill], first_seen[skill]))
+    primary_skills = ranked[:MAX_PRIMARY_SKILLS]
+
+    experience_lines = [line for name, lines in sections if name == "experience" for line in lines]
+    years = _experience_years(sections)
+    roles = _roles(experience_lines)
+    worked_with = [skill for skill in ranked if skill in used][:3] or primary_skills[:3]
+    summary = ""
+    if years:
+        summary = f"About {years:g} years of experience"
+    if roles:
+        summary += (" as " if summary else "Experience as ") + " and ".join(roles)
+    if worked_with:
+        summary += (", working with " if summary else "Works with ") + ", ".join(worked_with)
+    experience_summary = summary + "." if summary else "No experience details found."
+
+    project_lines = [line for name, lines in sections if name == "projects" for line in lines]
+    key_projects = _projects(project_lines, index)
+    if not key_projects:
+        key_projects = [_shorten(_strip_bullet(line)) for line in experience_lines
+                        if _ACHIEVEMENT.match(_strip_bullet(line))][:3]
+
+    areas = []
+    listed_only = [skill for skill in ranked if skill in listed and skill not in used][:3]
+    if listed_only:
+        areas.append(f"Hands-on depth with {', '.join(listed_only)} (listed without project or role context)")
+    if not years:
+        areas.append("Total years of experience and seniority")
+    if not key_projects:
+        areas.append("Concrete projects and the candidate's role in them")
+    elif not project_lines:
+        areas.append("Projects outside day-to-day work")
+    if not areas and primary_skills:
+        areas.append(f"Scale and impact of the work with {primary_skills[0]}")
+
+    topics = [skill for skill in ranked if skill in used][:3] or primary_skills[:3]
+    for category in sorted(category_scores, key=lambda category: -category_scores[category]):
+        if category in CATEGORY_TOPICS and len(topics) < MAX_TOPICS:
+            topics.append(CATEGORY_TOPICS[category])
+
+    confidence = (
+        0.4 * min(len(primary_skills) / 5, 1.0)
+        + (0.2 if "experience" in found and (roles or years) else 0.0)
+        + (0.1 if years else 0.0)
+        + (0.2 if project_lines and key_projects else 0.0)
+        + (0.1 if "skills" in found else 0.0)
+    )
+    analysis = {
+        "primary_skills": primary_skills,
+        "experience_summary": experience_summary,
+        "key_projects": key_projects,
+        "areas_for_clarification": areas,
+        "suggested_question_topics": topics,
+    }
+    return LocalAnalysis(analysis, round(confidence, 2), time.perf_counter() - start)
+
+
+def merge_analyses(model_analysis, local_analysis, index=None):
+    """The model's analysis, with the skills it missed but the index found appended."""
+    index = index or get_skill_index()
+    merged = dict(model_analysis)
+    skills = list(merged.get("primary_skills") or [])
+    known = set(index.skills(" ; ".join(str(skill) for skill in skills), context=False))
+    known.update(str(skill).lower() for skill in skills)
+    for skill in local_analysis.get("primary_skills", []):
+        if skill not in known and skill.lower() not in known and len(skills) < MAX_PRIMARY_SKILLS + 2:
+            skills.append(skill)
+    merged["primary_skills"] = skills
+    return merged
+
+
+def main(argv=None):
+    paths = argv if argv is not None else sys.argv[1:]
+    if not paths:
+        print("usage: python -m utils.skills RESUME.txt [...]")
+        return 2
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            local = local_resume_analysis(f.read())
+        print(f"{path}: confidence {local.confidence:.2f} in {local.seconds * 1e3:.1f}ms")
+        print(json.dumps(local.analysis, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
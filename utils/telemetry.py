@@ -0,0 +1,367 @@
+"""
+Spans for model work: timing, token counts, parse results and cache hits.
+
+Each unit of model work (one resume analysis, one answer evaluation
+including its free-text retry, ...) runs inside a ``span``. ``Agents``
+adds queue time, call latency and token counts for every model call made
+in it; parsers and caches mark parse success and cache hits. Finished
+spans update in-memory aggregates, exported as Prometheus text, and are
+appended to a JSONL trace by a background thread so the hot path only
+pays for a list append.
+
+    python -m utils.telemetry [trace.jsonl]            # p50/p95/p99 per task
+    python -m utils.telemetry --prometheus [trace.jsonl]
+"""
+import argparse
+import atexit
+import contextvars
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+FLUSH_INTERVAL = 1.0
+# The trace is rotated to ``<path>.1`` beyond this size
+MAX_TRACE_BYTES = 50 * 1024 * 1024
+
+_current = contextvars.ContextVar("interviewmate_span", default=None)
+
+
+class Span:
+    """One unit of model work; ``calls`` counts the model calls made for it."""
+    def __init__(self, task):
+        self.task = task
+        self.timestamp = time.time()
+        self.started = time.perf_counter()
+        self.duration = None
+        self.model = None
+        self.calls = 0
+        self.queue_seconds = 0.0
+        self.call_seconds = 0.0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.parse_ok = None
+        self.cache_hit = None
+        self.error = None
+
+    def add_call(self, model, queue_seconds, call_seconds, prompt_tokens, response_tokens=0):
+        self.model = model
+        self.calls += 1
+        self.queue_seconds += queue_seconds
+        self.call_seconds += call_seconds
+        self.prompt_tokens += prompt_tokens
+        self.response_tokens += response_tokens
+
+    def fail(self, error):
+        message = str(error) or type(error).__name__
+        self.error = f"{type(error).__name__}: {message}"[:200]
+
+    def to_dict(self):
+        return {
+            "ts": round(self.timestamp, 3),
+            "task": self.task,
+            "model": self.model,
+            "duration": round(self.duration or 0.0, 4),
+            "queue": round(self.queue_seconds, 4),
+            "latency": round(self.call_seconds, 4),
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "response_tokens": self.response_tokens,
+            "parse_ok": self.parse_ok,
+            "cache_hit": self.cache_hit,
+            "error": self.error,
+        }
+
+
+def current():
+    """The span of the model work in progress in this context, if any."""
+    return _current.get()
+
+
+@contextmanager
+def span(task):
+    """
+    Record the enclosed model work as one span. Inside another span the
+    outer one is reused, so nested helpers annotate the same unit of work.
+    """
+    parent = _current.get()
+    if parent is not None:
+        yield parent
+        return
+    new_span = Span(task)
+    token = _current.set(new_span)
+    try:
+        yield new_span
+    except BaseException as e:
+        new_span.fail(e)
+        raise
+    finally:
+        _current.reset(token)
+        finish(new_span)
+
+
+def finish(finished_span):
+    """Close a span created without ``span()`` (e.g. in a generator) and record it."""
+    finished_span.duration = time.perf_counter() - finished_span.started
+    telemetry = get_telemetry()
+    if telemetry is not None:
+        telemetry.record(finished_span.to_dict())
+
+
+def mark_parse(ok):
+    current_span = _current.get()
+    if current_span is not None:
+        current_span.parse_ok = ok and current_span.parse_ok is not False
+
+
+def record_cache(namespace, hit):
+    """Count a cache lookup; inside a span also mark whether it was a hit."""
+    current_span = _current.get()
+    if current_span is not None:
+        current_span.cache_hit = hit
+    telemetry = get_telemetry()
+    if telemetry is not None:
+        telemetry.record_cache(namespace, hit)
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _labels(**labels):
+    return "{" + ",".join(f'{key}="{str(value).replace(chr(34), chr(39))}"' for key, value in labels.items()) + "}"
+
+
+class TaskStats:
+    """Aggregates of the finished spans of one task."""
+    def __init__(self):
+        self.count = 0
+        self.calls = 0
+        self.errors = Counter()
+        self.parse_failures = 0
+        self.cache_hits = 0
+        self.prompt_tokens = 0
+        self.response_tokens = 0
+        self.queue_seconds = 0.0
+        self.duration_sum = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+    def add(self, record):
+        self.count += 1
+        self.calls += record.get("calls", 0)
+        if record.get("error"):
+            self.errors[record["error"].split(":", 1)[0]] += 1
+        if record.get("parse_ok") is False:
+            self.parse_failures += 1
+        if record.get("cache_hit"):
+            self.cache_hits += 1
+        self.prompt_tokens += record.get("prompt_tokens", 0)
+        self.response_tokens += record.get("response_tokens", 0)
+        self.queue_seconds += record.get("queue", 0.0)
+        duration = record.get("duration", 0.0)
+        self.duration_sum += duration
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if duration <= bound:
+                self.buckets[i] += 1
+
+
+class Telemetry:
+    """
+    Process-wide span sink: aggregates for Prometheus plus an optional
+    JSONL trace (and Prometheus text file) written in the background.
+    """
+    def __init__(self, trace_path=None, metrics_path=None, flush_interval=FLUSH_INTERVAL):
+        self.trace_path = trace_path
+        self.metrics_path = metrics_path
+        self.flush_interval = flush_interval
+        self._tasks = {}
+        self._caches = Counter()
+        self._pending = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        if trace_path or metrics_path:
+            threading.Thread(target=self._run, name="telemetry-writer", daemon=True).start()
+            atexit.register(self.flush)
+
+    def record(self, record):
+        with self._lock:
+            self._tasks.setdefault(record["task"], TaskStats()).add(record)
+            if self.trace_path:
+                self._pending.append(record)
+        self._wakeup.set()
+
+    def record_cache(self, namespace, hit):
+        with self._lock:
+            self._caches[(namespace, "hit" if hit else "miss")] += 1
+
+    def prometheus(self):
+        """All aggregates in the Prometheus text exposition format."""
+        with self._lock:
+            tasks = sorted(self._tasks.items())
+            caches = sorted(self._caches.items())
+        lines = [
+            "# HELP interviewmate_llm_requests_total Units of model work by task and outcome.",
+            "# TYPE interviewmate_llm_requests_total counter",
+        ]
+        for task, stats in tasks:
+            failed = sum(stats.errors.values())
+            lines.append(f"interviewmate_llm_requests_total{_labels(task=task, outcome='ok')} {stats.count - failed}")
+            lines.append(f"interviewmate_llm_requests_total{_labels(task=task, outcome='error')} {failed}")
+        lines += ["# HELP interviewmate_llm_errors_total Failed units of model work by error type.",
+                  "# TYPE interviewmate_llm_errors_total counter"]
+        for task, stats in tasks:
+            for error, count in sorted(stats.errors.items()):
+                lines.append(f"interviewmate_llm_errors_total{_labels(task=task, error=error)} {count}")
+        lines += ["# HELP interviewmate_llm_calls_total Model calls, including retries as free text.",
+                  "# TYPE interviewmate_llm_calls_total counter"]
+        lines += [f"interviewmate_llm_calls_total{_labels(task=task)} {stats.calls}" for task, stats in tasks]
+        lines += ["# HELP interviewmate_llm_duration_seconds Duration of a unit of model work.",
+                  "# TYPE interviewmate_llm_duration_seconds histogram"]
+        for task, stats in tasks:
+            for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                lines.append(f"interviewmate_llm_duration_seconds_bucket{_labels(task=task, le=bound)} {count}")
+            lines.append(f"interviewmate_llm_duration_seconds_bucket{_labels(task=task, le='+Inf')} {stats.count}")
+            lines.append(f"interviewmate_llm_duration_seconds_sum{_labels(task=task)} {stats.duration_sum:.4f}")
+            lines.append(f"interviewmate_llm_duration_seconds_count{_labels(task=task)} {stats.count}")
+        lines += ["# HELP interviewmate_llm_queue_seconds_total Time spent waiting for a concurrency or rate limit slot.",
+                  "# TYPE interviewmate_llm_queue_seconds_total counter"]
+        lines += [f"interviewmate_llm_queue_seconds_total{_labels(task=task)} {stats.queue_seconds:.4f}"
+                  for task, stats in tasks]
+        lines += ["# HELP interviewmate_llm_tokens_total Prompt and response tokens.",
+                  "# TYPE interviewmate_llm_tokens_total counter"]
+        for task, stats in tasks:
+            lines.append(f"interviewmate_llm_tokens_total{_labels(task=task, direction='prompt')} {stats.prompt_tokens}")
+            lines.append(f"interviewmate_llm_tokens_total{_labels(task=task, direction='response')} {stats.response_tokens}")
+        lines += ["# HELP interviewmate_llm_parse_failures_total Responses that could not be parsed.",
+                  "# TYPE interviewmate_llm_parse_failures_total counter"]
+        lines += [f"interviewmate_llm_parse_failures_total{_labels(task=task)} {stats.parse_failures}"
+                  for task, stats in tasks]
+        lines += ["# HELP interviewmate_cache_lookups_total Cache lookups by cache and result.",
+                  "# TYPE interviewmate_cache_lookups_total counter"]
+        lines += [f"interviewmate_cache_lookups_total{_labels(cache=namespace, result=result)} {count}"
+                  for (namespace, result), count in caches]
+        return "\n".join(lines) + "\n"
+
+    def flush(self):
+        """Append pending spans to the trace and rewrite the metrics file."""
+        with self._write_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            try:
+                if pending:
+                    self._append_trace(pending)
+                if self.metrics_path:
+                    tmp_path = f"{self.metrics_path}.{os.getpid()}.tmp"
+                    with open(tmp_path, "w", encoding="utf-8") as f:
+                        f.write(self.prometheus())
+                    os.replace(tmp_path, self.metrics_path)
+            except Exception as e:
+                print(f"Error writing telemetry: {str(e)}")
+
+    def _append_trace(self, records):
+        if os.path.dirname(self.trace_path):
+            os.makedirs(os.path.dirname(self.trace_path), exist_ok=True)
+        if os.path.exists(self.trace_path) and os.path.getsize(self.trace_path) > MAX_TRACE_BYTES:
+            os.replace(self.trace_path, f"{self.trace_path}.1")
+        # One write per batch in append mode, so processes sharing the file don't interleave lines
+        with open(self.trace_path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records))
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            time.sleep(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+
+_telemetry = None
+_telemetry_lock = threading.Lock()
+
+
+def default_trace_path():
+    from utils.cache import DEFAULT_CACHE_DIR
+    return os.getenv("INTERVIEWMATE_TRACE_FILE", os.path.join(DEFAULT_CACHE_DIR, "traces.jsonl"))
+
+
+def get_telemetry():
+    """
+    Return the process-wide ``Telemetry``, or ``None`` when
+    ``INTERVIEWMATE_TELEMETRY=0``. ``INTERVIEWMATE_TRACE_FILE`` (empty to
+    disable) and ``INTERVIEWMATE_METRICS_FILE`` choose where it writes.
+    """
+    global _telemetry
+    if _telemetry is None:
+        if os.getenv("INTERVIEWMATE_TELEMETRY", "1") == "0":
+            return None
+        with _telemetry_lock:
+            if _telemetry is None:
+                _telemetry = Telemetry(default_trace_path() or None, os.getenv("INTERVIEWMATE_METRICS_FILE") or None)
+    return _telemetry
+
+
+def load_trace(path):
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # A line cut short by a crash
+    return records
+
+
+def report(records):
+    """Per-task latency percentiles and counters as a text table."""
+    by_task = {}
+    for record in records:
+        by_task.setdefault(record["task"], []).append(record)
+    lines = [f"{'task':<22}{'spans':>7}{'calls':>7}{'errors':>8}{'parse fail':>11}{'cache hit':>10}"
+             f"{'p50':>9}{'p95':>9}{'p99':>9}{'queue p95':>10}{'tokens in/out':>16}"]
+    for task, task_records in sorted(by_task.items()):
+        stats = TaskStats()
+        for record in task_records:
+            stats.add(record)
+        durations = [record.get("duration", 0.0) for record in task_records]
+        queues = [record.get("queue", 0.0) for record in task_records]
+        lines.append(
+            f"{task:<22}{stats.count:>7}{stats.calls:>7}{sum(stats.errors.values()):>8}"
+            f"{stats.parse_failures:>11}{stats.cache_hits:>10}"
+            f"{_percentile(durations, 50):>8.3f}s{_percentile(durations, 95):>8.3f}s{_percentile(durations, 99):>8.3f}s"
+            f"{_percentile(queues, 95):>9.3f}s"
+            f"{stats.prompt_tokens // stats.count:>8}/{stats.response_tokens // stats.count:<7}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise the model call trace.")
+    parser.add_argument("trace", nargs="?", default=None, help="JSONL trace (default: the configured trace file)")
+    parser.add_argument("--prometheus", action="store_true", help="Print the aggregates as Prometheus text")
+    args = parser.parse_args(argv)
+
+    path = args.trace or default_trace_path()
+    if not path or not os.path.exists(path):
+        sys.exit(f"No trace found at {path}")
+    records = load_trace(path)
+    if args.prometheus:
+        telemetry = Telemetry()
+        for record in records:
+            telemetry.record(record)
+        print(telemetry.prometheus(), end="")
+    else:
+        print(report(records))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
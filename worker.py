@@ -0,0 +1,137 @@
+"""
+Worker pool for the job queue.
+
+Starts ``--processes`` worker processes, each running ``--threads`` job
+loops against the shared SQLite queue, so model-bound work scales across
+cores independently of the Streamlit processes. Run it next to the app
+started with ``INTERVIEWMATE_JOB_QUEUE=1``:
+
+    python worker.py --processes 4 --threads 8
+"""
+import argparse
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+
+from utils import resume
+from utils.job_queue import DEFAULT_QUEUE_PATH, JobQueue
+from utils.question_bank import get_question_bank
+
+
+def analyze_resume(agents, payload, on_error):
+    return resume.analyze_resume(agents, payload["resume_text"], on_error=on_error)
+
+
+def generate_technical_questions(agents, payload, on_error):
+    return resume.generate_technical_questions(
+        agents, payload["resume_analysis"], payload["position"], on_error=on_error, bank=get_question_bank()
+    )
+
+
+def generate_question_batch(agents, payload, on_error):
+    return resume.generate_question_batch(
+        agents, payload["resume_analysis"], payload["position"], payload["question_types"],
+        payload["existing_questions"], on_error=on_error, bank=get_question_bank()
+    )
+
+
+def evaluate_answer(agents, payload, on_error):
+    return agents.evaluate_answer(payload["resume_analysis"], payload["answer"])
+
+
+HANDLERS = {
+    "resume_analysis": analyze_resume,
+    "technical_questions": generate_technical_questions,
+    "question_batch": generate_question_batch,
+    "evaluate_answer": evaluate_answer,
+}
+
+
+def process_job(queue, agents, job):
+    """Run one claimed job and record its result or error."""
+    warnings = []
+    try:
+        result = HANDLERS[job["kind"]](agents, job["payload"], warnings.append)
+    except Exception as e:
+        print(f"Error running {job['kind']} job {job['id']}: {str(e)}", file=sys.stderr)
+        queue.fail(job["id"], e)
+        return
+    queue.complete(job["id"], result, warnings)
+
+
+def work(queue, agents, stop, name, poll_interval=0.05, max_poll_interval=0.5):
+    """Claim and run jobs until ``stop`` is set, backing off while the queue is empty."""
+    idle_interval = poll_interval
+    while not stop.is_set():
+        try:
+            job = queue.claim(name, kinds=list(HANDLERS))
+        except Exception as e:
+            print(f"Error claiming job: {str(e)}", file=sys.stderr)
+            job = None
+        if job is None:
+            stop.wait(idle_interval)
+            idle_interval = min(idle_interval * 1.5, max_poll_interval)
+            continue
+        idle_interval = poll_interval
+        process_job(queue, agents, job)
+
+
+def run_worker(queue_path, threads, stop, agents=None):
+    """Entry point of one worker process."""
+    if agents is None:
+        from Agents.agent import get_agents
+        agents = get_agents()
+    queue = JobQueue(queue_path)
+    prefix = f"{socket.gethostname()}:{os.getpid()}"
+    loops = [
+        threading.Thread(target=work, args=(queue, agents, stop, f"{prefix}:{i}"), daemon=True)
+        for i in range(threads)
+    ]
+    for loop in loops:
+        loop.start()
+    for loop in loops:
+        loop.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run job queue workers for the InterviewMate UI.")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 2, help="Worker processes")
+    parser.add_argument("--threads", type=int, default=8, help="Concurrent jobs per process")
+    parser.add_argument("--queue", default=os.getenv("INTERVIEWMATE_JOB_QUEUE_PATH", DEFAULT_QUEUE_PATH),
+                        help="Path of the SQLite job queue")
+    args = parser.parse_args(argv)
+
+    queue = JobQueue(args.queue)
+    stop = multiprocessing.Event()
+
+    def start_process():
+        process = multiprocessing.Process(target=run_worker, args=(args.queue, args.threads, stop), daemon=True)
+        process.start()
+        return process
+
+    processes = [start_process() for _ in range(args.processes)]
+    print(f"Started {args.processes} workers x {args.threads} threads on {args.queue}")
+    try:
+        while True:
+            time.sleep(min(queue.lease / 10, 30))
+            # Replace crashed workers and put the jobs they held back in the queue
+            for i, process in enumerate(processes):
+                if not process.is_alive():
+                    print(f"Worker {process.pid} exited with {process.exitcode}, restarting", file=sys.stderr)
+                    processes[i] = start_process()
+            queue.requeue_stale()
+            queue.purge()
+    except KeyboardInterrupt:
+        print("Stopping workers...")
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(timeout=10)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())